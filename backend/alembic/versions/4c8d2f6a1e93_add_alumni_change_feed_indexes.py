@@ -0,0 +1,33 @@
+"""Index the updated_at columns and full-capacity alumni polled by the alumni change feed
+
+Revision ID: 4c8d2f6a1e93
+Revises: 6e1f8b3d5a27
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4c8d2f6a1e93'
+down_revision = '6e1f8b3d5a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_alumni_updated_at', 'alumni', ['updated_at'], unique=False)
+    op.create_index('idx_users_updated_at', 'users', ['updated_at'], unique=False)
+    op.create_index('idx_alumni_score_sums_updated_at', 'alumni_score_sums', ['updated_at'], unique=False)
+    # Only alumni out of capacity; every worker reads this set on each poll
+    op.create_index(
+        'idx_alumni_capacity_full', 'alumni', ['capacity_month'], unique=False,
+        postgresql_where=sa.text('current_month_requests >= max_requests_per_month'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_alumni_capacity_full', table_name='alumni')
+    op.drop_index('idx_alumni_score_sums_updated_at', table_name='alumni_score_sums')
+    op.drop_index('idx_users_updated_at', table_name='users')
+    op.drop_index('idx_alumni_updated_at', table_name='alumni')
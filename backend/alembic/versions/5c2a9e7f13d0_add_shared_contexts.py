@@ -0,0 +1,46 @@
+"""Add shared_contexts and materialization_watermarks tables
+
+Revision ID: 5c2a9e7f13d0
+Revises: 8d4f0a6b2e17
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5c2a9e7f13d0'
+down_revision = '8d4f0a6b2e17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('shared_contexts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('student_id', sa.UUID(), nullable=False),
+    sa.Column('alumni_id', sa.UUID(), nullable=False),
+    sa.Column('context_type', sa.Enum('SAME_MAJOR', 'SAME_COMPANY_INTEREST', 'SAME_LOCATION', 'SAME_INDUSTRY', 'SAME_ROLE_INTEREST', 'GRADUATION_PROXIMITY', 'SHARED_INTEREST', 'SHARED_HOBBY', 'SHARED_PERSONAL_INTEREST', name='sharedcontexttype'), nullable=False),
+    sa.Column('context_value', sa.String(length=255), nullable=True),
+    sa.Column('strength', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.Column('discovered_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_verified_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['alumni_id'], ['alumni.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('student_id', 'alumni_id', 'context_type', 'context_value', name='uq_shared_context')
+    )
+    op.create_index('idx_context_alumni', 'shared_contexts', ['alumni_id'], unique=False)
+    op.create_table('materialization_watermarks',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('materialization_watermarks')
+    op.drop_index('idx_context_alumni', table_name='shared_contexts')
+    op.drop_table('shared_contexts')
+    op.execute('DROP TYPE IF EXISTS sharedcontexttype')
@@ -0,0 +1,32 @@
+"""Add match_terms to alumni and students for shared-context partner lookups
+
+Revision ID: 6e1f8b3d5a27
+Revises: d3a7c2e5f914
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '6e1f8b3d5a27'
+down_revision = 'd3a7c2e5f914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled in by the shared-context materializer; profiles without terms are
+    # treated as candidates of every lookup until it has written theirs
+    op.add_column('alumni', sa.Column('match_terms', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('students', sa.Column('match_terms', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.create_index('idx_alumni_match_terms', 'alumni', ['match_terms'], unique=False, postgresql_using='gin')
+    op.create_index('idx_student_match_terms', 'students', ['match_terms'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_student_match_terms', table_name='students', postgresql_using='gin')
+    op.drop_index('idx_alumni_match_terms', table_name='alumni', postgresql_using='gin')
+    op.drop_column('students', 'match_terms')
+    op.drop_column('alumni', 'match_terms')
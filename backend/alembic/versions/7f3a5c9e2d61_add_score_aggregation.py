@@ -0,0 +1,81 @@
+"""Add score_events log and running score sums
+
+Revision ID: 7f3a5c9e2d61
+Revises: e2b6f9d04c13
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7f3a5c9e2d61'
+down_revision = 'e2b6f9d04c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('score_events',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.Enum('REQUEST_SENT', 'REQUEST_APPROVED', 'REQUEST_DECLINED', 'REQUEST_EXPIRED', 'INTRODUCTION_MADE', 'INTRODUCTION_SUCCEEDED', 'OUTCOME_RECORDED', name='scoreeventkind'), nullable=False),
+    sa.Column('student_id', sa.UUID(), nullable=False),
+    sa.Column('alumni_id', sa.UUID(), nullable=False),
+    sa.Column('source_id', sa.UUID(), nullable=True),
+    sa.Column('response_hours', sa.Float(), nullable=True),
+    sa.Column('recorded_by', sa.String(length=20), nullable=True),
+    sa.Column('satisfaction', sa.Integer(), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('applied_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['alumni_id'], ['alumni.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'source_id', name='uq_score_event_source')
+    )
+    op.create_index(op.f('ix_score_events_alumni_id'), 'score_events', ['alumni_id'], unique=False)
+    op.create_index(op.f('ix_score_events_student_id'), 'score_events', ['student_id'], unique=False)
+    op.create_index('idx_score_events_unapplied', 'score_events', ['id'], unique=False, postgresql_where=sa.text('applied_at IS NULL'))
+    op.create_table('alumni_score_sums',
+    sa.Column('alumni_id', sa.UUID(), nullable=False),
+    sa.Column('requests_received', sa.Integer(), nullable=False),
+    sa.Column('approvals', sa.Integer(), nullable=False),
+    sa.Column('declines', sa.Integer(), nullable=False),
+    sa.Column('expirations', sa.Integer(), nullable=False),
+    sa.Column('response_hours_sum', sa.Float(), nullable=False),
+    sa.Column('response_time_sketch', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('introductions', sa.Integer(), nullable=False),
+    sa.Column('successful_introductions', sa.Integer(), nullable=False),
+    sa.Column('satisfaction_sum', sa.Integer(), nullable=False),
+    sa.Column('satisfaction_count', sa.Integer(), nullable=False),
+    sa.Column('last_event_id', sa.BigInteger(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['alumni_id'], ['alumni.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('alumni_id')
+    )
+    op.create_table('student_score_sums',
+    sa.Column('student_id', sa.UUID(), nullable=False),
+    sa.Column('requests_sent', sa.Integer(), nullable=False),
+    sa.Column('approvals', sa.Integer(), nullable=False),
+    sa.Column('declines', sa.Integer(), nullable=False),
+    sa.Column('expirations', sa.Integer(), nullable=False),
+    sa.Column('introductions', sa.Integer(), nullable=False),
+    sa.Column('successful_introductions', sa.Integer(), nullable=False),
+    sa.Column('outcomes_recorded', sa.Integer(), nullable=False),
+    sa.Column('satisfaction_sum', sa.Integer(), nullable=False),
+    sa.Column('satisfaction_count', sa.Integer(), nullable=False),
+    sa.Column('last_event_id', sa.BigInteger(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('student_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('student_score_sums')
+    op.drop_table('alumni_score_sums')
+    op.drop_index('idx_score_events_unapplied', table_name='score_events', postgresql_where=sa.text('applied_at IS NULL'))
+    op.drop_index(op.f('ix_score_events_student_id'), table_name='score_events')
+    op.drop_index(op.f('ix_score_events_alumni_id'), table_name='score_events')
+    op.drop_table('score_events')
+    op.execute('DROP TYPE IF EXISTS scoreeventkind')
@@ -0,0 +1,25 @@
+"""Replace the users.university_id index with a tenant-leading composite
+
+Revision ID: 9b1e4d7a2c58
+Revises: 7f3a5c9e2d61
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9b1e4d7a2c58'
+down_revision = '7f3a5c9e2d61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The composite's leading column serves every lookup the old index did
+    op.create_index('idx_users_tenant', 'users', ['university_id', 'role', 'status'], unique=False, postgresql_include=['id'])
+    op.drop_index(op.f('ix_users_university_id'), table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_users_university_id'), 'users', ['university_id'], unique=False)
+    op.drop_index('idx_users_tenant', table_name='users')
@@ -0,0 +1,49 @@
+"""Add alumni full-text search vector, trigger and GIN index
+
+Revision ID: a71d3c5e9b24
+Revises: 5c2a9e7f13d0
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a71d3c5e9b24'
+down_revision = '5c2a9e7f13d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('alumni', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute("""
+    CREATE OR REPLACE FUNCTION alumni_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW."current_role", '') || ' ' || coalesce(NEW.current_company, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.industry, '')), 'B') ||
+            setweight(jsonb_to_tsvector('english', coalesce(NEW.interests, '[]'::jsonb), '["string"]'), 'B') ||
+            setweight(jsonb_to_tsvector('english', coalesce(NEW.hobbies, '[]'::jsonb), '["string"]'), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.bio, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.location, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER alumni_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF "current_role", current_company, industry, interests, hobbies, bio, location
+    ON alumni FOR EACH ROW EXECUTE FUNCTION alumni_search_vector_update()
+    """)
+    # Backfill existing rows through the trigger
+    op.execute("UPDATE alumni SET bio = bio")
+    op.create_index('idx_alumni_search', 'alumni', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_alumni_search', table_name='alumni', postgresql_using='gin')
+    op.execute('DROP TRIGGER IF EXISTS alumni_search_vector_trigger ON alumni')
+    op.execute('DROP FUNCTION IF EXISTS alumni_search_vector_update()')
+    op.drop_column('alumni', 'search_vector')
@@ -0,0 +1,70 @@
+"""Add canonical company/role dictionary and profile canonical id columns
+
+Revision ID: c4e8b1f27a90
+Revises: a71d3c5e9b24
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8b1f27a90'
+down_revision = 'a71d3c5e9b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('canonical_entities',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.Enum('COMPANY', 'ROLE', name='canonicalentitykind'), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('normalized_name', sa.String(length=200), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'normalized_name', name='uq_canonical_entity_name')
+    )
+    op.create_table('entity_aliases',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('alias', sa.String(length=200), nullable=False),
+    sa.Column('normalized_key', sa.String(length=220), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['entity_id'], ['canonical_entities.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    postgresql.ExcludeConstraint((sa.column('normalized_key'), '='), using='hash', name='uq_entity_alias_key')
+    )
+    op.create_index(op.f('ix_entity_aliases_entity_id'), 'entity_aliases', ['entity_id'], unique=False)
+
+    op.add_column('alumni', sa.Column('current_company_id', sa.Integer(), nullable=True))
+    op.add_column('alumni', sa.Column('current_role_id', sa.Integer(), nullable=True))
+    op.add_column('alumni', sa.Column('previous_company_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.create_foreign_key('alumni_current_company_id_fkey', 'alumni', 'canonical_entities', ['current_company_id'], ['id'], ondelete='SET NULL')
+    op.create_foreign_key('alumni_current_role_id_fkey', 'alumni', 'canonical_entities', ['current_role_id'], ['id'], ondelete='SET NULL')
+    op.create_index(op.f('ix_alumni_current_company_id'), 'alumni', ['current_company_id'], unique=False)
+    op.create_index(op.f('ix_alumni_current_role_id'), 'alumni', ['current_role_id'], unique=False)
+
+    op.add_column('students', sa.Column('target_company_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('students', sa.Column('target_role_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.create_index('idx_student_target_company_ids', 'students', ['target_company_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_student_target_company_ids', table_name='students', postgresql_using='gin')
+    op.drop_column('students', 'target_role_ids')
+    op.drop_column('students', 'target_company_ids')
+
+    op.drop_index(op.f('ix_alumni_current_role_id'), table_name='alumni')
+    op.drop_index(op.f('ix_alumni_current_company_id'), table_name='alumni')
+    op.drop_constraint('alumni_current_role_id_fkey', 'alumni', type_='foreignkey')
+    op.drop_constraint('alumni_current_company_id_fkey', 'alumni', type_='foreignkey')
+    op.drop_column('alumni', 'previous_company_ids')
+    op.drop_column('alumni', 'current_role_id')
+    op.drop_column('alumni', 'current_company_id')
+
+    op.drop_index(op.f('ix_entity_aliases_entity_id'), table_name='entity_aliases')
+    op.drop_table('entity_aliases')
+    op.drop_table('canonical_entities')
+    op.execute('DROP TYPE IF EXISTS canonicalentitykind')
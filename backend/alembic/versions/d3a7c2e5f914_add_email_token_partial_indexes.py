@@ -0,0 +1,23 @@
+"""Add a partial index on used email verification tokens
+
+Revision ID: d3a7c2e5f914
+Revises: 9b1e4d7a2c58
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7c2e5f914'
+down_revision = '9b1e4d7a2c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_email_tokens_used', 'email_verification_tokens', ['id'], unique=False, postgresql_where=sa.text('used = true'))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_email_tokens_used', table_name='email_verification_tokens')
@@ -0,0 +1,25 @@
+"""Add alumni.capacity_month for month-keyed request counters
+
+Revision ID: e2b6f9d04c13
+Revises: c4e8b1f27a90
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6f9d04c13'
+down_revision = 'c4e8b1f27a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('alumni', sa.Column('capacity_month', sa.Integer(), nullable=True))
+    # Existing counters were never reset, so attribute them to the current month
+    op.execute("UPDATE alumni SET capacity_month = to_char(now() AT TIME ZONE 'UTC', 'YYYYMM')::int")
+
+
+def downgrade() -> None:
+    op.drop_column('alumni', 'capacity_month')
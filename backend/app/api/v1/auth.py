@@ -4,15 +4,19 @@ Authentication endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 import uuid
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.replicas import get_read_db
+from app.core.hashing import HashingSaturatedError
+from app.core.responses import FastJSONResponse
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    averify_password,
+    ahash_password,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -26,9 +30,13 @@ from app.schemas.auth import (
     UserLogin,
     TokenResponse,
     TokenRefresh,
+    TokenUser,
     UserResponse
 )
-from app.services.email_service import email_service
+from app.services.email_outbox import enqueue_email
+from app.services.principal_cache import Principal, principal_cache
+from app.services.token_revocation import revocation_list
+from app.services.verification_tokens import consume_token
 
 # All auth endpoints will be under /api/v1/auth/*
 router = APIRouter(prefix="/auth")
@@ -36,14 +44,50 @@ router = APIRouter(prefix="/auth")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login", auto_error=False)
 
 
-def get_current_user(
+async def _run_hash(operation):
+    """Await a hashing coroutine, shedding load with 503 when the executor is saturated"""
+    try:
+        return await operation
+    except HashingSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+def _parse_user_id(user_id: Optional[str]) -> Optional[uuid.UUID]:
+    """Parse the `sub` claim into a UUID (asyncpg will not coerce strings)"""
+    try:
+        return uuid.UUID(user_id)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+async def _decode_unrevoked(token: Optional[str], db: AsyncSession) -> Optional[dict]:
+    """Decode a token, treating revoked tokens as invalid"""
+    payload = decode_token(token) if token else None
+    if payload is None:
+        return None
+    # Bloom filter negative (the common case) returns without any I/O
+    if await revocation_list.is_revoked(payload.get("jti"), db):
+        return None
+    return payload
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Dependency to get current authenticated user from JWT token
+
+    Returns a detached User snapshot from the principal cache; load the row
+    through the session before modifying it. Cache misses read the primary
+    (not a replica): the snapshot is cached for minutes, far longer than
+    the replica lag threshold.
     """
-    payload = decode_token(token)
+    payload = await _decode_unrevoked(token, db)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,39 +95,46 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id = payload.get("sub")
+    user_id = _parse_user_id(payload.get("sub"))
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
+    # Steady state is served from the principal cache without a DB round trip
+    principal, version = await principal_cache.lookup(user_id)
+    if principal is None:
+        user = await db.get(User, user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        principal = Principal.from_user(user)
+        # Not stored if the user was evicted while we read the row
+        await principal_cache.set(principal, version)
     
-    if user.status != UserStatus.ACTIVE:
+    if principal.status != UserStatus.ACTIVE:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is not active",
         )
     
-    return user
+    return principal.to_user()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user (student or alumni)
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User.id).where(User.email == user_data.email))
+    existing_user = result.first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -97,11 +148,14 @@ async def register(
     except (ValueError, TypeError):
         university_uuid = uuid.uuid4()
     
+    # Hash off the event loop so a registration burst doesn't stall other requests
+    password_hash = await _run_hash(ahash_password(user_data.password))
+    
     # Create user
     user = User(
         id=uuid.uuid4(),
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         role=user_data.role,
         university_id=university_uuid,
         status=UserStatus.ACTIVE,
@@ -109,8 +163,6 @@ async def register(
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
     
     # Create Student or Alumni profile based on role
     # Profiles are created with minimal data - users complete them after email verification
@@ -134,8 +186,6 @@ async def register(
         )
         db.add(alumni_profile)
     
-    db.commit()
-    
     # Generate email verification token
     verification_token = generate_verification_token()
     expires_at = datetime.utcnow() + timedelta(days=1)
@@ -146,38 +196,37 @@ async def register(
         token_type="email_verification",
         expires_at=expires_at
     )
-    
     db.add(email_token)
-    db.commit()
     
-    # Send verification email
-    email_service.send_verification_email(
+    # Queue the verification email; the outbox worker delivers it after commit
+    enqueue_email(
+        db,
         to_email=user.email,
+        template="verification",
         verification_token=verification_token,
-        user_name=user.email.split("@")[0]
+        user_name=user.email.split("@")[0],
     )
     
-    return UserResponse(
-        id=str(user.id),
-        email=user.email,
-        role=user.role.value,
-        email_verified=user.email_verified,
-        created_at=user.created_at
-    )
+    # User, profile, token and outbox entry commit (or fail) together
+    await db.commit()
+    await db.refresh(user)
+    
+    return FastJSONResponse(UserResponse.model_validate(user), status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
     login_data: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Authenticate user and return JWT tokens
     """
     # Find user by email
-    user = db.query(User).filter(User.email == login_data.email).first()
+    result = await db.execute(select(User).where(User.email == login_data.email))
+    user = result.scalar_one_or_none()
     
-    if not user or not verify_password(login_data.password, user.password_hash):
+    if not user or not await _run_hash(averify_password(login_data.password, user.password_hash)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -193,7 +242,7 @@ async def login(
     
     # Update last login
     user.last_login_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     # Create tokens
     token_data = {
@@ -205,29 +254,24 @@ async def login(
     access_token = create_access_token(token_data)
     refresh_token = create_refresh_token(token_data)
     
-    return TokenResponse(
+    return FastJSONResponse(TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer",
         expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        user={
-            "id": str(user.id),
-            "email": user.email,
-            "role": user.role.value,
-            "email_verified": user.email_verified
-        }
-    )
+        user=TokenUser.model_validate(user),
+    ))
 
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     refresh_data: TokenRefresh,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Refresh access token using refresh token
     """
-    payload = decode_token(refresh_data.refresh_token)
+    payload = await _decode_unrevoked(refresh_data.refresh_token, db)
     
     if payload is None or payload.get("type") != "refresh":
         raise HTTPException(
@@ -235,8 +279,8 @@ async def refresh_token(
             detail="Invalid refresh token"
         )
     
-    user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    user_id = _parse_user_id(payload.get("sub"))
+    user = await db.get(User, user_id) if user_id else None
     
     if not user or user.status != UserStatus.ACTIVE:
         raise HTTPException(
@@ -254,18 +298,54 @@ async def refresh_token(
     access_token = create_access_token(token_data)
     refresh_token = create_refresh_token(token_data)
     
-    return TokenResponse(
+    return FastJSONResponse(TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer",
         expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        user={
-            "id": str(user.id),
-            "email": user.email,
-            "role": user.role.value,
-            "email_verified": user.email_verified
-        }
-    )
+        user=TokenUser.model_validate(user),
+    ))
+
+
+@router.post("/logout")
+async def logout(
+    refresh_data: Optional[TokenRefresh] = None,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Revoke the presented access token and, if supplied, the refresh token
+    """
+    payload = await _decode_unrevoked(token, db)
+    if payload is None or payload.get("jti") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    revoke = [(payload, "access")]
+    if refresh_data is not None:
+        refresh_payload = decode_token(refresh_data.refresh_token)
+        if (
+            refresh_payload is not None
+            and refresh_payload.get("type") == "refresh"
+            and refresh_payload.get("sub") == payload.get("sub")
+            and refresh_payload.get("jti")
+        ):
+            revoke.append((refresh_payload, "refresh"))
+    
+    user_id = _parse_user_id(payload.get("sub"))
+    for claims, token_type in revoke:
+        await revocation_list.revoke(
+            db,
+            jti=claims["jti"],
+            expires_at=datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+            token_type=token_type,
+            user_id=user_id,
+        )
+    
+    return {"message": "Logged out successfully"}
 
 
 @router.get("/me", response_model=UserResponse)
@@ -275,48 +355,27 @@ async def get_current_user_info(
     """
     Get current authenticated user information
     """
-    return UserResponse(
-        id=str(current_user.id),
-        email=current_user.email,
-        role=current_user.role.value,
-        email_verified=current_user.email_verified,
-        created_at=current_user.created_at
-    )
+    return FastJSONResponse(UserResponse.model_validate(current_user))
 
 
 @router.post("/verify-email")
 async def verify_email(
     token: str = Query(..., description="Email verification token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Verify user email using verification token
     Token should be passed as query parameter: ?token=xxx
     """
-    email_token = db.query(EmailVerificationToken).filter(
-        EmailVerificationToken.token == token,
-        EmailVerificationToken.token_type == "email_verification",
-        EmailVerificationToken.used == False,
-        EmailVerificationToken.expires_at > datetime.utcnow()
-    ).first()
-    
-    if not email_token:
+    # One statement marks the token used and the user verified
+    user_id = await consume_token(db, token)
+    
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired verification token"
         )
     
-    # Mark email as verified
-    user = db.query(User).filter(User.id == email_token.user_id).first()
-    if user:
-        user.email_verified = True
-        user.email_verified_at = datetime.utcnow()
-        email_token.used = True
-        db.commit()
-        
-        return {"message": "Email verified successfully"}
-    
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail="User not found"
-    )
+    await db.commit()
+    
+    return {"message": "Email verified successfully"}
@@ -2,6 +2,7 @@
 Application configuration using Pydantic settings
 """
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from typing import List
 import os
@@ -15,8 +16,9 @@ class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
     
     # Application
-    ENVIRONMENT: str = "development"
+    ENVIRONMENT: str = "development"  # "production" forces DEBUG and SQL_ECHO off
     DEBUG: bool = True
+    SQL_ECHO: bool = False  # Log every SQL statement (development only)
     API_V1_PREFIX: str = "/api/v1"
     
     # Database
@@ -24,8 +26,27 @@ class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     DATABASE_URL_ASYNC: str = os.getenv("DATABASE_URL_ASYNC", "")  # Optional, for async operations
     
+    # Database connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 5  # Connections kept open
+    DB_POOL_MAX_OVERFLOW: int = 10  # Extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Wait for a free connection before failing the request
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections older than this (-1 = never)
+    DB_POOL_PRE_PING: bool = True  # Test idle connections on checkout
+    
+    # Read replicas (async URLs; empty = every query goes to the primary)
+    DATABASE_REPLICA_URLS: List[str] = []
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0  # Replicas further behind are skipped
+    DATABASE_REPLICA_CHECK_SECONDS: float = 2.0  # How often replica lag is measured
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 10.0  # A client reads from the primary this long after its commit
+    
+    # Readiness probe (/ready)
+    READINESS_CACHE_SECONDS: float = 2.0  # Probes within this window share one result
+    READINESS_TIMEOUT_SECONDS: float = 1.0  # Per dependency
+    READINESS_REQUIRE_REDIS: bool = False  # Redis-backed features degrade without it, so report only
+    
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.5
     
     # Security
     SECRET_KEY: str
@@ -33,6 +54,31 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     
+    # Token revocation (Bloom filter denylist)
+    TOKEN_REVOCATION_CAPACITY: int = 1_000_000
+    TOKEN_REVOCATION_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 10
+    TOKEN_REVOCATION_REBUILD_SECONDS: int = 3600
+    
+    # Password hashing executor (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one worker per CPU core
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Reject early beyond this many queued + running hashes
+    
+    # Principal cache (authenticated user lookups)
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_REDIS_TTL_SECONDS: int = 300
+    PRINCIPAL_CACHE_REDIS_ENABLED: bool = True
+    
+    # Rate limiting (per client, per minute; see API_SPECIFICATION.md)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "local"  # "local" (per worker) or "redis" (shared across workers)
+    RATE_LIMIT_AUTH_PER_MINUTE: int = 5  # Login, register, verify-email; per client IP
+    RATE_LIMIT_SESSION_PER_MINUTE: int = 10  # Token refresh and logout; per user
+    RATE_LIMIT_READS_PER_MINUTE: int = 100
+    RATE_LIMIT_WRITES_PER_MINUTE: int = 20
+    RATE_LIMIT_DISCOVERY_PER_MINUTE: int = 30
+    
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     
@@ -41,13 +87,61 @@ class Settings(BaseSettings):
     SMTP_PORT: int = 587
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
+    SMTP_USE_TLS: bool = True  # STARTTLS on non-465 ports; disable for local SMTP stand-ins
     EMAIL_FROM: str = ""
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_POOL_SIZE: int = 4  # Concurrent authenticated sessions kept open
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    SMTP_NOOP_AFTER_IDLE_SECONDS: float = 30.0  # Health-check sessions idle longer than this
     FRONTEND_URL: str = "http://localhost:3000"  # For email links
     
+    # Email outbox delivery worker
+    EMAIL_OUTBOX_WORKER_ENABLED: bool = True  # Run the worker inside the API process
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 2.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 300  # Claimed rows become due again if the worker dies
+    
+    # Shared-context materializer
+    SHARED_CONTEXT_WORKER_ENABLED: bool = True  # Run the materializer inside the API process
+    SHARED_CONTEXT_BATCH_SIZE: int = 500  # Changed profiles per transaction
+    SHARED_CONTEXT_POLL_SECONDS: float = 15.0
+    SHARED_CONTEXT_SAFETY_LAG_SECONDS: float = 30.0  # Watermark stays this far behind now for late commits
+    
+    # Alumni change feed (keeps each worker's discovery / match indexes current)
+    ALUMNI_CHANGES_WORKER_ENABLED: bool = True  # Poll other workers' alumni writes inside the API process
+    ALUMNI_CHANGES_POLL_SECONDS: float = 5.0  # How often other workers' writes are picked up
+    ALUMNI_CHANGES_SAFETY_LAG_SECONDS: float = 30.0  # Watermark stays this far behind now for late commits
+    
+    # Alumni request capacity
+    CAPACITY_BACKEND: str = "sql"  # "sql" (conditional UPDATE) or "redis" (Lua counters + write-back)
+    CAPACITY_WRITE_BACK_SECONDS: float = 30.0  # Redis backend: how often counters are copied to alumni rows
+    
+    # Helpfulness / reputation score aggregation
+    SCORE_WORKER_ENABLED: bool = True  # Apply score events inside the API process
+    SCORE_BATCH_SIZE: int = 1000  # Events per transaction
+    SCORE_POLL_SECONDS: float = 10.0
+    SCORE_RECONCILE_HOURS: float = 6.0  # Recompute sums from the event log this often to detect drift
+    SCORE_RECONCILE_REPAIR: bool = False  # Report drift only; fix with `--reconcile --repair`
+    
+    # Verification token purge
+    TOKEN_PURGE_WORKER_ENABLED: bool = True  # Delete used / expired tokens inside the API process
+    TOKEN_PURGE_BATCH_SIZE: int = 1000  # Rows per DELETE transaction
+    TOKEN_PURGE_PAUSE_SECONDS: float = 0.05  # Between batches, so other writers get in
+    TOKEN_PURGE_INTERVAL_SECONDS: float = 3600.0
+    
     # Supabase (optional - for Storage, Realtime, etc.)
     SUPABASE_URL: str = ""
     SUPABASE_ANON_KEY: str = ""
     
+    @model_validator(mode="after")
+    def apply_production_profile(self) -> "Settings":
+        """No debug-only overhead in production, whatever the environment sets"""
+        if self.ENVIRONMENT == "production":
+            self.DEBUG = False
+            self.SQL_ECHO = False
+        return self
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,29 +1,166 @@
 """
 Database configuration and session management
+
+Engines are created on first use (see get_engine / get_async_engine); the
+session factories bind to them when a session first needs a connection.
+
+The models use PostgreSQL column types; on SQLite (local development,
+tests, load tests) they are rendered as generic ones so init_db() and
+create_all() work there too.
 """
 
+import threading
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.pool_stats import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
+from app.core.query_stats import instrument_engine
+
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
+
+
+def _async_database_url() -> str:
+    """
+    Resolve the URL for the async engine.
+
+    Prefers DATABASE_URL_ASYNC; otherwise derives an asyncpg URL from
+    DATABASE_URL so both engines always point at the same database.
+    """
+    if settings.DATABASE_URL_ASYNC:
+        return settings.DATABASE_URL_ASYNC
+
+    url = settings.DATABASE_URL
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def _pool_kwargs(name: str, pool_class) -> dict:
+    """Instrumented pool sized from settings (see app.core.pool_stats)"""
+    return {
+        "poolclass": pool_class,
+        "pool_logging_name": name,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Verify connections before using
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+
+def get_engine() -> Engine:
+    """
+    Get the synchronous engine (Alembic, scripts, bulk imports)
+
+    Created on first use, so importing the app does not load the DB driver
+    or build a pool; creating it never connects by itself.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    settings.DATABASE_URL,
+                    echo=settings.SQL_ECHO,
+                    **_pool_kwargs("sync", InstrumentedQueuePool),
+                )
+                # Count queries, DB time and rows per request
+                instrument_engine(engine)
+                instrument_pool(engine, "sync")
+                _engine = engine
+    return _engine
+
+
+def build_async_engine(url: str, name: str) -> AsyncEngine:
+    """Async engine with query counting and pool telemetry labelled `name`"""
+    if url.startswith("sqlite"):
+        # aiosqlite stand-ins keep SQLAlchemy's default pool
+        pool_kwargs = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_logging_name": name}
+    else:
+        pool_kwargs = _pool_kwargs(name, InstrumentedAsyncQueuePool)
+    engine = create_async_engine(url, echo=settings.SQL_ECHO, **pool_kwargs)
+    instrument_engine(engine.sync_engine)
+    instrument_pool(engine.sync_engine, name)
+    return engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine for request handlers (the primary), created on first use"""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                _async_engine = build_async_engine(_async_database_url(), "async")
+    return _async_engine
+
+
+def __getattr__(name: str):
+    """`engine` / `async_engine` as module attributes, created on first access"""
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _SyncSession(Session):
+    """Session bound to the sync engine when it first needs a connection"""
+
+    def get_bind(self, mapper=None, **kwargs):
+        return get_engine()
+
+
+class _AsyncSyncSession(Session):
+    """Sync half of AsyncSession, bound to the async engine on first use"""
+
+    def get_bind(self, mapper=None, **kwargs):
+        return get_async_engine().sync_engine
 
-# Create synchronous engine for Alembic and migrations
-# Use DATABASE_URL (synchronous) for migrations and standard operations
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
-    pool_size=5,
-    max_overflow=10,
-)
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=_SyncSession, autocommit=False, autoflush=False)
+
+# Create async session factory
+# expire_on_commit=False so attributes stay readable after commit without
+# triggering an implicit (and, under asyncio, illegal) lazy refresh
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=_AsyncSyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 # Base class for models
 Base = declarative_base()
 
 
+# PostgreSQL-only types as SQLite DDL. UUID values are stored as 32-char hex,
+# as SQLAlchemy binds them on dialects without a native UUID type.
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(UUID, "sqlite")
+def _uuid_on_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector_on_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+
 def get_db():
     """
     Dependency for getting database session
@@ -41,10 +178,33 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency for getting an async database session
+    Use this in `async def` route handlers so queries don't block the event loop
+    
+    Usage:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Item))
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """
     Initialize database - create all tables
     This is mainly for development/testing.
     In production, use Alembic migrations.
     """
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+    engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    
+    # Search triggers live outside the ORM metadata
+    from app.services.alumni_search import alumni_search
+    with engine.begin() as connection:
+        alumni_search.install(connection)
@@ -0,0 +1,85 @@
+"""
+Bounded executor for password hashing
+
+bcrypt is deliberately slow (~100-300 ms of CPU per call). Running it inside
+a coroutine freezes every other request on the worker, so hashing is pushed
+to a dedicated thread pool. The bcrypt C extension releases the GIL while
+hashing, so threads give real parallelism without process start-up or
+pickling costs.
+
+The executor also caps how much work may be queued: once
+PASSWORD_HASH_MAX_PENDING hashes are queued or running, new submissions fail
+fast with HashingSaturatedError instead of piling up behind a login burst.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class HashingSaturatedError(RuntimeError):
+    """Raised when the hashing queue is full and the request should be shed"""
+
+
+class HashingExecutor:
+    """Thread pool sized to the CPU count with a hard limit on pending work"""
+
+    def __init__(self, workers: int = 0, max_pending: int = 64):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of hashes currently queued or running"""
+        return self._pending
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Created on first use so importing the module doesn't spawn threads
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="password-hash",
+                    )
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run `fn(*args)` on the pool and await its result.
+
+        Raises HashingSaturatedError without queueing if the limit is reached.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashingSaturatedError("Password hashing queue is full")
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (used on application shutdown)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Create singleton instance
+hashing_executor = HashingExecutor(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
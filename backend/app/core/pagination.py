@@ -0,0 +1,258 @@
+"""
+Keyset (cursor) pagination for list endpoints
+
+Pages are fetched with `WHERE (sort key, id) > (last seen values)` instead
+of OFFSET, so page 1000 is an index range scan just like page 1. Cursors
+are opaque to clients: the last row's sort key values, JSON-encoded and
+HMAC-signed with SECRET_KEY so they cannot be forged or replayed against a
+different listing.
+
+Usage:
+    paginator = KeysetPaginator(
+        "alumni_by_role",
+        SortKey(Alumni.current_role),
+        SortKey(Alumni.id),  # unique tie-breaker, always last
+    )
+    page = await paginator.paginate(db, select(Alumni).where(...), cursor, limit)
+    return {"data": page.items, "pagination": page.info()}
+
+Invalid or tampered cursors raise InvalidCursorError; endpoints should
+answer 400.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import Select, and_, literal, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed, tampered with, or belongs to another listing"""
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    One column of a keyset ordering
+
+    NULLs sort after every value in ascending order and before every value in
+    descending order (PostgreSQL's default), so indexes built with the
+    default NULL ordering serve the query. `nullable` defaults to the
+    column's own setting.
+    """
+    column: Any
+    descending: bool = False
+    nullable: Optional[bool] = None
+
+    @property
+    def is_nullable(self) -> bool:
+        if self.nullable is not None:
+            return self.nullable
+        expr = self.column.__clause_element__() if hasattr(self.column, "__clause_element__") else self.column
+        return getattr(expr, "nullable", True)
+
+    def order_by(self):
+        if self.descending:
+            return self.column.desc().nulls_first() if self.is_nullable else self.column.desc()
+        return self.column.asc().nulls_last() if self.is_nullable else self.column.asc()
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results plus the cursor for the next one"""
+    items: List[T]
+    next_cursor: Optional[str]
+    has_more: bool
+
+    def info(self) -> Dict[str, Any]:
+        """The `pagination` object of list responses"""
+        return {"next_cursor": self.next_cursor, "has_more": self.has_more}
+
+
+# Cursor values are JSON; non-JSON types are tagged
+def _encode_value(value):
+    if isinstance(value, uuid.UUID):
+        return {"u": value.hex}
+    if isinstance(value, Decimal):
+        return {"d": str(value)}
+    if isinstance(value, datetime):
+        return {"t": value.isoformat()}
+    if isinstance(value, date):
+        return {"D": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if not isinstance(value, dict):
+        return value
+    (tag, raw), = value.items()
+    if tag == "u":
+        return uuid.UUID(raw)
+    if tag == "d":
+        return Decimal(raw)
+    if tag == "t":
+        return datetime.fromisoformat(raw)
+    if tag == "D":
+        return date.fromisoformat(raw)
+    raise ValueError(f"unknown cursor value tag {tag!r}")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class KeysetPaginator:
+    """
+    Paginates a query by a fixed ordering
+
+    The last SortKey must be unique (normally the primary key) so every row
+    has a distinct position. When no key is nullable and all share a
+    direction, the seek predicate is a row-value comparison, which
+    PostgreSQL matches directly against a composite index; otherwise it is
+    expanded into ordered range segments (see _segments).
+    """
+
+    def __init__(self, name: str, *keys: SortKey, secret: Optional[str] = None):
+        if not keys:
+            raise ValueError("at least one sort key is required")
+        self.name = name
+        self.keys = tuple(key if isinstance(key, SortKey) else SortKey(key) for key in keys)
+        self._secret = (secret or settings.SECRET_KEY).encode()
+        directions = {key.descending for key in self.keys}
+        self._row_value = len(directions) == 1 and not any(key.is_nullable for key in self.keys)
+
+    # Cursors
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, self.name.encode() + b"\0" + payload, hashlib.sha256).digest()[:16]
+
+    def encode_cursor(self, values: Sequence[Any]) -> str:
+        payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode()
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def decode_cursor(self, cursor: str) -> List[Any]:
+        try:
+            body, signature = cursor.split(".", 1)
+            payload = _b64decode(body)
+            if not hmac.compare_digest(_b64decode(signature), self._sign(payload)):
+                raise InvalidCursorError("Invalid cursor")
+            values = [_decode_value(v) for v in json.loads(payload)]
+        except InvalidCursorError:
+            raise
+        except (ValueError, TypeError, UnicodeDecodeError):
+            raise InvalidCursorError("Invalid cursor")
+        if len(values) != len(self.keys):
+            raise InvalidCursorError("Invalid cursor")
+        return values
+
+    # Query building
+
+    def _segments(self, values: Sequence[Any], i: int = 0) -> List[Any]:
+        """
+        Predicates selecting the rows after `values`, as ordered segments
+
+        Each segment is a single index range (`k >= v AND (k > v OR ...)`)
+        and segments follow each other in the sort order. A nullable key
+        splits into its non-NULL range and its NULL run, since one predicate
+        spanning both (`k > v OR k IS NULL`) cannot be answered by an index
+        range and makes the database sort everything after the cursor.
+        """
+        if i == len(self.keys):
+            return []
+        key, value = self.keys[i], values[i]
+        column = key.column
+        rest = self._segments(values, i + 1)
+
+        if value is None:
+            # Inside the NULL run: finish it, then (descending) the non-NULL values
+            segments = [and_(column.is_(None), r) for r in rest]
+            if key.descending:
+                segments.append(column.is_not(None))
+            return segments
+
+        if key.descending:
+            beyond, through = column < value, column <= value
+        else:
+            beyond, through = column > value, column >= value
+        if rest:
+            segments = [and_(column == value, r) for r in rest[:-1]]
+            segments.append(and_(through, or_(beyond, rest[-1])))
+        else:
+            segments = [beyond]
+        if key.is_nullable and not key.descending:
+            segments.append(column.is_(None))
+        return segments
+
+    def statements(self, query: Select, cursor: Optional[str]) -> List[Select]:
+        """
+        The ordered statements that together continue `query` after `cursor`
+
+        Sort key columns are appended to the select list so the next cursor
+        can be read from the rows. Callers run them in order, each with a
+        LIMIT of the rows still missing plus one, until the page is full.
+        """
+        query = query.add_columns(*(key.column for key in self.keys))
+        query = query.order_by(None).order_by(*(key.order_by() for key in self.keys))
+        if not cursor:
+            return [query]
+        values = self.decode_cursor(cursor)
+        if self._row_value:
+            columns = tuple_(*(key.column for key in self.keys))
+            bound = tuple_(*(literal(value, key.column.type) for key, value in zip(self.keys, values)))
+            return [query.where(columns < bound if self.keys[0].descending else columns > bound)]
+        return [query.where(segment) for segment in self._segments(values)]
+
+    def page_from_rows(self, rows: Sequence[Any], limit: int) -> Page:
+        """Build a Page from up to limit + 1 rows of `statements()`"""
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        width = len(self.keys)
+        next_cursor = self.encode_cursor(list(rows[-1][-width:])) if has_more and rows else None
+        items = [row[0] if len(row) == width + 1 else tuple(row[:-width]) for row in rows]
+        return Page(items=items, next_cursor=next_cursor, has_more=has_more)
+
+    async def paginate(
+        self,
+        session: AsyncSession,
+        query: Select,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Page:
+        """Fetch one page of `query`"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows: List[Any] = []
+        for statement in self.statements(query, cursor):
+            result = await session.execute(statement.limit(limit + 1 - len(rows)))
+            rows.extend(result.all())
+            if len(rows) > limit:
+                break
+        return self.page_from_rows(rows, limit)
+
+    def paginate_sync(self, connection, query: Select, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """Same as paginate() for a blocking Session or Connection (scripts, jobs)"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows: List[Any] = []
+        for statement in self.statements(query, cursor):
+            rows.extend(connection.execute(statement.limit(limit + 1 - len(rows))).all())
+            if len(rows) > limit:
+                break
+        return self.page_from_rows(rows, limit)
@@ -0,0 +1,93 @@
+"""
+Connection pool telemetry
+
+Engines created through app.core.database use the instrumented QueuePool
+classes below, labelled with the pool's logging name:
+
+- db_pool_checkout_seconds: time for `pool.connect()`; waiting for a free
+  connection, opening an overflow connection and the pre-ping all count,
+  so a rising tail means requests are queueing for connections
+- db_pool_timeouts_total: checkouts that gave up after DB_POOL_TIMEOUT_SECONDS
+- db_pool_invalidations_total: connections discarded, by reason
+  ("pre_ping" when the checkout ping found the connection dead, "error"
+  for disconnects detected while a statement ran)
+- gauges per pool (pool_stats): size, checked out, idle, overflow in use
+"""
+
+import time
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.metrics import metrics
+
+_checkout_time = metrics.histogram(
+    "db_pool_checkout_seconds",
+    "Time to check a connection out of the pool (queue wait, new connection, pre-ping)",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+_checkout_timeouts = metrics.counter(
+    "db_pool_timeouts_total", "Checkouts that timed out waiting for a free connection"
+)
+_invalidations = metrics.counter(
+    "db_pool_invalidations_total", "Pooled connections discarded as dead, by reason"
+)
+
+# Engines whose pools are reported as gauges, by pool name
+_engines: Dict[str, Engine] = {}
+
+
+class _TimedCheckout:
+    """Pool mixin timing every checkout"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            _checkout_timeouts.inc(pool=self.logging_name)
+            raise
+        finally:
+            _checkout_time.observe(time.perf_counter() - started, pool=self.logging_name)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """
+    Report `engine`'s pool under `name` (pass `async_engine.sync_engine`
+    for async engines)
+
+    The engine must have been created with `pool_logging_name=name` so the
+    checkout timings carry the same label.
+    """
+    _engines[name] = engine
+
+    @event.listens_for(engine, "invalidate")
+    def _count_invalidation(dbapi_connection, connection_record, exception):
+        # A failed checkout ping surfaces as DisconnectionError; disconnects
+        # seen by a running statement carry the driver's own error
+        reason = "pre_ping" if isinstance(exception, exc.DisconnectionError) else "error"
+        _invalidations.inc(pool=name, reason=reason)
+
+
+def pool_stats() -> Dict[str, float]:
+    """Current size / usage of every instrumented QueuePool"""
+    stats: Dict[str, float] = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue  # NullPool / StaticPool stand-ins have nothing to report
+        stats[f"{name}_size"] = pool.size()
+        stats[f"{name}_checked_out"] = pool.checkedout()
+        stats[f"{name}_idle"] = pool.checkedin()
+        stats[f"{name}_overflow"] = max(0, pool.overflow())
+    return stats
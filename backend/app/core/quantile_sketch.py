@@ -0,0 +1,105 @@
+"""
+Mergeable quantile sketch with relative-error guarantees (DDSketch)
+"""
+
+import math
+from typing import Dict, Optional
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch over non-negative values
+
+    Values fall into logarithmic bins of ratio gamma = (1 + a) / (1 - a), so
+    any quantile is answered within relative error `relative_accuracy` of
+    the true value, in memory bounded by `max_bins` regardless of how many
+    values were added. Values below `min_value` share one bin reported as 0.
+    Sketches with the same accuracy merge exactly, which lets running
+    aggregates be built up from per-batch sketches.
+
+    When more than `max_bins` bins are needed the lowest bins are collapsed
+    together, so accuracy is kept for the upper quantiles.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 512, min_value: float = 1e-3):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        # Midpoint (in relative terms) of the bin's range (gamma^(i-1), gamma^i]
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        if value < 0:
+            raise ValueError("QuantileSketch only holds non-negative values")
+        if value < self.min_value:
+            self.zeros += weight
+        else:
+            index = self._index(value)
+            self.bins[index] = self.bins.get(index, 0) + weight
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += weight
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, weight in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + weight
+        self.zeros += other.zeros
+        self.count += other.count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        ordered = sorted(self.bins)
+        excess = ordered[: len(ordered) - self.max_bins + 1]
+        self.bins[excess[-1]] += sum(self.bins.pop(index) for index in excess[:-1])
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q in [0, 1]; None when empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return self._value(index)
+        return self._value(max(self.bins))
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form (bin indexes as parallel lists)"""
+        indexes = sorted(self.bins)
+        return {
+            "accuracy": self.relative_accuracy,
+            "indexes": indexes,
+            "counts": [self.bins[index] for index in indexes],
+            "zeros": self.zeros,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict], **kwargs) -> "QuantileSketch":
+        if not data:
+            return cls(**kwargs)
+        sketch = cls(relative_accuracy=data["accuracy"], **kwargs)
+        sketch.bins = dict(zip(data["indexes"], data["counts"]))
+        sketch.zeros = data["zeros"]
+        sketch.count = sketch.zeros + sum(sketch.bins.values())
+        return sketch
+
+    def __len__(self) -> int:
+        return self.count
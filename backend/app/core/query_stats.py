@@ -0,0 +1,133 @@
+"""
+Per-request SQL query accounting
+
+Engine event hooks count statements, time spent in the driver and rows
+touched for whatever scopes are currently active:
+
+- QueryStatsMiddleware opens a scope per HTTP request, reports it in a
+  `Server-Timing` header and records it in the metrics registry
+- `track_queries()` / `assert_max_queries()` open ad-hoc scopes, e.g. in
+  tests, to fail CI when an endpoint starts making more round trips (see
+  tests/test_query_budgets.py):
+
+    def test_me_is_one_query(client, token):
+        with assert_max_queries(1):
+            client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+Only ad-hoc scopes keep the SQL text of their statements (for the
+assertion message); per-request scopes keep counters only.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import metrics
+
+
+@dataclass
+class QueryStats:
+    """Counters for one scope (request, test block, ...)"""
+    queries: int = 0
+    duration: float = 0.0  # seconds spent executing statements
+    rows: int = 0
+    statements: List[str] = field(default_factory=list)
+    max_statements: Optional[int] = None  # SQL strings kept in `statements`; None keeps all
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.queries} queries, {self.rows} rows"'
+
+
+# Active scopes for the current context; nested scopes all see each query
+_active: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+_query_count = metrics.histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+)
+_query_time = metrics.histogram("db_time_per_request_seconds", "Time spent in SQL per HTTP request")
+_query_rows = metrics.counter("db_rows_total", "Rows returned or affected by SQL statements")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    scopes = _active.get()
+    if not scopes:
+        return
+    rows = max(getattr(cursor, "rowcount", 0) or 0, 0)
+    for stats in scopes:
+        stats.queries += 1
+        stats.duration += elapsed
+        stats.rows += rows
+        if stats.max_statements is None or len(stats.statements) < stats.max_statements:
+            stats.statements.append(statement)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Install the counting hooks (pass `async_engine.sync_engine` for async engines)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count queries executed inside the block"""
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail if the block executes more than `limit` SQL statements"""
+    with track_queries() as stats:
+        yield stats
+    if stats.queries > limit:
+        listing = "\n".join(f"  {i + 1}. {sql}" for i, sql in enumerate(stats.statements))
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.queries}:\n{listing}")
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware adding a Server-Timing header with the request's DB totals"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(max_statements=0)
+        token = _active.set(_active.get() + (stats,))
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _active.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            _query_count.observe(stats.queries, route=path)
+            _query_time.observe(stats.duration, route=path)
+            _query_rows.inc(stats.rows, route=path)
@@ -0,0 +1,345 @@
+"""
+Per-client rate limiting for /api routes
+
+Implements the limits documented in API_SPECIFICATION.md ("Rate
+Limiting"). Each request falls into one route group, each group has its
+own per-minute limit, and every /api response carries
+X-RateLimit-Limit / -Remaining / -Reset. Requests over the limit get 429
+with Retry-After.
+
+The auth group (the credential endpoints: login, register, verify-email)
+is always keyed by client IP, so the password-guessing budget cannot be
+reset by sending tokens. Other groups are keyed by the `sub` of a token
+that verifies (signature and expiry), i.e. per user across all of that
+user's tokens; unverifiable or missing tokens fall back to the IP. For
+the session group (refresh, logout) that token is the bearer token, or
+the `refresh_token` of a refresh request's JSON body, so users behind one
+NAT or proxy do not share a refresh budget.
+
+Backends (RATE_LIMIT_BACKEND):
+- "local": an in-process token bucket per (group, client). No I/O; limits
+  apply per worker process.
+- "redis": the local bucket still rejects clients this worker alone has
+  seen over the limit, without a round trip. Everything else goes to a
+  sliding-window log in Redis, checked and updated by one Lua script, so
+  all workers share one budget. If Redis is unreachable the local
+  decision stands.
+"""
+
+import json
+import math
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import RedisCircuit, get_redis
+from app.core.security import decode_token
+
+_limited_total = metrics.counter("rate_limited_total", "Requests rejected by the rate limiter")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`limit` requests per `window` seconds for one route group"""
+    group: str
+    limit: int
+    window: float = 60.0
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.window
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float  # Epoch seconds when the full budget is available again
+    retry_after: float = 0.0
+
+
+def default_classifier(limits: Dict[str, RateLimit]) -> Callable[[str, str], Optional[RateLimit]]:
+    """
+    Route groups of the API spec:
+    session (POST /api/v1/auth/refresh and /logout), auth (other
+    POST /api/v1/auth/*), discovery (discover/search), reads (GET),
+    writes (everything else). Paths outside /api/ are not limited.
+    """
+    auth, session = limits["auth"], limits["session"]
+    discovery, reads, writes = limits["discovery"], limits["reads"], limits["writes"]
+
+    def classify(method: str, path: str) -> Optional[RateLimit]:
+        if not path.startswith("/api/"):
+            return None
+        if method == "OPTIONS":
+            return None
+        if path.startswith("/api/v1/auth/") and method == "POST":
+            return session if path.rstrip("/") in SESSION_PATHS else auth
+        if "/discover" in path or "/search" in path:
+            return discovery
+        if method in ("GET", "HEAD"):
+            return reads
+        return writes
+
+    return classify
+
+
+# Token-holding auth endpoints; limited per user instead of per IP
+SESSION_PATHS = frozenset({"/api/v1/auth/refresh", "/api/v1/auth/logout"})
+
+
+class LocalBuckets:
+    """Token buckets held in this process"""
+
+    def __init__(self, max_entries: int = 100_000, idle_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.idle_seconds = idle_seconds  # Longest window: a bucket idle this long is full again
+        self._buckets: Dict[Tuple[str, str], List[float]] = {}  # key -> [tokens, updated_at]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, rule: RateLimit, client: str, now: float) -> Decision:
+        key = (rule.group, client)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_entries:
+                self._evict(now)
+            bucket = self._buckets[key] = [float(rule.limit), now]
+        else:
+            bucket[0] = min(rule.limit, bucket[0] + (now - bucket[1]) * rule.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return Decision(True, rule.limit, int(bucket[0]), now + (rule.limit - bucket[0]) / rule.rate)
+        wait = (1.0 - bucket[0]) / rule.rate
+        return Decision(False, rule.limit, 0, now + (rule.limit - bucket[0]) / rule.rate, wait)
+
+    def refund(self, rule: RateLimit, client: str) -> None:
+        bucket = self._buckets.get((rule.group, client))
+        if bucket is not None:
+            bucket[0] = min(rule.limit, bucket[0] + 1.0)
+
+    def _evict(self, now: float) -> None:
+        """Drop buckets that have refilled completely (idle for a full window)"""
+        idle = [key for key, (_, updated_at) in self._buckets.items() if now - updated_at >= self.idle_seconds]
+        for key in idle:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_entries:
+            # Still full of active clients: forget the oldest half
+            for key, _ in sorted(self._buckets.items(), key=lambda item: item[1][1])[: self.max_entries // 2]:
+                del self._buckets[key]
+
+
+# KEYS[1]: log zset; ARGV: now (ms), window (ms), limit, member
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], window)
+    count = count + 1
+    allowed = 1
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local oldest_at = now
+if oldest[2] then
+    oldest_at = tonumber(oldest[2])
+end
+return {allowed, limit - count, oldest_at}
+"""
+
+
+class RateLimiter:
+    """Decides whether a request may proceed"""
+
+    def __init__(self, classify: Callable[[str, str], Optional[RateLimit]], backend: str = "local"):
+        self.classify = classify
+        self.use_redis = backend == "redis"
+        self.local = LocalBuckets()
+        self._circuit = RedisCircuit()
+        self._script = None
+        self.redis_errors = 0
+
+    async def _redis_decision(self, rule: RateLimit, client: str, now: float) -> Decision:
+        if self._script is None:
+            self._script = get_redis().register_script(_SLIDING_WINDOW_SCRIPT)
+        now_ms = int(now * 1000)
+        window_ms = int(rule.window * 1000)
+        allowed, remaining, oldest_ms = await self._script(
+            keys=[f"ratelimit:{rule.group}:{client}"],
+            args=[now_ms, window_ms, rule.limit, f"{now_ms}:{uuid.uuid4().hex[:8]}"],
+        )
+        reset = (int(oldest_ms) + window_ms) / 1000.0
+        return Decision(bool(allowed), rule.limit, max(0, int(remaining)), reset, 0.0 if allowed else max(0.0, reset - now))
+
+    async def check(self, rule: RateLimit, client: str) -> Decision:
+        now = time.time()
+        decision = self.local.take(rule, client, now)
+        if not self.use_redis or not decision.allowed or not self._circuit.available:
+            return decision
+        try:
+            shared = await self._redis_decision(rule, client, now)
+        except Exception:
+            self.redis_errors += 1
+            self._circuit.record_failure()
+            return decision
+        if not shared.allowed:
+            # Other workers used the budget; this one's bucket shouldn't have spent a token
+            self.local.refund(rule, client)
+        return shared
+
+    def stats(self) -> Dict[str, int]:
+        return {"local_buckets": len(self.local), "redis_errors": self.redis_errors}
+
+
+# Verified bearer token -> (sub, exp); only tokens that passed decode_token
+# are remembered, so forged ones pay for verification every time
+_subjects: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+_SUBJECTS_MAX = 10_000
+
+
+def _token_subject(token: bytes) -> Optional[str]:
+    cached = _subjects.get(token)
+    if cached is not None:
+        if cached[1] > time.time():
+            _subjects.move_to_end(token)
+            return cached[0]
+        del _subjects[token]
+    payload = decode_token(token.decode("latin-1"))
+    if payload is None or not payload.get("sub"):
+        return None
+    _subjects[token] = (str(payload["sub"]), float(payload.get("exp", 0)))
+    if len(_subjects) > _SUBJECTS_MAX:
+        _subjects.popitem(last=False)
+    return _subjects[token][0]
+
+
+def _bearer_token(scope) -> Optional[bytes]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            return value[7:].strip() if value[:7].lower() == b"bearer " else None
+    return None
+
+
+_MAX_BODY_BYTES = 16 * 1024  # A refresh body is one token; larger ones are keyed by IP
+
+
+async def _body_refresh_token(receive) -> Tuple[Optional[bytes], Callable]:
+    """
+    Read the request body for its `refresh_token`
+
+    Returns the token (if any) and a receive callable that replays the
+    consumed messages to the application.
+    """
+    messages, body = [], b""
+    while len(body) <= _MAX_BODY_BYTES:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            try:
+                token = json.loads(body).get("refresh_token")
+            except (ValueError, AttributeError):
+                token = None
+            if isinstance(token, str) and token:
+                return token.encode("latin-1", "replace"), _replay(messages, receive)
+            break
+    return None, _replay(messages, receive)
+
+
+def _replay(messages: list, receive) -> Callable:
+    async def replay():
+        if messages:
+            return messages.pop(0)
+        return await receive()
+    return replay
+
+
+def client_key(scope, rule: RateLimit, token: Optional[bytes] = None) -> str:
+    """
+    Client IP for the auth group; otherwise the verified token's user, else the IP
+
+    `token` defaults to the bearer token of the request.
+    """
+    if rule.group != "auth":
+        token = token or _bearer_token(scope)
+        subject = _token_subject(token) if token else None
+        if subject is not None:
+            return "u:" + subject
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+def _headers(decision: Decision) -> List[Tuple[bytes, bytes]]:
+    return [
+        (b"x-ratelimit-limit", str(decision.limit).encode()),
+        (b"x-ratelimit-remaining", str(decision.remaining).encode()),
+        (b"x-ratelimit-reset", str(math.ceil(decision.reset)).encode()),
+    ]
+
+
+_REJECTED_BODY = json.dumps({"detail": "Rate limit exceeded"}).encode()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying a RateLimiter to HTTP requests"""
+
+    def __init__(self, app, limiter: Optional["RateLimiter"] = None):
+        self.app = app
+        self.limiter = limiter or rate_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rule = self.limiter.classify(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = None
+        if rule.group == "session" and _bearer_token(scope) is None:
+            # Refresh sends its token in the body
+            token, receive = await _body_refresh_token(receive)
+        decision = await self.limiter.check(rule, client_key(scope, rule, token))
+        headers = _headers(decision)
+        if not decision.allowed:
+            _limited_total.inc(group=rule.group)
+            headers.append((b"retry-after", str(max(1, math.ceil(decision.retry_after))).encode()))
+            headers.append((b"content-type", b"application/json"))
+            headers.append((b"content-length", str(len(_REJECTED_BODY)).encode()))
+            await send({"type": "http.response.start", "status": 429, "headers": headers})
+            await send({"type": "http.response.body", "body": _REJECTED_BODY})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+DEFAULT_LIMITS = {
+    "auth": RateLimit("auth", settings.RATE_LIMIT_AUTH_PER_MINUTE),
+    "session": RateLimit("session", settings.RATE_LIMIT_SESSION_PER_MINUTE),
+    "reads": RateLimit("reads", settings.RATE_LIMIT_READS_PER_MINUTE),
+    "writes": RateLimit("writes", settings.RATE_LIMIT_WRITES_PER_MINUTE),
+    "discovery": RateLimit("discovery", settings.RATE_LIMIT_DISCOVERY_PER_MINUTE),
+}
+
+# Create singleton instance
+rate_limiter = RateLimiter(default_classifier(DEFAULT_LIMITS), backend=settings.RATE_LIMIT_BACKEND)
@@ -0,0 +1,127 @@
+"""
+Deep readiness probe
+
+/ready checks that this worker can reach its dependencies: `SELECT 1`
+through the async engine's pool (so an exhausted pool also reads as not
+ready) and a Redis PING. /health stays a static liveness check.
+
+Results are cached for READINESS_CACHE_SECONDS and concurrent probes share
+one in-flight check, so however often orchestrators probe, each worker
+adds at most one query per window.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import get_async_engine
+from app.core.redis import get_redis
+
+
+async def check_database() -> None:
+    async with get_async_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def check_redis() -> None:
+    await get_redis().ping()
+
+
+@dataclass
+class ReadinessReport:
+    """Outcome of one probe run"""
+    ready: bool
+    checks: Dict[str, Dict[str, object]]
+    checked_at: float  # time.monotonic()
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "not_ready",
+            "checks": self.checks,
+            "age_seconds": round(time.monotonic() - self.checked_at, 3),
+        }
+
+
+class ReadinessProbe:
+    """Dependency checks behind /ready, cached for a short TTL"""
+
+    def __init__(
+        self,
+        checks: Dict[str, Callable[[], Awaitable[None]]],
+        required: Optional[set] = None,
+        ttl_seconds: float = 2.0,
+        timeout_seconds: float = 1.0,
+    ):
+        self.checks = checks
+        self.required = set(checks) if required is None else required
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._report: Optional[ReadinessReport] = None
+        self._lock = asyncio.Lock()
+        self.probes = 0
+        self.cache_hits = 0
+        self.runs = 0
+        self.failures = 0
+
+    def _fresh(self) -> Optional[ReadinessReport]:
+        report = self._report
+        if report is not None and time.monotonic() - report.checked_at < self.ttl_seconds:
+            return report
+        return None
+
+    async def _run_check(self, name: str, check: Callable[[], Awaitable[None]]) -> Dict[str, object]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout_seconds)
+            result = {"ok": True}
+        except Exception as e:
+            # Only the error type is returned; the message may name hosts
+            print(f"[READY] {name} check failed: {e!r}")
+            result = {"ok": False, "error": type(e).__name__}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        result["required"] = name in self.required
+        return result
+
+    async def check(self) -> ReadinessReport:
+        """Cached report, or run every check concurrently if it has expired"""
+        self.probes += 1
+        report = self._fresh()
+        if report is None:
+            async with self._lock:
+                # Probes that queued behind a run reuse its result
+                report = self._fresh()
+                if report is None:
+                    names = list(self.checks)
+                    results = await asyncio.gather(*(self._run_check(name, self.checks[name]) for name in names))
+                    checks = dict(zip(names, results))
+                    ready = all(result["ok"] for name, result in checks.items() if name in self.required)
+                    report = self._report = ReadinessReport(ready=ready, checks=checks, checked_at=time.monotonic())
+                    self.runs += 1
+                    if not ready:
+                        self.failures += 1
+                    return report
+        self.cache_hits += 1
+        return report
+
+    def stats(self) -> Dict[str, float]:
+        report = self._report
+        return {
+            "probes": self.probes,
+            "cache_hits": self.cache_hits,
+            "runs": self.runs,
+            "failures": self.failures,
+            "ready": int(report.ready) if report else -1,
+        }
+
+
+# Create singleton instance
+readiness_probe = ReadinessProbe(
+    checks={"database": check_database, "redis": check_redis},
+    required={"database", "redis"} if settings.READINESS_REQUIRE_REDIS else {"database"},
+    ttl_seconds=settings.READINESS_CACHE_SECONDS,
+    timeout_seconds=settings.READINESS_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,81 @@
+"""
+Shared Redis client
+"""
+
+import time
+from typing import Optional
+
+import redis
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+_client: Optional[Redis] = None
+_sync_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> Redis:
+    """
+    Get the process-wide async Redis client
+
+    The client is created on first use; connections are opened lazily by
+    its pool, so calling this never performs I/O by itself.
+    """
+    global _client
+    if _client is None:
+        _client = Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+    return _client
+
+
+def get_sync_redis() -> redis.Redis:
+    """
+    Get the process-wide blocking Redis client
+
+    For code running outside the event loop (sync sessions, scripts);
+    created on first use like get_redis().
+    """
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+    return _sync_client
+
+
+async def close_redis() -> None:
+    """Close the shared clients (used on application shutdown)"""
+    global _client, _sync_client
+    if _client is not None:
+        await _client.close()
+        _client = None
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
+
+class RedisCircuit:
+    """
+    Skip Redis for a cool-down period after an error
+
+    Optional Redis tiers use this so an unreachable Redis costs one failed
+    call per cool-down instead of a timeout on every request.
+    """
+
+    def __init__(self, cooldown_seconds: float = 30.0):
+        self.cooldown_seconds = cooldown_seconds
+        self.errors = 0
+        self._open_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._open_until
+
+    def record_failure(self) -> None:
+        self.errors += 1
+        self._open_until = time.monotonic() + self.cooldown_seconds
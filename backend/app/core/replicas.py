@@ -0,0 +1,293 @@
+"""
+Read-replica routing
+
+Sessions from `get_read_db` run their SELECTs on a replica and everything
+else (flushes, DML) on the primary. A replica is used only while its
+measured lag is within DATABASE_REPLICA_MAX_LAG_SECONDS; when none
+qualifies, reads fall back to the primary.
+
+Read-your-writes: a request that committed a write sets a cookie holding
+a deadline DATABASE_READ_YOUR_WRITES_SECONDS ahead, and requests carrying
+an unexpired deadline read from the primary. The rest of the writing
+request reads from the primary as well.
+
+Use the read session only for endpoints that never write and whose
+result is not cached for longer than the lag threshold.
+
+Check the replicas from the command line:
+    python -m app.core.replicas
+"""
+
+import asyncio
+import itertools
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from http.cookies import CookieError, SimpleCookie
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import build_async_engine, get_async_engine
+
+STICKY_COOKIE = "db_primary_until"
+
+# Seconds behind the primary; 0 on a primary (or a standalone local copy)
+_POSTGRES_LAG = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+@dataclass
+class RoutingScope:
+    """Per-request routing state, set by ReadYourWritesMiddleware"""
+    primary_until: float = 0.0  # Unix time from the client's cookie
+    wrote: bool = False  # This request committed a write
+
+    def use_primary(self) -> bool:
+        return self.wrote or time.time() < self.primary_until
+
+
+_scope: ContextVar[Optional[RoutingScope]] = ContextVar("db_routing", default=None)
+
+
+class _Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.engine: Optional[AsyncEngine] = None
+        self.lag: Optional[float] = None  # None until measured, or after a failed check
+        self.errors = 0
+
+    def get_engine(self) -> AsyncEngine:
+        if self.engine is None:
+            self.engine = build_async_engine(self.url, self.name)
+        return self.engine
+
+
+class ReplicaRouter:
+    """Picks the engine for read-only sessions and tracks replica lag"""
+
+    def __init__(
+        self,
+        urls: List[str],
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 2.0,
+    ):
+        self.replicas = [_Replica(f"replica{i + 1}", url) for i, url in enumerate(urls)]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.replica_reads = 0
+        self.sticky_reads = 0  # Sent to the primary for read-your-writes
+        self.fallback_reads = 0  # Sent to the primary because no replica was usable
+
+    def read_engine(self) -> AsyncEngine:
+        """Engine for a new read session"""
+        scope = _scope.get()
+        if scope is not None and scope.use_primary():
+            self.sticky_reads += 1
+            return get_async_engine()
+        usable = [r for r in self.replicas if r.lag is not None and r.lag <= self.max_lag_seconds]
+        if not usable:
+            if self.replicas:
+                self.fallback_reads += 1
+            return get_async_engine()
+        self.replica_reads += 1
+        return usable[next(self._next) % len(usable)].get_engine()
+
+    async def _measure(self, replica: _Replica) -> None:
+        try:
+            async with replica.get_engine().connect() as connection:
+                if connection.dialect.name == "postgresql":
+                    replica.lag = float(await connection.scalar(_POSTGRES_LAG))
+                else:
+                    # No replication status to read (local stand-ins): reachable means current
+                    await connection.execute(text("SELECT 1"))
+                    replica.lag = 0.0
+        except Exception as e:
+            replica.errors += 1
+            replica.lag = None
+            print(f"[REPLICA] {replica.name} lag check failed: {e!r}")
+
+    async def check_once(self) -> Dict[str, Optional[float]]:
+        """Measure every replica's lag concurrently"""
+        await asyncio.gather(*(self._measure(replica) for replica in self.replicas))
+        return {replica.name: replica.lag for replica in self.replicas}
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.check_once()
+            except Exception as e:
+                print(f"[REPLICA] Lag check error: {e}")
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        """Measure lag in the background (no-op without replicas)"""
+        if self.replicas and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            if replica.engine is not None:
+                await replica.engine.dispose()
+                replica.engine = None
+
+    def stats(self) -> Dict[str, float]:
+        stats = {
+            "replica_reads": self.replica_reads,
+            "sticky_reads": self.sticky_reads,
+            "fallback_reads": self.fallback_reads,
+        }
+        for replica in self.replicas:
+            stats[f"{replica.name}_lag_seconds"] = -1 if replica.lag is None else replica.lag
+            stats[f"{replica.name}_errors"] = replica.errors
+        return stats
+
+
+# Create singleton instance
+replica_router = ReplicaRouter(
+    settings.DATABASE_REPLICA_URLS,
+    max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_REPLICA_CHECK_SECONDS,
+)
+
+
+class _ReadSyncSession(Session):
+    """
+    Sync half of a read AsyncSession
+
+    The read engine is chosen once per session so all of its SELECTs see
+    the same server; flushes go to the primary.
+    """
+
+    def get_bind(self, mapper=None, **kwargs):
+        if self._flushing:
+            return get_async_engine().sync_engine
+        engine = self.info.get("read_engine")
+        if engine is None:
+            engine = self.info["read_engine"] = replica_router.read_engine()
+        return engine.sync_engine
+
+
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=_ReadSyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_read_db():
+    """
+    Dependency for read-only endpoints: a session on a caught-up replica,
+    or on the primary (no replica usable, or read-your-writes)
+
+    Usage:
+        @router.get("/items")
+        async def list_items(db: AsyncSession = Depends(get_read_db)):
+            ...
+    """
+    async with ReadSessionLocal() as db:
+        yield db
+
+
+# Sessions that wrote mark the request so its later reads (and the
+# client's next ones, via the cookie) go to the primary
+@event.listens_for(Session, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_dml(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _note_commit(session):
+    if session.info.pop("wrote", False):
+        scope = _scope.get()
+        if scope is not None:
+            scope.wrote = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session):
+    session.info.pop("wrote", None)
+
+
+def _sticky_deadline(headers) -> float:
+    for name, value in headers:
+        if name == b"cookie":
+            try:
+                cookie = SimpleCookie(value.decode("latin-1"))
+            except CookieError:
+                return 0.0
+            morsel = cookie.get(STICKY_COOKIE)
+            if morsel is not None:
+                try:
+                    return float(morsel.value)
+                except ValueError:
+                    return 0.0
+    return 0.0
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware carrying read-your-writes stickiness in a cookie"""
+
+    def __init__(self, app, sticky_seconds: float = 10.0):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        routing = RoutingScope(primary_until=_sticky_deadline(scope.get("headers", [])))
+        token = _scope.set(routing)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and routing.wrote:
+                cookie = (
+                    f"{STICKY_COOKIE}={time.time() + self.sticky_seconds:.3f}; "
+                    f"Max-Age={int(self.sticky_seconds) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _scope.reset(token)
+
+
+if __name__ == "__main__":
+    async def _check():
+        if not replica_router.replicas:
+            print("[REPLICA] No DATABASE_REPLICA_URLS configured")
+            return
+        for name, lag in (await replica_router.check_once()).items():
+            usable = lag is not None and lag <= replica_router.max_lag_seconds
+            print(f"[REPLICA] {name}: lag={lag} usable={usable}")
+        await replica_router.stop()
+
+    asyncio.run(_check())
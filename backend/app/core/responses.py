@@ -0,0 +1,50 @@
+"""
+Fast JSON responses
+
+FastAPI's default path for `return SomeModel(...)` with a response_model
+dumps the model to a dict, validates that dict back into the response
+model, serializes it again to JSON-compatible Python, and finally runs
+json.dumps over the result. FastJSONResponse replaces the tail of that:
+
+- a Pydantic model passed as content is serialized to bytes in one pass
+  by its compiled pydantic-core serializer; an endpoint that returns
+  `FastJSONResponse(model)` skips FastAPI's re-validation entirely
+  (keep `response_model=` on the route for the OpenAPI schema)
+- anything else (dicts from endpoints, or the output of FastAPI's own
+  serialization when FastJSONResponse is the default response class) is
+  encoded with orjson
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not encode natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes for a model or plain content"""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core (models) or orjson (everything else)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -7,7 +7,9 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.hashing import hashing_executor
 import secrets
+import uuid
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -35,6 +37,24 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(safe_password)
 
 
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the hashing executor without blocking the event loop
+
+    Raises HashingSaturatedError if the hashing queue is full.
+    """
+    return await hashing_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def ahash_password(password: str) -> str:
+    """
+    Hash a password on the hashing executor without blocking the event loop
+
+    Raises HashingSaturatedError if the hashing queue is full.
+    """
+    return await hashing_executor.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -53,7 +73,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -70,7 +90,7 @@ def create_refresh_token(data: dict) -> str:
     """
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "refresh"})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -79,6 +99,9 @@ def decode_token(token: str) -> Optional[dict]:
     """
     Decode and verify a JWT token
     
+    Only checks signature and expiry; callers accepting the token must also
+    consult app.services.token_revocation.revocation_list with its `jti`.
+    
     Args:
         token: JWT token string
     
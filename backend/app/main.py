@@ -3,9 +3,30 @@ Alumni Connect Platform - FastAPI Application
 Main entry point for the backend API
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.hashing import hashing_executor
+from app.core.metrics import metrics
+from app.core.pool_stats import pool_stats
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.readiness import readiness_probe
+from app.core.redis import close_redis
+from app.core.replicas import ReadYourWritesMiddleware, replica_router
+from app.core.responses import FastJSONResponse
+from app.services.alumni_changes import alumni_changes
+from app.services.canonical_names import canonical_dictionary
+from app.services.capacity import capacity_service
+from app.services.email_outbox import email_outbox_worker
+from app.services.email_service import close_email_service
+from app.services.principal_cache import principal_cache
+from app.services.score_aggregation import score_aggregator
+from app.services.shared_context import shared_context_materializer
+from app.services.token_revocation import revocation_list
+from app.services.verification_tokens import verification_token_purger
 
 # Create FastAPI app instance
 app = FastAPI(
@@ -14,8 +35,13 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
 )
 
+# Per-client rate limits; added first so CORS headers also wrap its 429s
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -25,6 +51,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request query count / DB time (Server-Timing header and /metrics)
+app.add_middleware(QueryStatsMiddleware)
+
+# Clients that just wrote read from the primary until replicas catch up
+if settings.DATABASE_REPLICA_URLS:
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+
+# Component counters exposed as gauges on /metrics
+metrics.register_collector("principal_cache", principal_cache.stats)
+metrics.register_collector("token_revocation", revocation_list.stats)
+metrics.register_collector("email_outbox", email_outbox_worker.stats)
+metrics.register_collector("shared_context", shared_context_materializer.stats)
+metrics.register_collector("capacity", capacity_service.stats)
+metrics.register_collector("scores", score_aggregator.stats)
+metrics.register_collector("rate_limit", rate_limiter.stats)
+metrics.register_collector("password_hash", lambda: {"pending": hashing_executor.pending})
+metrics.register_collector("db_pool", pool_stats)
+metrics.register_collector("replicas", replica_router.stats)
+metrics.register_collector("readiness", readiness_probe.stats)
+metrics.register_collector("verification_tokens", verification_token_purger.stats)
+metrics.register_collector("alumni_changes", alumni_changes.stats)
+
 
 @app.get("/")
 async def root():
@@ -38,13 +86,69 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Detailed health check"""
+    """Liveness check (static; see /ready for dependencies)"""
     return {
         "status": "healthy",
         "environment": settings.ENVIRONMENT
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: database (and Redis) reachable; 503 otherwise"""
+    report = await readiness_probe.check()
+    return FastJSONResponse(
+        report.to_dict(),
+        status_code=status.HTTP_200_OK if report.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus-format metrics for this worker"""
+    return metrics.render()
+
+
+@app.on_event("startup")
+async def startup():
+    """Start background tasks"""
+    revocation_list.start()
+    replica_router.start()
+    try:
+        async with AsyncSessionLocal() as session:
+            await canonical_dictionary.load(session)
+    except Exception as e:
+        # Profiles keep their text; canonical ids are filled in by the backfill
+        print(f"[CANONICAL] Dictionary not loaded: {e}")
+    if settings.EMAIL_OUTBOX_WORKER_ENABLED:
+        email_outbox_worker.start()
+    if settings.SHARED_CONTEXT_WORKER_ENABLED:
+        shared_context_materializer.start()
+    if settings.SCORE_WORKER_ENABLED:
+        score_aggregator.start()
+    if settings.TOKEN_PURGE_WORKER_ENABLED:
+        verification_token_purger.start()
+    capacity_service.start()
+    if settings.ALUMNI_CHANGES_WORKER_ENABLED:
+        alumni_changes.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release background resources"""
+    await revocation_list.stop()
+    await email_outbox_worker.stop()
+    await shared_context_materializer.stop()
+    await score_aggregator.stop()
+    await verification_token_purger.stop()
+    await capacity_service.stop()
+    await alumni_changes.stop()
+    await replica_router.stop()
+    close_email_service()
+    hashing_executor.shutdown()
+    await close_redis()
+
+
 # Include API routers
 from app.api.v1 import auth
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX, tags=["authentication"])
@@ -56,7 +160,7 @@ app.include_router(auth.router, prefix=settings.API_V1_PREFIX, tags=["authentica
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=settings.DEBUG)
 
 
 
@@ -8,6 +8,15 @@ from app.models.user import User, UserRole, UserStatus
 from app.models.student import Student
 from app.models.alumni import Alumni, AvailabilityStatus
 from app.models.email_verification import EmailVerificationToken
+from app.models.revoked_token import RevokedToken
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.models.shared_context import SharedContext, SharedContextType
+from app.models.materialization_watermark import MaterializationWatermark
+from app.models.canonical_entity import CanonicalEntity, CanonicalEntityKind
+from app.models.entity_alias import EntityAlias
+from app.models.score_event import ScoreEvent, ScoreEventKind
+from app.models.alumni_score_sums import AlumniScoreSums
+from app.models.student_score_sums import StudentScoreSums
 
 __all__ = [
     "User",
@@ -17,4 +26,17 @@ __all__ = [
     "Alumni",
     "AvailabilityStatus",
     "EmailVerificationToken",
+    "RevokedToken",
+    "EmailOutbox",
+    "EmailOutboxStatus",
+    "SharedContext",
+    "SharedContextType",
+    "MaterializationWatermark",
+    "CanonicalEntity",
+    "CanonicalEntityKind",
+    "EntityAlias",
+    "ScoreEvent",
+    "ScoreEventKind",
+    "AlumniScoreSums",
+    "StudentScoreSums",
 ]
@@ -3,8 +3,8 @@ Alumni model - Alumni-specific profile and availability data
 """
 
 from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, Index, Enum
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy import Numeric
 import uuid
 import enum
@@ -46,20 +46,35 @@ class Alumni(Base):
     # Career history
     previous_companies = Column(JSONB, nullable=True)
     
+    # Canonical ids of the fields above (see app.services.canonical_names)
+    current_company_id = Column(Integer, ForeignKey("canonical_entities.id", ondelete="SET NULL"), nullable=True, index=True)
+    current_role_id = Column(Integer, ForeignKey("canonical_entities.id", ondelete="SET NULL"), nullable=True, index=True)
+    previous_company_ids = Column(JSONB, nullable=True)
+    
     # Personal information
     bio = Column(Text, nullable=True)
     hobbies = Column(JSONB, nullable=True)
     interests = Column(JSONB, nullable=True)
     interesting_facts = Column(JSONB, nullable=True)
     
+    # Normalized "<field>:<term>" keys of the matchable fields, kept by the
+    # shared-context materializer to find partners (see app.services.shared_context);
+    # deferred so profile loads don't carry it
+    match_terms = deferred(Column(JSONB, nullable=True))
+    
     # External links
     linkedin_url = Column(String(255), nullable=True)
     
+    # Full-text search document, maintained by a trigger (see app.services.alumni_search);
+    # deferred so profile loads don't carry it
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    
     # Availability and preferences
     availability_status = Column(Enum(AvailabilityStatus), nullable=False, default=AvailabilityStatus.OPEN, index=True)
     request_preferences = Column(JSONB, nullable=True)
     max_requests_per_month = Column(Integer, nullable=False, default=5)
     current_month_requests = Column(Integer, nullable=False, default=0)
+    capacity_month = Column(Integer, nullable=True)  # YYYYMM that current_month_requests counts; older reads as 0
     
     # Internal metrics (not public)
     helpfulness_score = Column(Numeric(5, 2), nullable=False, default=0.0, index=True)
@@ -79,6 +94,16 @@ class Alumni(Base):
         Index('idx_alumni_career', 'industry', 'current_role'),
         Index('idx_alumni_hobbies', 'hobbies', postgresql_using='gin'),
         Index('idx_alumni_interests', 'interests', postgresql_using='gin'),
+        Index('idx_alumni_search', 'search_vector', postgresql_using='gin'),
+        Index('idx_alumni_match_terms', 'match_terms', postgresql_using='gin'),
+        # Polled by the alumni change feed (app.services.alumni_changes) and
+        # the shared-context materializer
+        Index('idx_alumni_updated_at', 'updated_at'),
+        Index(
+            'idx_alumni_capacity_full', 'capacity_month',
+            postgresql_where=current_month_requests >= max_requests_per_month,
+            sqlite_where=current_month_requests >= max_requests_per_month,
+        ),
     )
     
     def __repr__(self):
@@ -0,0 +1,42 @@
+"""
+Alumni score sums model
+Running totals behind an alumni's helpfulness score
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, Float, DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.core.database import Base
+
+
+class AlumniScoreSums(Base):
+    """
+    Applied score events summed per alumni
+    
+    Every column is a sum over the alumni's applied ScoreEvents, so the
+    row can be recomputed from the log at any time (see
+    ScoreAggregator.reconcile). `response_time_sketch` is a
+    QuantileSketch of response hours in its dict form.
+    """
+    __tablename__ = "alumni_score_sums"
+    
+    alumni_id = Column(UUID(as_uuid=True), ForeignKey("alumni.id", ondelete="CASCADE"), primary_key=True)
+    requests_received = Column(Integer, nullable=False, default=0)
+    approvals = Column(Integer, nullable=False, default=0)
+    declines = Column(Integer, nullable=False, default=0)
+    expirations = Column(Integer, nullable=False, default=0)
+    response_hours_sum = Column(Float, nullable=False, default=0.0)
+    response_time_sketch = Column(JSONB, nullable=True)
+    introductions = Column(Integer, nullable=False, default=0)
+    successful_introductions = Column(Integer, nullable=False, default=0)
+    satisfaction_sum = Column(Integer, nullable=False, default=0)  # Student ratings of the alumni
+    satisfaction_count = Column(Integer, nullable=False, default=0)
+    last_event_id = Column(BigInteger, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Polled by the alumni change feed (app.services.alumni_changes)
+    __table_args__ = (
+        Index('idx_alumni_score_sums_updated_at', 'updated_at'),
+    )
+    
+    def __repr__(self):
+        return f"<AlumniScoreSums(alumni={self.alumni_id}, requests={self.requests_received})>"
@@ -0,0 +1,37 @@
+"""
+Canonical entity model
+Dictionary of companies and roles that free-text profile fields resolve to
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Enum, UniqueConstraint, func
+import enum
+from app.core.database import Base
+
+
+class CanonicalEntityKind(str, enum.Enum):
+    """What a canonical entity names"""
+    COMPANY = "company"
+    ROLE = "role"
+
+
+class CanonicalEntity(Base):
+    """
+    One company or role, e.g. "Google"
+
+    Integer ids keep profile matching an equality join; spellings such as
+    "Google LLC" or "google inc." are EntityAlias rows pointing here.
+    """
+    __tablename__ = "canonical_entities"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(Enum(CanonicalEntityKind), nullable=False)
+    name = Column(String(200), nullable=False)  # Display name
+    normalized_name = Column(String(200), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint('kind', 'normalized_name', name='uq_canonical_entity_name'),
+    )
+    
+    def __repr__(self):
+        return f"<CanonicalEntity(id={self.id}, kind={self.kind}, name={self.name})>"
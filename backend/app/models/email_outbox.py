@@ -0,0 +1,51 @@
+"""
+Email outbox model
+Emails queued in the same transaction as the change that triggers them
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+import enum
+from app.core.database import Base
+
+
+class EmailOutboxStatus(str, enum.Enum):
+    """Delivery status of an outbox entry"""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutbox(Base):
+    """
+    Transactional outbox for emails
+
+    Rows are written alongside the business change and delivered later by
+    app.services.email_outbox.EmailOutboxWorker, so SMTP is never on the
+    request path.
+    """
+    __tablename__ = "email_outbox"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    to_email = Column(String(255), nullable=False)
+    template = Column(String(50), nullable=False)  # e.g. 'verification', 'password_reset'
+    payload = Column(JSONB, nullable=False, default=dict)  # Template arguments
+    
+    # Delivery state
+    status = Column(Enum(EmailOutboxStatus), nullable=False, default=EmailOutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # The worker polls for due pending rows
+    __table_args__ = (
+        Index('idx_email_outbox_due', 'status', 'next_attempt_at'),
+    )
+    
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, template={self.template}, status={self.status})>"
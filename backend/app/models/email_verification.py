@@ -3,7 +3,7 @@ Email verification token model
 For email verification and password reset
 """
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, func
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Index, func, true
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -27,6 +27,11 @@ class EmailVerificationToken(Base):
     # Relationship
     user = relationship("User", backref="verification_tokens")
     
+    __table_args__ = (
+        # The purge job finds used tokens here (expired ones via expires_at)
+        Index('idx_email_tokens_used', 'id', postgresql_where=used == true(), sqlite_where=used == true()),
+    )
+    
     def __repr__(self):
         return f"<EmailVerificationToken(id={self.id}, type={self.token_type}, used={self.used})>"
 
@@ -0,0 +1,34 @@
+"""
+Entity alias model
+Spellings of a canonical company or role, looked up by normalized key
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
+from app.core.database import Base
+
+
+class EntityAlias(Base):
+    """
+    A spelling that resolves to a CanonicalEntity
+
+    `normalized_key` is "<kind>:<normalized name>" (e.g. "company:google"),
+    so one equality probe finds the entity. Lookups are exact-match only,
+    hence a hash index; an exclusion constraint over the same hash index
+    keeps keys unique.
+    """
+    __tablename__ = "entity_aliases"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_id = Column(Integer, ForeignKey("canonical_entities.id", ondelete="CASCADE"), nullable=False, index=True)
+    alias = Column(String(200), nullable=False)  # As first written
+    normalized_key = Column(String(220), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        ExcludeConstraint(('normalized_key', '='), using='hash', name='uq_entity_alias_key').ddl_if(dialect='postgresql'),
+        Index('idx_entity_alias_key', 'normalized_key', unique=True).ddl_if(dialect='sqlite'),
+    )
+    
+    def __repr__(self):
+        return f"<EntityAlias(alias={self.alias}, entity_id={self.entity_id})>"
@@ -0,0 +1,24 @@
+"""
+Materialization watermark model
+Progress markers for background jobs that follow `updated_at` columns
+"""
+
+from sqlalchemy import Column, String, DateTime, func
+from app.core.database import Base
+
+
+class MaterializationWatermark(Base):
+    """
+    Highest source `updated_at` a materializer has fully processed
+
+    One row per (job, source table), e.g. "shared_context:students".
+    Deleting a row makes the job reprocess that source from scratch.
+    """
+    __tablename__ = "materialization_watermarks"
+    
+    name = Column(String(100), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<MaterializationWatermark(name={self.name}, watermark={self.watermark})>"
@@ -0,0 +1,27 @@
+"""
+Revoked token model
+Denylist of JWT ids (jti) that must no longer be accepted
+"""
+
+from sqlalchemy import Column, String, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    """
+    Revoked access/refresh tokens, keyed by their jti claim
+
+    Rows only matter until the token would have expired anyway; expired rows
+    can be deleted at any time.
+    """
+    __tablename__ = "revoked_tokens"
+    
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+    token_type = Column(String(20), nullable=False)  # 'access' or 'refresh'
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<RevokedToken(jti={self.jti}, type={self.token_type})>"
@@ -0,0 +1,56 @@
+"""
+Score event model
+Append-only log of request and outcome events that feed internal quality scores
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, String, Float, DateTime, ForeignKey, Enum, Index, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+import enum
+from app.core.database import Base
+
+
+class ScoreEventKind(str, enum.Enum):
+    """What happened between a student and an alumni"""
+    REQUEST_SENT = "request_sent"
+    REQUEST_APPROVED = "request_approved"  # carries response_hours
+    REQUEST_DECLINED = "request_declined"  # carries response_hours
+    REQUEST_EXPIRED = "request_expired"
+    INTRODUCTION_MADE = "introduction_made"
+    INTRODUCTION_SUCCEEDED = "introduction_succeeded"  # first positive outcome of an introduction
+    OUTCOME_RECORDED = "outcome_recorded"  # carries recorded_by and satisfaction
+
+
+class ScoreEvent(Base):
+    """
+    One scoring event
+    
+    Written in the same transaction as the change it describes and applied
+    to the running sums (AlumniScoreSums / StudentScoreSums) by
+    app.services.score_aggregation. `applied_at` is set in the transaction
+    that applies it. `source_id` (request, introduction or outcome id)
+    makes recording idempotent per kind.
+    """
+    __tablename__ = "score_events"
+    
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    kind = Column(Enum(ScoreEventKind), nullable=False)
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    alumni_id = Column(UUID(as_uuid=True), ForeignKey("alumni.id", ondelete="CASCADE"), nullable=False, index=True)
+    source_id = Column(UUID(as_uuid=True), nullable=True)
+    
+    # Event data (depends on kind)
+    response_hours = Column(Float, nullable=True)
+    recorded_by = Column(String(20), nullable=True)  # 'student' / 'alumni' / 'system'
+    satisfaction = Column(Integer, nullable=True)  # 1-5, as rated by recorded_by
+    
+    occurred_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    applied_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint('kind', 'source_id', name='uq_score_event_source'),
+        # The aggregator polls for unapplied events in id order
+        Index('idx_score_events_unapplied', 'id', postgresql_where=applied_at.is_(None), sqlite_where=applied_at.is_(None)),
+    )
+    
+    def __repr__(self):
+        return f"<ScoreEvent(id={self.id}, kind={self.kind}, alumni={self.alumni_id}, student={self.student_id})>"
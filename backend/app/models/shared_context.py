@@ -0,0 +1,52 @@
+"""
+Shared context model
+Precomputed connections between a student and an alumni of their university
+"""
+
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Index, UniqueConstraint, Numeric, func
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+import enum
+from app.core.database import Base
+
+
+class SharedContextType(str, enum.Enum):
+    """Kind of shared context"""
+    SAME_MAJOR = "same_major"
+    SAME_COMPANY_INTEREST = "same_company_interest"  # student interested in alumni's company
+    SAME_LOCATION = "same_location"
+    SAME_INDUSTRY = "same_industry"
+    SAME_ROLE_INTEREST = "same_role_interest"  # student interested in alumni's role
+    GRADUATION_PROXIMITY = "graduation_proximity"
+    SHARED_INTEREST = "shared_interest"
+    SHARED_HOBBY = "shared_hobby"
+    SHARED_PERSONAL_INTEREST = "shared_personal_interest"  # one side's hobby is the other's interest
+
+
+class SharedContext(Base):
+    """
+    One shared context item for a (student, alumni) pair
+
+    Maintained by app.services.shared_context.SharedContextMaterializer;
+    only pairs with at least one item have rows. Discover reads a student's
+    rows through the unique constraint's (student_id, alumni_id, ...) index.
+    """
+    __tablename__ = "shared_contexts"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    alumni_id = Column(UUID(as_uuid=True), ForeignKey("alumni.id", ondelete="CASCADE"), nullable=False)
+    context_type = Column(Enum(SharedContextType), nullable=False)
+    context_value = Column(String(255), nullable=True)  # e.g. the company name
+    strength = Column(Numeric(5, 2), nullable=False, default=1.0)
+    discovered_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_verified_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        UniqueConstraint('student_id', 'alumni_id', 'context_type', 'context_value', name='uq_shared_context'),
+        # Recomputing an alumni's pairs deletes by alumni_id
+        Index('idx_context_alumni', 'alumni_id'),
+    )
+    
+    def __repr__(self):
+        return f"<SharedContext(student={self.student_id}, alumni={self.alumni_id}, type={self.context_type})>"
@@ -4,7 +4,7 @@ Student model - Student-specific profile and tracking data
 
 from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy import Numeric
 import uuid
 from app.core.database import Base
@@ -34,6 +34,10 @@ class Student(Base):
     target_roles = Column(JSONB, nullable=True)
     target_industries = Column(JSONB, nullable=True)
     
+    # Canonical ids of target companies/roles (see app.services.canonical_names)
+    target_company_ids = Column(JSONB, nullable=True)
+    target_role_ids = Column(JSONB, nullable=True)
+    
     # Location
     current_location = Column(String(100), nullable=True)
     preferred_locations = Column(JSONB, nullable=True)
@@ -44,6 +48,11 @@ class Student(Base):
     interests = Column(JSONB, nullable=True)
     interesting_facts = Column(JSONB, nullable=True)
     
+    # Normalized "<field>:<term>" keys of the matchable fields, kept by the
+    # shared-context materializer to find partners (see app.services.shared_context);
+    # deferred so profile loads don't carry it
+    match_terms = deferred(Column(JSONB, nullable=True))
+    
     # External links
     linkedin_url = Column(String(255), nullable=True)
     resume_url = Column(String(255), nullable=True)
@@ -65,6 +74,8 @@ class Student(Base):
         Index('idx_student_career_interests', 'career_interests', postgresql_using='gin'),
         Index('idx_student_hobbies', 'hobbies', postgresql_using='gin'),
         Index('idx_student_interests', 'interests', postgresql_using='gin'),
+        Index('idx_student_target_company_ids', 'target_company_ids', postgresql_using='gin'),
+        Index('idx_student_match_terms', 'match_terms', postgresql_using='gin'),
     )
     
     def __repr__(self):
@@ -0,0 +1,35 @@
+"""
+Student score sums model
+Running totals behind a student's reputation score
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class StudentScoreSums(Base):
+    """
+    Applied score events summed per student
+    
+    Every column is a sum over the student's applied ScoreEvents, so the
+    row can be recomputed from the log at any time (see
+    ScoreAggregator.reconcile).
+    """
+    __tablename__ = "student_score_sums"
+    
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    requests_sent = Column(Integer, nullable=False, default=0)
+    approvals = Column(Integer, nullable=False, default=0)
+    declines = Column(Integer, nullable=False, default=0)
+    expirations = Column(Integer, nullable=False, default=0)
+    introductions = Column(Integer, nullable=False, default=0)
+    successful_introductions = Column(Integer, nullable=False, default=0)
+    outcomes_recorded = Column(Integer, nullable=False, default=0)  # By the student
+    satisfaction_sum = Column(Integer, nullable=False, default=0)  # Alumni ratings of the student
+    satisfaction_count = Column(Integer, nullable=False, default=0)
+    last_event_id = Column(BigInteger, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<StudentScoreSums(student={self.student_id}, requests={self.requests_sent})>"
@@ -2,7 +2,7 @@
 User model - Base entity for authentication and identity
 """
 
-from sqlalchemy import Column, String, Enum, DateTime, Boolean, func
+from sqlalchemy import Column, String, Enum, DateTime, Boolean, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -35,8 +35,8 @@ class User(Base):
     # Primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
-    # Multi-tenant isolation
-    university_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    # Multi-tenant isolation (indexed by idx_users_tenant below)
+    university_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Authentication
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -59,6 +59,14 @@ class User(Base):
     # student_profile = relationship("Student", back_populates="user", uselist=False)
     # alumni_profile = relationship("Alumni", back_populates="user", uselist=False)
     
+    # Tenant-leading composite index: one university's users of a role and
+    # status form a single range, ids included (see app.services.tenancy)
+    __table_args__ = (
+        Index('idx_users_tenant', 'university_id', 'role', 'status', postgresql_include=['id']),
+        # Polled by the alumni change feed (app.services.alumni_changes)
+        Index('idx_users_updated_at', 'updated_at'),
+    )
+    
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, role={self.role})>"
 
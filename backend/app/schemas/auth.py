@@ -2,9 +2,10 @@
 Authentication schemas for request/response validation
 """
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional
 from datetime import datetime
+import uuid
 from app.models.user import UserRole
 
 
@@ -27,13 +28,23 @@ class UserLogin(BaseModel):
     password: str
 
 
+class TokenUser(BaseModel):
+    """The `user` object of token responses"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    email: str
+    role: UserRole
+    email_verified: bool
+
+
 class TokenResponse(BaseModel):
     """Schema for token response"""
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
     expires_in: int
-    user: dict
+    user: TokenUser
 
 
 class TokenRefresh(BaseModel):
@@ -43,11 +54,10 @@ class TokenRefresh(BaseModel):
 
 class UserResponse(BaseModel):
     """Schema for user response"""
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
     email: str
-    role: str
+    role: UserRole
     email_verified: bool
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
@@ -0,0 +1,35 @@
+"""
+Discover schemas: GET /students/discover response
+"""
+
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+import uuid
+from app.schemas.pagination import PaginationInfo
+
+
+class SharedContextItem(BaseModel):
+    """One item of an alumni's `shared_context` list"""
+    type: str  # SharedContextType value
+    value: Optional[str] = None
+
+
+class DiscoverAlumni(BaseModel):
+    """One alumni card on the discover page"""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: uuid.UUID
+    name: Optional[str] = None
+    current_role: Optional[str] = None
+    current_company: Optional[str] = None
+    industry: Optional[str] = None
+    location: Optional[str] = None
+    shared_context: List[SharedContextItem] = []
+    helpfulness_score: float
+    response_rate: float
+
+
+class DiscoverPage(BaseModel):
+    """A page of discover results"""
+    data: List[DiscoverAlumni]
+    pagination: PaginationInfo
@@ -0,0 +1,12 @@
+"""
+Pagination schemas shared by list endpoints
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+
+
+class PaginationInfo(BaseModel):
+    """The `pagination` object of list responses"""
+    next_cursor: Optional[str] = None
+    has_more: bool = False
@@ -0,0 +1,188 @@
+"""
+Alumni change feed for in-memory ranking indexes
+
+The discovery index and the match scorer keep per-process copies of alumni
+profiles. They subscribe with add_listener() and are told which alumni to
+reload from two sources:
+
+- session hooks: alumni rows and user status changes flushed by this
+  process, delivered right after the transaction commits
+- a poll (every ALUMNI_CHANGES_POLL_SECONDS) for writes made by other
+  workers or with Core / bulk statements: alumni, alumni users and
+  alumni_score_sums rows whose updated_at is past the watermark, plus the
+  alumni whose monthly capacity filled up or freed since the last poll
+  (counter writes leave updated_at alone)
+
+As in the shared-context materializer, the watermark trails the current
+time by ALUMNI_CHANGES_SAFETY_LAG_SECONDS so late commits of an older
+updated_at are still seen. Rows inside that window come back on every
+poll; the (table, id) -> updated_at pairs of the last poll are kept and
+only rows with a new stamp are reported again. Stamps from the last
+couple of seconds are not kept, since another write in the same clock
+tick (a whole second on SQLite) would carry the same stamp; those rows
+are reported once more on the next poll.
+
+The poll is served by the updated_at indexes and the partial
+idx_alumni_capacity_full index. Set ALUMNI_CHANGES_WORKER_ENABLED=false
+for processes without discovery / match indexes, or with a single worker
+(the session hooks already cover its own writes). Alumni are never
+deleted by the app; a cascade from a user deleted in another process is
+only seen there.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.alumni import Alumni
+from app.models.alumni_score_sums import AlumniScoreSums
+from app.models.user import User, UserRole
+from app.services.capacity import month_key
+
+_PENDING_KEY = "alumni_changes"
+_SETTLE = timedelta(seconds=2)  # Stamps older than this can't be reused by a later write
+
+
+class AlumniChangeFeed:
+    """Fan-out of changed alumni ids to in-memory indexes"""
+
+    def __init__(self, poll_interval: float = 5.0, safety_lag_seconds: float = 30.0, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.safety_lag = timedelta(seconds=safety_lag_seconds)
+        self._listeners: List[Callable[[Iterable[uuid.UUID]], None]] = []
+        self._watermark: Optional[datetime] = None
+        self._full: Optional[Set[uuid.UUID]] = None  # Alumni without capacity left this month
+        self._seen: Dict[Tuple[str, uuid.UUID], datetime] = {}  # Rows of the last poll, by updated_at
+        self._task: Optional[asyncio.Task] = None
+        self.polls = 0
+        self.notified = 0
+        self.errors = 0
+
+    def add_listener(self, callback: Callable[[Iterable[uuid.UUID]], None]) -> None:
+        """Call `callback(alumni_ids)` whenever alumni profiles may have changed"""
+        self._listeners.append(callback)
+
+    def notify(self, alumni_ids: Iterable[uuid.UUID]) -> None:
+        alumni_ids = list(alumni_ids)
+        if not alumni_ids:
+            return
+        self.notified += len(alumni_ids)
+        for callback in self._listeners:
+            callback(alumni_ids)
+
+    async def _updated(self, session: AsyncSession, after: datetime) -> Dict[Tuple[str, uuid.UUID], datetime]:
+        """(table, alumni id) -> updated_at of profile, user and score sums rows touched after `after`"""
+        result = await session.execute(union_all(
+            select(literal("alumni"), Alumni.id, Alumni.updated_at).where(Alumni.updated_at > after),
+            select(literal("users"), User.id, User.updated_at).where(
+                User.updated_at > after, User.role == UserRole.ALUMNI,
+            ),
+            select(literal("scores"), AlumniScoreSums.alumni_id, AlumniScoreSums.updated_at).where(
+                AlumniScoreSums.updated_at > after,
+            ),
+        ))
+        return {(table, alumni_id): stamp for table, alumni_id, stamp in result}
+
+    async def _full_this_month(self, session: AsyncSession) -> Set[uuid.UUID]:
+        result = await session.scalars(
+            select(Alumni.id).where(
+                Alumni.capacity_month == month_key(),
+                Alumni.current_month_requests >= Alumni.max_requests_per_month,
+            )
+        )
+        return set(result)
+
+    async def poll_once(self) -> int:
+        """Notify listeners of alumni changed since the last poll; returns how many"""
+        polled_at = datetime.now(timezone.utc)
+        horizon = polled_at - self.safety_lag
+        if self._watermark is None:
+            # Indexes load current rows; only later changes matter
+            self._watermark = horizon
+        async with self.session_factory() as session:
+            rows = await self._updated(session, self._watermark)
+            full = await self._full_this_month(session)
+        changed = {key[1] for key, stamp in rows.items() if self._seen.get(key) != stamp}
+        # The watermark never moves back, so a row missing from this poll
+        # can only return with a newer stamp
+        settled = polled_at - _SETTLE
+        self._seen = {key: stamp for key, stamp in rows.items() if _as_utc(stamp) < settled}
+        if self._full is not None:
+            changed |= full ^ self._full
+        self._full = full
+
+        self._watermark = max(self._watermark, horizon)
+        self.polls += 1
+        self.notify(changed)
+        return len(changed)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                self.errors += 1
+                print(f"[ALUMNI CHANGES] Poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Start polling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"polls": self.polls, "notified": self.notified, "errors": self.errors}
+
+
+def _as_utc(stamp: datetime) -> datetime:
+    # SQLite hands back naive UTC timestamps
+    return stamp if stamp.tzinfo is not None else stamp.replace(tzinfo=timezone.utc)
+
+
+# Create singleton instance
+alumni_changes = AlumniChangeFeed(
+    poll_interval=settings.ALUMNI_CHANGES_POLL_SECONDS,
+    safety_lag_seconds=settings.ALUMNI_CHANGES_SAFETY_LAG_SECONDS,
+)
+
+
+# Session hooks: collect alumni whose profile or account status changed and
+# notify the listeners once the transaction commits.
+
+@event.listens_for(Session, "after_flush")
+def _collect_alumni_changes(session, flush_context):
+    changed: Set[uuid.UUID] = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Alumni):
+            changed.add(obj.id)
+        elif isinstance(obj, User) and inspect(obj).attrs.status.history.has_changes():
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_alumni_changes(session):
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        alumni_changes.notify(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_alumni_changes(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,248 @@
+"""
+Full-text search over alumni profiles
+
+"product manager fintech climbing" is split into terms and matched against
+role, company, industry, interests, hobbies, bio and location, with
+role/company matches weighing most (Postgres weights A > B > C > D):
+
+    A  current_role, current_company
+    B  industry, interests
+    C  hobbies, bio
+    D  location
+
+Profiles matching every term are ranked first; only when they don't fill
+the page is the query relaxed to any term. Ranking an any-term match of
+common words means scoring most of the table, so the all-terms pass keeps
+typical multi-word queries to a small candidate set.
+
+Two backends share one interface and pick themselves by dialect:
+- PostgreSQL: `alumni.search_vector`, a weighted tsvector kept current by
+  a BEFORE INSERT/UPDATE trigger and served by a GIN index, ranked with
+  ts_rank_cd.
+- SQLite (local tests and tooling): an FTS5 table `alumni_fts` kept in
+  step by AFTER INSERT/UPDATE/DELETE triggers, ranked with bm25 using the
+  same column weights.
+
+The Alembic migration installs the Postgres trigger. init_db() creates
+the tables (on SQLite too, see app.core.database) and then installs
+either backend's triggers with `install()`.
+"""
+
+import re
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import Float, Select, TextualSelect, Uuid, bindparam, func, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.alumni import Alumni
+from app.services.tenancy import scope_to_university
+
+MAX_TERMS = 10
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def parse_query(query: str) -> List[str]:
+    """Distinct lowercase word terms of a search box query, in order"""
+    terms: List[str] = []
+    for term in _TERM_RE.findall((query or "").lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    alumni_id: uuid.UUID
+    rank: float
+
+
+class SearchBackend:
+    """Builds the ranked search statement for one database dialect"""
+
+    dialect: str = ""
+
+    def install(self, connection) -> None:
+        """Create the triggers (and tables) keeping the index current"""
+        raise NotImplementedError
+
+    def statement(self, terms: List[str], match_all: bool, university_id: Optional[uuid.UUID], limit: int):
+        """Statement returning (id, rank) rows, best first"""
+        raise NotImplementedError
+
+
+# Kept identical to the trigger installed by the add_alumni_search migration
+POSTGRES_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION alumni_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW."current_role", '') || ' ' || coalesce(NEW.current_company, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.industry, '')), 'B') ||
+            setweight(jsonb_to_tsvector('english', coalesce(NEW.interests, '[]'::jsonb), '["string"]'), 'B') ||
+            setweight(jsonb_to_tsvector('english', coalesce(NEW.hobbies, '[]'::jsonb), '["string"]'), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.bio, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.location, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS alumni_search_vector_trigger ON alumni",
+    """
+    CREATE TRIGGER alumni_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF "current_role", current_company, industry, interests, hobbies, bio, location
+    ON alumni FOR EACH ROW EXECUTE FUNCTION alumni_search_vector_update()
+    """,
+)
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector column + GIN index"""
+
+    dialect = "postgresql"
+
+    def install(self, connection) -> None:
+        for ddl in POSTGRES_DDL:
+            connection.execute(text(ddl))
+        # Fill rows written before the trigger existed
+        connection.execute(text("UPDATE alumni SET bio = bio WHERE search_vector IS NULL"))
+
+    def statement(self, terms: List[str], match_all: bool, university_id: Optional[uuid.UUID], limit: int) -> Select:
+        # to_tsquery stems each term and drops stop words
+        tsquery = func.to_tsquery(literal_column("'english'::regconfig"), (" & " if match_all else " | ").join(terms))
+        rank = func.ts_rank_cd(Alumni.search_vector, tsquery)
+        query = select(Alumni.id, rank.label("rank")).where(Alumni.search_vector.op("@@")(tsquery))
+        if university_id is not None:
+            query = scope_to_university(query, university_id, Alumni, active_only=False)
+        return query.order_by(rank.desc(), Alumni.helpfulness_score.desc()).limit(limit)
+
+
+_FTS_COLUMNS = "current_role, current_company, industry, interests, hobbies, bio, location"
+_FTS_VALUES = (
+    "NEW.rowid, NEW.current_role, NEW.current_company, NEW.industry, "
+    "(SELECT group_concat(value, ' ') FROM json_each(coalesce(NEW.interests, '[]'))), "
+    "(SELECT group_concat(value, ' ') FROM json_each(coalesce(NEW.hobbies, '[]'))), "
+    "NEW.bio, NEW.location"
+)
+
+SQLITE_DDL = (
+    # rowid mirrors alumni.rowid so updates and deletes are rowid lookups
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS alumni_fts USING fts5({_FTS_COLUMNS}, tokenize='porter unicode61')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS alumni_fts_insert AFTER INSERT ON alumni BEGIN
+        INSERT INTO alumni_fts(rowid, {_FTS_COLUMNS}) VALUES ({_FTS_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS alumni_fts_update
+    AFTER UPDATE OF {_FTS_COLUMNS} ON alumni BEGIN
+        DELETE FROM alumni_fts WHERE rowid = OLD.rowid;
+        INSERT INTO alumni_fts(rowid, {_FTS_COLUMNS}) VALUES ({_FTS_VALUES});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS alumni_fts_delete AFTER DELETE ON alumni BEGIN
+        DELETE FROM alumni_fts WHERE rowid = OLD.rowid;
+    END
+    """,
+)
+
+# bm25 column weights in _FTS_COLUMNS order, proportional to ts_rank's {D 0.1, C 0.2, B 0.4, A 1.0}
+_BM25_WEIGHTS = "10.0, 10.0, 4.0, 4.0, 2.0, 2.0, 1.0"
+
+
+class SqliteSearchBackend(SearchBackend):
+    """FTS5 virtual table"""
+
+    dialect = "sqlite"
+
+    def install(self, connection) -> None:
+        for ddl in SQLITE_DDL:
+            connection.execute(text(ddl))
+        connection.execute(text(
+            f"INSERT INTO alumni_fts(rowid, {_FTS_COLUMNS}) "
+            f"SELECT {_FTS_VALUES.replace('NEW.', 'a.')} FROM alumni a "
+            "WHERE a.rowid NOT IN (SELECT rowid FROM alumni_fts)"
+        ))
+
+    def statement(self, terms: List[str], match_all: bool, university_id: Optional[uuid.UUID], limit: int) -> TextualSelect:
+        # bm25 is lower-is-better; negate it so rank reads like ts_rank
+        sql = (
+            f"SELECT a.id AS id, -bm25(alumni_fts, {_BM25_WEIGHTS}) AS rank "
+            "FROM alumni_fts JOIN alumni a ON a.rowid = alumni_fts.rowid "
+        )
+        params = [
+            bindparam("match", (" AND " if match_all else " OR ").join(f'"{term}"' for term in terms)),
+            bindparam("limit", limit),
+        ]
+        if university_id is not None:
+            sql += "JOIN users u ON u.id = a.id AND u.university_id = :university_id "
+            params.append(bindparam("university_id", university_id, type_=Uuid()))
+        sql += "WHERE alumni_fts MATCH :match ORDER BY rank DESC, a.helpfulness_score DESC LIMIT :limit"
+        return text(sql).bindparams(*params).columns(id=Uuid(), rank=Float())
+
+
+class AlumniSearch:
+    """Ranked alumni search, dispatching to the session's dialect"""
+
+    def __init__(self, *backends: SearchBackend):
+        self._backends = {backend.dialect: backend for backend in backends}
+
+    def backend(self, dialect_name: str) -> SearchBackend:
+        try:
+            return self._backends[dialect_name]
+        except KeyError:
+            raise NotImplementedError(f"No alumni search backend for {dialect_name}")
+
+    def install(self, connection) -> None:
+        self.backend(connection.dialect.name).install(connection)
+
+    def statements(self, dialect_name: str, query: str, university_id: Optional[uuid.UUID] = None, limit: int = 20):
+        """
+        The statements to run in order: all terms, then (for several
+        terms) any term. Empty when the query has no searchable terms.
+        """
+        terms = parse_query(query)
+        backend = self.backend(dialect_name)
+        if not terms:
+            return []
+        if len(terms) == 1:
+            return [backend.statement(terms, True, university_id, limit)]
+        return [backend.statement(terms, True, university_id, limit), backend.statement(terms, False, university_id, limit)]
+
+    @staticmethod
+    def _collect(hits: List[SearchHit], rows, limit: int) -> None:
+        seen = {hit.alumni_id for hit in hits}
+        for row in rows:
+            if len(hits) == limit:
+                break
+            if row.id not in seen:
+                hits.append(SearchHit(alumni_id=row.id, rank=float(row.rank)))
+
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        university_id: Optional[uuid.UUID] = None,
+        limit: int = 20,
+    ) -> List[SearchHit]:
+        hits: List[SearchHit] = []
+        for statement in self.statements(session.get_bind().dialect.name, query, university_id, limit):
+            self._collect(hits, (await session.execute(statement)).all(), limit)
+            if len(hits) == limit:
+                break
+        return hits
+
+    def search_sync(self, connection, query: str, university_id: Optional[uuid.UUID] = None, limit: int = 20) -> List[SearchHit]:
+        """Same as search() for a blocking Session or Connection (scripts, jobs)"""
+        hits: List[SearchHit] = []
+        for statement in self.statements(connection.dialect.name, query, university_id, limit):
+            self._collect(hits, connection.execute(statement).all(), limit)
+            if len(hits) == limit:
+                break
+        return hits
+
+
+# Create singleton instance
+alumni_search = AlumniSearch(PostgresSearchBackend(), SqliteSearchBackend())
@@ -0,0 +1,375 @@
+"""
+Canonical company and role names
+
+"Google", "Google LLC" and "google inc." are the same employer. Free-text
+company and role fields resolve to CanonicalEntity ids through
+EntityAlias rows keyed by a normalized form:
+
+    normalize_company("Google LLC")    -> "google"
+    normalize_role("Sr. SWE")          -> "senior software engineer"
+    alias_key(COMPANY, "google inc.")  -> "company:google"
+
+Profiles store the resolved ids (Alumni.current_company_id,
+Student.target_company_ids, ...), so "alumni at a company the student
+targets" is an integer IN/equality lookup instead of ILIKE or fuzzy scans.
+
+The whole dictionary is held in memory (`canonical_dictionary`): lookups
+are a dict probe, which lets a before_flush hook keep profile ids in step
+with their text without querying during the flush. Names the dictionary
+doesn't know yet are left unresolved until
+`python -m app.services.canonical_names --backfill` creates entities for
+them. `suggest()` proposes existing entities for unknown spellings by
+trigram similarity (same measure as pg_trgm).
+"""
+
+import asyncio
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import AsyncSessionLocal
+from app.models.alumni import Alumni
+from app.models.canonical_entity import CanonicalEntity, CanonicalEntityKind
+from app.models.entity_alias import EntityAlias
+from app.models.student import Student
+
+_NON_WORD_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+# Legal-form words that never distinguish two employers
+COMPANY_SUFFIXES = frozenset({
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+    "plc", "gmbh", "ag", "sa", "lp", "llp", "pllc",
+})
+
+ROLE_ABBREVIATIONS = {
+    "sr": "senior",
+    "jr": "junior",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "eng": "engineer",
+    "engr": "engineer",
+    "mgr": "manager",
+    "pm": "product manager",
+    "vp": "vice president",
+    "svp": "senior vice president",
+    "dir": "director",
+    "assoc": "associate",
+    "asst": "assistant",
+    "ceo": "chief executive officer",
+    "cto": "chief technology officer",
+    "cfo": "chief financial officer",
+}
+
+
+def _words(value: Optional[str]) -> List[str]:
+    if not value or not isinstance(value, str):
+        return []
+    # Fold accents ("Nestlé" == "Nestle") and punctuation ("AT&T" -> "at and t")
+    folded = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode().lower()
+    return _NON_WORD_RE.sub(" ", folded.replace("&", " and ")).split()
+
+
+def normalize_company(name: Optional[str]) -> Optional[str]:
+    words = _words(name)
+    if words and words[0] == "the" and len(words) > 1:
+        words = words[1:]
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words = words[:-1]
+    return " ".join(words) or None
+
+
+def normalize_role(name: Optional[str]) -> Optional[str]:
+    words = [ROLE_ABBREVIATIONS.get(word, word) for word in _words(name)]
+    return " ".join(words) or None
+
+
+_NORMALIZERS = {
+    CanonicalEntityKind.COMPANY: normalize_company,
+    CanonicalEntityKind.ROLE: normalize_role,
+}
+
+
+def normalize_name(kind: CanonicalEntityKind, name: Optional[str]) -> Optional[str]:
+    return _NORMALIZERS[kind](name)
+
+
+def alias_key(kind: CanonicalEntityKind, name: Optional[str]) -> Optional[str]:
+    """EntityAlias.normalized_key for a spelling, or None when it has no words"""
+    normalized = normalize_name(kind, name)
+    return f"{kind.value}:{normalized}" if normalized else None
+
+
+def trigrams(normalized: str) -> FrozenSet[str]:
+    """pg_trgm-style trigrams: each word padded with two spaces in front, one behind"""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    entity_id: int
+    name: str
+    similarity: float
+
+
+class CanonicalDictionary:
+    """In-memory copy of canonical_entities + entity_aliases"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}  # normalized_key -> entity id
+        self._names: Dict[int, str] = {}
+        self._trigrams: Dict[CanonicalEntityKind, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        self._key_trigrams: Dict[str, FrozenSet[str]] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _add(self, key: str, entity_id: int, kind: CanonicalEntityKind) -> None:
+        self._ids[key] = entity_id
+        grams = trigrams(key.split(":", 1)[1])
+        self._key_trigrams[key] = grams
+        for gram in grams:
+            self._trigrams[kind][gram].add(key)
+
+    _ALIASES = (
+        select(EntityAlias.normalized_key, CanonicalEntity.id, CanonicalEntity.kind, CanonicalEntity.name)
+        .join(CanonicalEntity, CanonicalEntity.id == EntityAlias.entity_id)
+    )
+
+    async def load(self, session: AsyncSession) -> int:
+        """Replace the in-memory dictionary with the database's"""
+        return self._replace(await session.execute(self._ALIASES))
+
+    def load_sync(self, connection) -> int:
+        """load() for sync callers (bulk import) on a Connection or Session"""
+        return self._replace(connection.execute(self._ALIASES))
+
+    def _replace(self, result) -> int:
+        self._ids.clear()
+        self._names.clear()
+        self._trigrams.clear()
+        self._key_trigrams.clear()
+        for key, entity_id, kind, name in result:
+            self._names[entity_id] = name
+            self._add(key, entity_id, kind)
+        self.loaded = True
+        print(f"[CANONICAL] Loaded {len(self._names)} entities, {len(self._ids)} aliases")
+        return len(self._names)
+
+    def name(self, entity_id: int) -> Optional[str]:
+        return self._names.get(entity_id)
+
+    def lookup(self, kind: CanonicalEntityKind, name: Optional[str]) -> Optional[int]:
+        """Entity id for a spelling already in the dictionary"""
+        key = alias_key(kind, name)
+        return self._ids.get(key) if key else None
+
+    def lookup_all(self, kind: CanonicalEntityKind, names) -> List[int]:
+        """Distinct entity ids for the known spellings in a JSONB list"""
+        if not names:
+            return []
+        if isinstance(names, str):
+            names = [names]
+        ids: List[int] = []
+        for name in names:
+            entity_id = self.lookup(kind, name) if isinstance(name, str) else None
+            if entity_id is not None and entity_id not in ids:
+                ids.append(entity_id)
+        return ids
+
+    def match_key(self, kind: CanonicalEntityKind, name: Optional[str]) -> Optional[str]:
+        """
+        Term to compare names by: the entity id when known, otherwise the
+        normalized name (so "Acme Inc" and "ACME" still agree before the
+        backfill has created their entity)
+        """
+        key = alias_key(kind, name)
+        if key is None:
+            return None
+        entity_id = self._ids.get(key)
+        return f"#{entity_id}" if entity_id is not None else key.split(":", 1)[1]
+
+    def suggest(
+        self,
+        kind: CanonicalEntityKind,
+        name: str,
+        limit: int = 5,
+        min_similarity: float = 0.3,
+    ) -> List[Suggestion]:
+        """Entities whose aliases look like `name`, most similar first"""
+        normalized = normalize_name(kind, name)
+        if not normalized:
+            return []
+        query = trigrams(normalized)
+        postings = self._trigrams.get(kind, {})
+        shared = Counter()
+        for gram in query:
+            for key in postings.get(gram, ()):
+                shared[key] += 1
+
+        best: Dict[int, float] = {}
+        for key, common in shared.items():
+            # Jaccard similarity, as pg_trgm's similarity()
+            similarity = common / (len(query) + len(self._key_trigrams[key]) - common)
+            entity_id = self._ids[key]
+            if similarity >= min_similarity and similarity > best.get(entity_id, 0.0):
+                best[entity_id] = similarity
+        ranked = sorted(best.items(), key=lambda item: (-item[1], self._names[item[0]]))[:limit]
+        return [Suggestion(entity_id, self._names[entity_id], round(similarity, 3)) for entity_id, similarity in ranked]
+
+    async def resolve(self, session: AsyncSession, kind: CanonicalEntityKind, name: Optional[str]) -> Optional[int]:
+        """
+        Entity id for a spelling, creating the entity (and its alias) if
+        no alias matches. Concurrent creators race on the alias key; the
+        loser reads the winner's row.
+        """
+        key = alias_key(kind, name)
+        if key is None:
+            return None
+        if key in self._ids:
+            return self._ids[key]
+
+        by_key = select(EntityAlias.entity_id, CanonicalEntity.name).join(
+            CanonicalEntity, CanonicalEntity.id == EntityAlias.entity_id
+        ).where(EntityAlias.normalized_key == key)
+        row = (await session.execute(by_key)).first()
+        if row is None:
+            display = " ".join(name.split())[:200]
+            try:
+                async with session.begin_nested():
+                    entity = CanonicalEntity(kind=kind, name=display, normalized_name=key.split(":", 1)[1])
+                    session.add(entity)
+                    await session.flush()
+                    session.add(EntityAlias(entity_id=entity.id, alias=display, normalized_key=key))
+                    await session.flush()
+                    row = (entity.id, display)
+            except IntegrityError:
+                row = (await session.execute(by_key)).one()
+        entity_id, self._names[row[0]] = row
+        self._add(key, entity_id, kind)
+        return entity_id
+
+    async def add_alias(self, session: AsyncSession, entity_id: int, alias: str) -> None:
+        """Point another spelling at an existing entity"""
+        entity = await session.get(CanonicalEntity, entity_id)
+        if entity is None:
+            raise ValueError(f"Unknown canonical entity {entity_id}")
+        key = alias_key(entity.kind, alias)
+        if key is None:
+            raise ValueError("Alias has no words")
+        session.add(EntityAlias(entity_id=entity_id, alias=" ".join(alias.split())[:200], normalized_key=key))
+        await session.flush()
+        self._names[entity_id] = entity.name
+        self._add(key, entity_id, entity.kind)
+
+    def apply(self, profile) -> None:
+        """Set a profile's canonical id columns from its text fields (known names only)"""
+        if isinstance(profile, Alumni):
+            profile.current_company_id = self.lookup(CanonicalEntityKind.COMPANY, profile.current_company)
+            profile.current_role_id = self.lookup(CanonicalEntityKind.ROLE, profile.current_role)
+            profile.previous_company_ids = self.lookup_all(CanonicalEntityKind.COMPANY, profile.previous_companies) or None
+        elif isinstance(profile, Student):
+            profile.target_company_ids = self.lookup_all(CanonicalEntityKind.COMPANY, profile.target_companies) or None
+            profile.target_role_ids = self.lookup_all(CanonicalEntityKind.ROLE, profile.target_roles) or None
+
+
+def alumni_at_companies(company_ids: Iterable[int]):
+    """WHERE clause for alumni currently at any of the companies (uses idx on current_company_id)"""
+    return Alumni.current_company_id.in_(list(company_ids))
+
+
+# Create singleton instance
+canonical_dictionary = CanonicalDictionary()
+
+
+_TRACKED = {
+    Alumni: ("current_company", "current_role", "previous_companies"),
+    Student: ("target_companies", "target_roles"),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _canonicalize_profiles(session, flush_context, instances):
+    """Keep canonical id columns in step with edited name fields"""
+    if not canonical_dictionary.loaded:
+        return
+    for obj in list(session.new) + list(session.dirty):
+        fields = _TRACKED.get(type(obj))
+        if fields is None:
+            continue
+        attrs = inspect(obj).attrs
+        if obj in session.new or any(attrs[name].history.has_changes() for name in fields):
+            canonical_dictionary.apply(obj)
+
+
+async def backfill(batch_size: int = 1000) -> Tuple[int, int]:
+    """Resolve every profile's names, creating entities for unknown ones"""
+    alumni_updated = students_updated = 0
+    async with AsyncSessionLocal() as session:
+        await canonical_dictionary.load(session)
+        for model in (Alumni, Student):
+            last_id = None
+            while True:
+                query = select(model).order_by(model.id).limit(batch_size)
+                if last_id is not None:
+                    query = query.where(model.id > last_id)
+                profiles = (await session.scalars(query)).all()
+                if not profiles:
+                    break
+                for profile in profiles:
+                    if model is Alumni:
+                        await canonical_dictionary.resolve(session, CanonicalEntityKind.COMPANY, profile.current_company)
+                        await canonical_dictionary.resolve(session, CanonicalEntityKind.ROLE, profile.current_role)
+                        names = profile.previous_companies if isinstance(profile.previous_companies, list) else []
+                        for name in names:
+                            if isinstance(name, str):
+                                await canonical_dictionary.resolve(session, CanonicalEntityKind.COMPANY, name)
+                        alumni_updated += 1
+                    else:
+                        for kind, names in (
+                            (CanonicalEntityKind.COMPANY, profile.target_companies),
+                            (CanonicalEntityKind.ROLE, profile.target_roles),
+                        ):
+                            for name in names if isinstance(names, list) else []:
+                                if isinstance(name, str):
+                                    await canonical_dictionary.resolve(session, kind, name)
+                        students_updated += 1
+                    canonical_dictionary.apply(profile)
+                last_id = profiles[-1].id
+                await session.commit()
+                session.expunge_all()
+    return alumni_updated, students_updated
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Canonical company/role dictionary")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--backfill", action="store_true", help="Resolve all profiles, creating missing entities")
+    group.add_argument("--suggest", metavar="NAME", help="Suggest existing entities for a spelling")
+    parser.add_argument("--kind", choices=[k.value for k in CanonicalEntityKind], default="company")
+    args = parser.parse_args()
+
+    async def _suggest(name: str, kind: CanonicalEntityKind):
+        async with AsyncSessionLocal() as session:
+            await canonical_dictionary.load(session)
+        for suggestion in canonical_dictionary.suggest(kind, name):
+            print(f"{suggestion.entity_id}\t{suggestion.similarity:.3f}\t{suggestion.name}")
+
+    if args.backfill:
+        alumni_count, student_count = asyncio.run(backfill())
+        print(f"[CANONICAL] Backfilled {alumni_count} alumni, {student_count} students")
+    else:
+        asyncio.run(_suggest(args.suggest, CanonicalEntityKind(args.kind)))
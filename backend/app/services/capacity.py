@@ -0,0 +1,324 @@
+"""
+Alumni request capacity
+
+Every introduction request checks and consumes one unit of the alumni's
+monthly capacity (`max_requests_per_month`). Both backends make the
+check-and-increment a single atomic step, and neither needs a monthly
+reset job: the counter belongs to a month (`alumni.capacity_month`, or
+the month in the Redis key), and a counter from an earlier month simply
+reads as zero.
+
+- "sql" (default): one conditional `UPDATE ... RETURNING` on the alumni
+  row. It runs in the caller's transaction, so the reservation rolls
+  back with the request it was made for.
+- "redis": a Lua script over `capacity:<alumni id>:<YYYYMM>` counters,
+  seeded from the row on first use. Reservations never touch the alumni
+  row; a write-back loop copies changed counters to it every
+  CAPACITY_WRITE_BACK_SECONDS so SQL readers stay close. Not
+  transactional: release() the unit if the request is not created.
+
+Counter writes leave `alumni.updated_at` alone (they are not profile
+edits). In-memory consumers of eligibility (match scoring) subscribe with
+add_listener() and are told when an alumni fills up or frees a slot,
+after the reserving transaction commits.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import bindparam, case, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis
+from app.models.alumni import Alumni
+
+_PENDING_KEY = "capacity_changes"
+
+
+class CapacityExceededError(Exception):
+    """Alumni has no requests left this month (or does not exist)"""
+
+
+@dataclass(frozen=True)
+class Reservation:
+    alumni_id: uuid.UUID
+    used: int  # Including this reservation
+    limit: int
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+
+def month_key(now: Optional[datetime] = None) -> int:
+    """Capacity month as YYYYMM (UTC)"""
+    now = now or datetime.now(timezone.utc)
+    return now.year * 100 + now.month
+
+
+def requests_this_month(used: Optional[int], capacity_month: Optional[int], month: Optional[int] = None) -> int:
+    """Requests counted against the current month; older counters read as zero"""
+    return (used or 0) if capacity_month == (month or month_key()) else 0
+
+
+class SqlCapacityBackend:
+    """Conditional UPDATE on the alumni row"""
+
+    name = "sql"
+    transactional = True
+
+    async def reserve(self, session: AsyncSession, alumni_id: uuid.UUID, month: int) -> Optional[Reservation]:
+        same_month = Alumni.capacity_month == month
+        statement = (
+            update(Alumni)
+            .where(
+                Alumni.id == alumni_id,
+                Alumni.max_requests_per_month > 0,
+                # A counter from an earlier month is stale: it restarts at 1
+                (Alumni.capacity_month != month) | (Alumni.capacity_month.is_(None))
+                | (Alumni.current_month_requests < Alumni.max_requests_per_month),
+            )
+            .values(
+                current_month_requests=case((same_month, Alumni.current_month_requests + 1), else_=1),
+                capacity_month=month,
+                updated_at=Alumni.updated_at,
+            )
+            .returning(Alumni.current_month_requests, Alumni.max_requests_per_month)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await session.execute(statement)).first()
+        return Reservation(alumni_id, row[0], row[1]) if row else None
+
+    async def release(self, session: AsyncSession, alumni_id: uuid.UUID, month: int) -> None:
+        await session.execute(
+            update(Alumni)
+            .where(Alumni.id == alumni_id, Alumni.capacity_month == month, Alumni.current_month_requests > 0)
+            .values(current_month_requests=Alumni.current_month_requests - 1, updated_at=Alumni.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+
+# KEYS: counter, dirty set; ARGV: limit, seed, ttl seconds, dirty member
+_RESERVE_SCRIPT = """
+local used = redis.call('GET', KEYS[1])
+if used then
+    used = tonumber(used)
+else
+    used = tonumber(ARGV[2])
+    redis.call('SET', KEYS[1], used, 'EX', ARGV[3])
+end
+if used >= tonumber(ARGV[1]) then
+    return {0, used}
+end
+used = redis.call('INCR', KEYS[1])
+redis.call('SADD', KEYS[2], ARGV[4])
+return {1, used}
+"""
+
+# KEYS: counter, dirty set; ARGV: dirty member
+_RELEASE_SCRIPT = """
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+if used > 0 then
+    used = redis.call('DECR', KEYS[1])
+    redis.call('SADD', KEYS[2], ARGV[1])
+end
+return used
+"""
+
+
+class RedisCapacityBackend:
+    """Month-keyed Redis counters with periodic write-back"""
+
+    name = "redis"
+    transactional = False
+    dirty_key = "capacity:dirty"
+    ttl_seconds = 40 * 24 * 3600  # Outlives its month; never needs deleting
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self._reserve = None
+        self._release = None
+        self.written_back = 0
+
+    @staticmethod
+    def counter_key(alumni_id: uuid.UUID, month: int) -> str:
+        return f"capacity:{alumni_id}:{month}"
+
+    def _scripts(self):
+        if self._reserve is None:
+            redis = get_redis()
+            self._reserve = redis.register_script(_RESERVE_SCRIPT)
+            self._release = redis.register_script(_RELEASE_SCRIPT)
+        return self._reserve, self._release
+
+    async def reserve(self, session: AsyncSession, alumni_id: uuid.UUID, month: int) -> Optional[Reservation]:
+        row = (await session.execute(
+            select(Alumni.max_requests_per_month, Alumni.current_month_requests, Alumni.capacity_month)
+            .where(Alumni.id == alumni_id)
+        )).first()
+        if row is None or row[0] <= 0:
+            return None
+        limit, used, capacity_month = row
+        reserve, _ = self._scripts()
+        member = f"{alumni_id}:{month}"
+        granted, used = await reserve(
+            keys=[self.counter_key(alumni_id, month), self.dirty_key],
+            args=[limit, requests_this_month(used, capacity_month, month), self.ttl_seconds, member],
+        )
+        return Reservation(alumni_id, int(used), limit) if granted else None
+
+    async def release(self, session: AsyncSession, alumni_id: uuid.UUID, month: int) -> None:
+        _, release = self._scripts()
+        await release(keys=[self.counter_key(alumni_id, month), self.dirty_key], args=[f"{alumni_id}:{month}"])
+
+    async def write_back(self, batch_size: int = 500) -> int:
+        """Copy changed counters to their alumni rows"""
+        redis = get_redis()
+        members = await redis.spop(self.dirty_key, batch_size)
+        if not members:
+            return 0
+        pairs = []
+        for member in members:
+            alumni_id, month = (member.decode() if isinstance(member, bytes) else member).rsplit(":", 1)
+            pairs.append((uuid.UUID(alumni_id), int(month)))
+        counts = await redis.mget([self.counter_key(alumni_id, month) for alumni_id, month in pairs])
+        rows = [
+            {"alumni_id": alumni_id, "used": int(count), "month": month}
+            for (alumni_id, month), count in zip(pairs, counts)
+            if count is not None
+        ]
+        try:
+            async with self.session_factory() as session:
+                # Never let an older month's counter overwrite a newer one
+                alumni = Alumni.__table__.c
+                await session.execute(
+                    update(Alumni.__table__)
+                    .where(
+                        alumni.id == bindparam("alumni_id"),
+                        alumni.capacity_month.is_(None) | (alumni.capacity_month <= bindparam("month")),
+                    )
+                    .values(
+                        current_month_requests=bindparam("used"),
+                        capacity_month=bindparam("month"),
+                        updated_at=alumni.updated_at,
+                    ),
+                    rows,
+                )
+                await session.commit()
+        except Exception:
+            await redis.sadd(self.dirty_key, *members)
+            raise
+        self.written_back += len(rows)
+        return len(rows)
+
+
+class CapacityService:
+    """Reserve and release monthly request capacity"""
+
+    def __init__(self, backend, write_back_interval: float = 30.0):
+        self.backend = backend
+        self.write_back_interval = write_back_interval
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[Iterable[uuid.UUID]], None]] = []
+        self.reserved = 0
+        self.rejected = 0
+        self.errors = 0
+
+    async def reserve(self, session: AsyncSession, alumni_id: uuid.UUID) -> Reservation:
+        """Consume one request of the alumni's capacity this month"""
+        reservation = await self.backend.reserve(session, alumni_id, month_key())
+        if reservation is None:
+            self.rejected += 1
+            raise CapacityExceededError("This alumni is not accepting more requests this month")
+        self.reserved += 1
+        if reservation.remaining == 0:
+            self._changed(session, alumni_id)
+        return reservation
+
+    async def release(self, session: AsyncSession, alumni_id: uuid.UUID) -> None:
+        """Give back a reservation whose request was not created"""
+        await self.backend.release(session, alumni_id, month_key())
+        self._changed(session, alumni_id)
+
+    def add_listener(self, callback: Callable[[Iterable[uuid.UUID]], None]) -> None:
+        """Call `callback(alumni_ids)` when alumni run out of or regain capacity"""
+        self._listeners.append(callback)
+
+    def _changed(self, session: AsyncSession, alumni_id: uuid.UUID) -> None:
+        if self.backend.transactional:
+            session.info.setdefault(_PENDING_KEY, set()).add(alumni_id)
+        else:
+            self.notify([alumni_id])
+
+    def notify(self, alumni_ids: Iterable[uuid.UUID]) -> None:
+        alumni_ids = list(alumni_ids)
+        for callback in self._listeners:
+            callback(alumni_ids)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                while await self.backend.write_back() > 0:
+                    pass
+            except Exception as e:
+                self.errors += 1
+                print(f"[CAPACITY] Write-back failed: {e}")
+            await asyncio.sleep(self.write_back_interval)
+
+    def start(self) -> None:
+        """Start the write-back loop (Redis backend only)"""
+        if not hasattr(self.backend, "write_back"):
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if hasattr(self.backend, "write_back"):
+            # Flush what is pending so the rows are current after shutdown
+            try:
+                while await self.backend.write_back() > 0:
+                    pass
+            except Exception as e:
+                print(f"[CAPACITY] Final write-back failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "reserved": self.reserved,
+            "rejected": self.rejected,
+            "written_back": getattr(self.backend, "written_back", 0),
+            "errors": self.errors,
+        }
+
+
+_BACKENDS = {"sql": SqlCapacityBackend, "redis": RedisCapacityBackend}
+
+# Create singleton instance
+capacity_service = CapacityService(
+    _BACKENDS[settings.CAPACITY_BACKEND](),
+    write_back_interval=settings.CAPACITY_WRITE_BACK_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_capacity_changes(session):
+    changed: Optional[Set[uuid.UUID]] = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        capacity_service.notify(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_capacity_changes(session):
+    session.info.pop(_PENDING_KEY, None)
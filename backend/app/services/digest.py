@@ -0,0 +1,326 @@
+"""
+Batched digest email pipeline
+
+Sends periodic digests (e.g. the weekly alumni summary) to thousands of
+recipients without going through the one-off `_send_email` path:
+
+- recipients are streamed from the database in keyset-ordered chunks
+- templates are compiled once and cached; every message reuses a shared
+  MIME skeleton so per-recipient work is string substitution and encoding
+- messages fan out over a bounded pool of sender threads that share
+  EmailService's pooled SMTP sessions
+- progress and throughput are reported while the run is in flight
+
+Context values are HTML-escaped for the HTML part only; the subject and
+text part get them verbatim.
+
+Run with:
+    python -m app.services.digest alumni_weekly [--dry-run] [--limit N]
+"""
+
+import asyncio
+import email.utils
+import quopri
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.header import Header
+from functools import lru_cache
+from html import escape
+from string import Template
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.alumni import Alumni
+from app.models.alumni_score_sums import AlumniScoreSums
+from app.models.user import User, UserRole, UserStatus
+from app.services.capacity import requests_this_month
+from app.services.email_service import EmailService, get_email_service
+
+
+@dataclass(frozen=True)
+class DigestTemplate:
+    """Subject, HTML and text bodies as `string.Template` sources"""
+    name: str
+    subject: str
+    html: str
+    text: str
+
+
+# Registered digest templates; placeholders use $name syntax
+DIGEST_TEMPLATES: Dict[str, DigestTemplate] = {
+    "alumni_weekly": DigestTemplate(
+        name="alumni_weekly",
+        subject="Your Alumni Connect week: $pending_count pending introduction requests",
+        html="""<html>
+  <body>
+    <h2>Your week on Alumni Connect</h2>
+    <p>Hi $user_name,</p>
+    <p>You have <strong>$pending_count</strong> pending introduction requests.</p>
+    <p>You have received <strong>$request_count</strong> introduction requests this month.
+    You can accept <strong>$remaining</strong> more before reaching your monthly limit of $limit.</p>
+    <p><a href="$dashboard_url" style="background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Review requests</a></p>
+    <p>You can change how often you receive these emails in your profile settings.</p>
+  </body>
+</html>
+""",
+        text="""Your week on Alumni Connect
+
+Hi $user_name,
+
+You have $pending_count pending introduction requests.
+
+You have received $request_count introduction requests this month.
+You can accept $remaining more before reaching your monthly limit of $limit.
+
+Review requests: $dashboard_url
+""",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Pre-parsed templates plus the MIME skeleton they render into"""
+    subject: Template
+    html: Template
+    text: Template
+    ascii_subject: bool
+    boundary: str
+    # Static header and part-header blocks, joined around the rendered bodies
+    head: bytes
+    text_part_head: bytes
+    html_part_head: bytes
+    tail: bytes
+
+
+@lru_cache(maxsize=None)
+def compile_template(name: str, email_from: str) -> CompiledTemplate:
+    """Parse a digest template and build its shared MIME skeleton once"""
+    source = DIGEST_TEMPLATES[name]
+    boundary = f"==digest-{secrets.token_hex(12)}=="
+    part_head = (
+        "--{boundary}\r\n"
+        "Content-Type: text/{subtype}; charset=\"utf-8\"\r\n"
+        "Content-Transfer-Encoding: quoted-printable\r\n\r\n"
+    )
+    return CompiledTemplate(
+        subject=Template(source.subject),
+        html=Template(source.html),
+        text=Template(source.text),
+        ascii_subject=source.subject.isascii(),
+        boundary=boundary,
+        head=(
+            f"From: {email_from}\r\n"
+            "MIME-Version: 1.0\r\n"
+            f"Content-Type: multipart/alternative; boundary=\"{boundary}\"\r\n"
+        ).encode(),
+        text_part_head=part_head.format(boundary=boundary, subtype="plain").encode(),
+        html_part_head=part_head.format(boundary=boundary, subtype="html").encode(),
+        tail=f"--{boundary}--\r\n".encode(),
+    )
+
+
+def _qp(body: str) -> bytes:
+    """Quoted-printable encode with CRLF line endings for SMTP"""
+    return quopri.encodestring(body.encode("utf-8")).replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+
+
+def render_message(compiled: CompiledTemplate, to_email: str, context: Dict[str, object]) -> bytes:
+    """Render one recipient's message into the shared skeleton"""
+    html_context = {key: escape(str(value)) for key, value in context.items()}
+    subject = compiled.subject.safe_substitute(context)
+    if not compiled.ascii_subject or not subject.isascii():
+        subject = Header(subject, "utf-8").encode()
+    headers = (
+        f"To: {to_email}\r\n"
+        f"Subject: {subject}\r\n"
+        f"Date: {email.utils.formatdate(localtime=False)}\r\n"
+        f"Message-ID: {email.utils.make_msgid(domain='alumni-connect')}\r\n\r\n"
+    ).encode()
+    return b"".join((
+        compiled.head,
+        headers,
+        compiled.text_part_head,
+        _qp(compiled.text.safe_substitute(context)),
+        b"\r\n",
+        compiled.html_part_head,
+        _qp(compiled.html.safe_substitute(html_context)),
+        b"\r\n",
+        compiled.tail,
+    ))
+
+
+# A recipient is (email, template context)
+Recipient = Tuple[str, Dict[str, object]]
+
+
+async def stream_alumni_recipients(
+    session: AsyncSession,
+    chunk_size: int = 1000,
+    limit: Optional[int] = None,
+) -> AsyncIterator[List[Recipient]]:
+    """
+    Yield active, verified alumni with their weekly digest context in chunks
+
+    Chunks are keyset-paginated on users.id so each query is an index range
+    scan regardless of how far into the population the run is. Pending
+    requests are those received and not yet approved, declined or expired,
+    from the alumni's score sums (as of the last applied score event).
+    """
+    pending = func.coalesce(
+        AlumniScoreSums.requests_received - AlumniScoreSums.approvals
+        - AlumniScoreSums.declines - AlumniScoreSums.expirations,
+        0,
+    )
+    last_id = None
+    sent = 0
+    while limit is None or sent < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - sent)
+        query = (
+            select(
+                User.id, User.email, Alumni.current_month_requests, Alumni.capacity_month,
+                Alumni.max_requests_per_month, pending,
+            )
+            .join(Alumni, Alumni.id == User.id)
+            .outerjoin(AlumniScoreSums, AlumniScoreSums.alumni_id == Alumni.id)
+            .where(
+                User.role == UserRole.ALUMNI,
+                User.status == UserStatus.ACTIVE,
+                User.email_verified == true(),
+            )
+            .order_by(User.id)
+            .limit(size)
+        )
+        if last_id is not None:
+            query = query.where(User.id > last_id)
+        rows = (await session.execute(query)).all()
+        if not rows:
+            return
+
+        dashboard_url = f"{settings.FRONTEND_URL}/alumni/requests"
+        chunk = []
+        for user_id, to_email, used, capacity_month, limit_per_month, pending_count in rows:
+            received = requests_this_month(used, capacity_month)
+            chunk.append((to_email, {
+                "user_name": to_email.split("@")[0],
+                "pending_count": max(0, pending_count),
+                "request_count": received,
+                "limit": limit_per_month,
+                "remaining": max(0, limit_per_month - received),
+                "dashboard_url": dashboard_url,
+            }))
+        yield chunk
+        last_id = rows[-1][0]
+        sent += len(rows)
+
+
+@dataclass
+class DigestReport:
+    """Outcome and throughput of a digest run"""
+    template: str
+    sent: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.template}: sent={self.sent} failed={self.failed} "
+            f"elapsed={self.elapsed:.1f}s rate={self.per_second:.1f} msg/s"
+        )
+
+
+class DigestRunner:
+    """Render and send a digest over a bounded pool of sender threads"""
+
+    def __init__(
+        self,
+        service: Optional[EmailService] = None,
+        concurrency: int = 4,
+        progress_every: int = 500,
+        on_progress: Optional[Callable[[DigestReport], None]] = None,
+    ):
+        self.service = service or get_email_service()
+        self.concurrency = concurrency
+        self.progress_every = progress_every
+        self.on_progress = on_progress or (lambda report: print(f"[DIGEST] {report}"))
+
+    async def run(self, template: str, chunks: AsyncIterator[List[Recipient]]) -> DigestReport:
+        compiled = compile_template(template, self.service.email_from)
+        report = DigestReport(template=template)
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(self.concurrency * 2)  # keep every sender busy
+        pending = set()
+        started = time.perf_counter()
+
+        def done(task: asyncio.Task) -> None:
+            pending.discard(task)
+            in_flight.release()
+            if not task.cancelled() and task.exception() is None and task.result():
+                report.sent += 1
+            else:
+                report.failed += 1
+            if (report.sent + report.failed) % self.progress_every == 0:
+                report.elapsed = time.perf_counter() - started
+                self.on_progress(report)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="digest") as executor:
+            async for chunk in chunks:
+                for to_email, context in chunk:
+                    raw = render_message(compiled, to_email, context)
+                    await in_flight.acquire()
+                    task = asyncio.ensure_future(
+                        loop.run_in_executor(executor, self.service.send_raw, to_email, raw)
+                    )
+                    pending.add(task)
+                    task.add_done_callback(done)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+# Recipient source for each digest template
+DIGEST_SOURCES = {
+    "alumni_weekly": stream_alumni_recipients,
+}
+
+
+async def send_digest(template: str, limit: Optional[int] = None, dry_run: bool = False) -> DigestReport:
+    """Send a digest to every recipient its source yields (render only if dry_run)"""
+    async with AsyncSessionLocal() as session:
+        chunks = DIGEST_SOURCES[template](session, limit=limit)
+        if dry_run:
+            report = DigestReport(template=template)
+            compiled = compile_template(template, get_email_service().email_from)
+            started = time.perf_counter()
+            async for chunk in chunks:
+                for to_email, context in chunk:
+                    render_message(compiled, to_email, context)
+                    report.sent += 1
+            report.elapsed = time.perf_counter() - started
+            return report
+        runner = DigestRunner(concurrency=settings.SMTP_POOL_SIZE)
+        return await runner.run(template, chunks)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Send a digest email to all eligible recipients")
+    parser.add_argument("template", choices=sorted(DIGEST_SOURCES))
+    parser.add_argument("--limit", type=int, default=None, help="Stop after N recipients")
+    parser.add_argument("--dry-run", action="store_true", help="Render without sending")
+    args = parser.parse_args()
+
+    print(f"[DIGEST] {asyncio.run(send_digest(args.template, args.limit, args.dry_run))}")
@@ -0,0 +1,400 @@
+"""
+In-memory inverted index for alumni discovery
+
+Backs GET /students/discover: filter alumni of one university by industry,
+role, location and availability, then rank by shared hobbies/interests.
+
+Each university gets its own UniversityIndex. Alumni are assigned dense
+integer slots and every (field, term) pair maps to a posting list of slots.
+Queries run on posting lists packed into Python ints used as bitmaps:
+filters are ANDs, shared-term counts are computed level by level with
+bitwise ops, and only the final top-k slots are ever visited one by one,
+so a query costs microseconds instead of a JSONB scan.
+
+The index is kept current incrementally: the alumni change feed (ORM
+hooks in this process, a poll for other workers' writes) records which
+alumni changed, and the next query reloads just those rows.
+"""
+
+import bisect
+import heapq
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.alumni import Alumni, AvailabilityStatus
+from app.models.user import User, UserStatus
+from app.services.alumni_changes import alumni_changes
+from app.services.tenancy import scope_to_university
+
+# Alumni who are not closed to requests appear in discovery
+DISCOVERABLE = frozenset({AvailabilityStatus.OPEN, AvailabilityStatus.LIMITED})
+
+
+def normalize_term(value: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive form used for every indexed term"""
+    if not value or not isinstance(value, str):
+        return None
+    term = " ".join(value.lower().split())
+    return term or None
+
+
+def _terms(values) -> FrozenSet[str]:
+    if not values:
+        return frozenset()
+    if isinstance(values, str):
+        values = [values]
+    return frozenset(t for t in (normalize_term(v) for v in values) if t)
+
+
+@dataclass(frozen=True)
+class AlumniDoc:
+    """Indexed view of one alumni profile"""
+    id: uuid.UUID
+    industry: Optional[str]
+    role: Optional[str]
+    location: Optional[str]
+    availability: AvailabilityStatus
+    tags: FrozenSet[str]  # hobbies and interests
+    helpfulness: float
+
+    @classmethod
+    def from_alumni(cls, alumni: Alumni) -> "AlumniDoc":
+        return cls(
+            id=alumni.id,
+            industry=normalize_term(alumni.industry),
+            role=normalize_term(alumni.current_role),
+            location=normalize_term(alumni.location),
+            availability=alumni.availability_status or AvailabilityStatus.OPEN,
+            tags=_terms(alumni.hobbies) | _terms(alumni.interests),
+            helpfulness=float(alumni.helpfulness_score or 0),
+        )
+
+    def postings(self) -> Iterable[Tuple[str, str]]:
+        if self.industry:
+            yield ("industry", self.industry)
+        if self.role:
+            yield ("role", self.role)
+        if self.location:
+            yield ("location", self.location)
+        yield ("availability", self.availability.value)
+        for tag in self.tags:
+            yield ("tag", tag)
+
+
+@dataclass(frozen=True)
+class DiscoveryHit:
+    """One ranked result"""
+    alumni_id: uuid.UUID
+    shared_terms: Tuple[str, ...]
+    helpfulness: float
+
+
+def _to_bitmap(slots: Iterable[int]) -> int:
+    """Pack slot numbers into an int with those bits set"""
+    slots = list(slots)
+    if not slots:
+        return 0
+    buf = bytearray((max(slots) >> 3) + 1)
+    for slot in slots:
+        buf[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _top_slots(bitmap: int, limit: int) -> List[int]:
+    """Highest set bits first; each step is a couple of word-level int ops"""
+    slots = []
+    while bitmap and len(slots) < limit:
+        slot = bitmap.bit_length() - 1
+        slots.append(slot)
+        bitmap ^= 1 << slot
+    return slots
+
+
+class UniversityIndex:
+    """
+    Posting lists for one university's alumni
+
+    Postings are kept as sets of slots (cheap to update, memory proportional
+    to use) and materialized on demand into int bitmaps, where AND/OR and
+    popcount run in C over machine words. Materialized bitmaps are cached
+    and patched in place on updates.
+
+    Slots are assigned in ascending helpfulness order, so the most helpful
+    alumni in any bitmap are its highest set bits and top-k reads exactly k
+    bits. Updated profiles are appended to a tail kept sorted on the side;
+    once the tail and the slots freed by updates grow past a few percent of
+    the index, compact() reassigns every slot.
+    """
+
+    def __init__(self, bitmap_cache_size: int = 4096):
+        self._slots: Dict[uuid.UUID, int] = {}
+        self._docs: List[Optional[AlumniDoc]] = []
+        self._postings: Dict[Tuple[str, str], Set[int]] = {}
+        self._bitmaps: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._bitmap_cache_size = bitmap_cache_size
+        self._ordered_upto = 0  # slots below this are in helpfulness order
+        self._ordered_mask = 0
+        self._tail_order: List[Tuple[float, int]] = []  # (helpfulness, slot) for the tail
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @classmethod
+    def from_docs(cls, docs: Iterable[AlumniDoc], **kwargs) -> "UniversityIndex":
+        index = cls(**kwargs)
+        index._docs = list(docs)
+        index.compact()
+        return index
+
+    def compact(self) -> None:
+        """Reassign slots in helpfulness order, dropping freed ones"""
+        docs = sorted((doc for doc in self._docs if doc is not None), key=lambda doc: doc.helpfulness)
+        postings: Dict[Tuple[str, str], Set[int]] = {}
+        for slot, doc in enumerate(docs):
+            for key in doc.postings():
+                posting = postings.get(key)
+                if posting is None:
+                    postings[key] = {slot}
+                else:
+                    posting.add(slot)
+        self._docs = docs
+        self._slots = {doc.id: slot for slot, doc in enumerate(docs)}
+        self._postings = postings
+        self._ordered_upto = len(docs)
+        self._ordered_mask = (1 << len(docs)) - 1
+        self._tail_order = []
+        # Rebuild hot bitmaps here rather than on the next queries
+        for key in self._bitmaps:
+            self._bitmaps[key] = _to_bitmap(postings.get(key, ()))
+
+    def _maybe_compact(self) -> None:
+        unordered = (len(self._docs) - self._ordered_upto) + (len(self._docs) - len(self._slots))
+        if unordered > max(256, len(self._slots) // 20):
+            self.compact()
+
+    def _bitmap(self, key: Tuple[str, str]) -> int:
+        bitmap = self._bitmaps.get(key)
+        if bitmap is not None:
+            self._bitmaps.move_to_end(key)
+            return bitmap
+        posting = self._postings.get(key)
+        if not posting:
+            return 0
+        bitmap = _to_bitmap(posting)
+        self._bitmaps[key] = bitmap
+        if len(self._bitmaps) > self._bitmap_cache_size:
+            self._bitmaps.popitem(last=False)
+        return bitmap
+
+    def upsert(self, doc: AlumniDoc) -> None:
+        """Add or replace a profile's postings"""
+        self._discard(doc.id)
+        slot = len(self._docs)
+        self._docs.append(doc)
+        self._slots[doc.id] = slot
+        bisect.insort(self._tail_order, (doc.helpfulness, slot))
+        bit = 1 << slot
+        for key in doc.postings():
+            self._postings.setdefault(key, set()).add(slot)
+            if key in self._bitmaps:
+                self._bitmaps[key] |= bit
+        self._maybe_compact()
+
+    def remove(self, alumni_id: uuid.UUID) -> None:
+        self._discard(alumni_id)
+        self._maybe_compact()
+
+    def _discard(self, alumni_id: uuid.UUID) -> None:
+        slot = self._slots.pop(alumni_id, None)
+        if slot is None:
+            return
+        bit = 1 << slot
+        for key in self._docs[slot].postings():
+            posting = self._postings.get(key)
+            if posting is None:
+                continue
+            posting.discard(slot)
+            if key in self._bitmaps:
+                self._bitmaps[key] ^= bit
+            if not posting:
+                del self._postings[key]
+                self._bitmaps.pop(key, None)
+        self._docs[slot] = None
+
+    def _candidates(self, filters: List[Tuple[str, str]], available_only: bool) -> int:
+        statuses = DISCOVERABLE if available_only else AvailabilityStatus
+        candidates = 0
+        for status in statuses:
+            candidates |= self._bitmap(("availability", status.value))
+        for key in filters:
+            if not candidates:
+                break
+            candidates &= self._bitmap(key)
+        return candidates
+
+    def _most_helpful(self, bitmap: int, limit: int) -> List[int]:
+        """Up to `limit` slots from `bitmap`, most helpful first"""
+        base = self._ordered_upto
+        tail = bitmap >> base
+        if not tail:
+            return _top_slots(bitmap, limit)
+
+        ordered = _top_slots(bitmap & self._ordered_mask, limit)
+        if tail.bit_count() <= limit * 4:
+            extra = [base + slot for slot in _top_slots(tail, limit * 4)]
+        else:
+            extra = []
+            for _, slot in reversed(self._tail_order):
+                if tail >> (slot - base) & 1:
+                    extra.append(slot)
+                    if len(extra) == limit:
+                        break
+        docs = self._docs
+        return heapq.nlargest(limit, ordered + extra, key=lambda slot: docs[slot].helpfulness)
+
+    def search(
+        self,
+        industry: Optional[str] = None,
+        role: Optional[str] = None,
+        location: Optional[str] = None,
+        interests: Iterable[str] = (),
+        available_only: bool = True,
+        exclude: Iterable[uuid.UUID] = (),
+        limit: int = 20,
+    ) -> List[DiscoveryHit]:
+        """
+        Filter, then rank by number of shared interest/hobby terms
+
+        Ties (including alumni sharing nothing) are broken by helpfulness.
+        """
+        filters = [
+            (field, term)
+            for field, term in (
+                ("industry", normalize_term(industry)),
+                ("role", normalize_term(role)),
+                ("location", normalize_term(location)),
+            )
+            if term
+        ]
+        candidates = self._candidates(filters, available_only)
+        for alumni_id in exclude:
+            slot = self._slots.get(alumni_id)
+            if slot is not None and candidates >> slot & 1:
+                candidates ^= 1 << slot
+        if not candidates or limit <= 0:
+            return []
+
+        # at_least[k]: candidates sharing at least k query terms
+        query_terms = _terms(list(interests))
+        at_least = [candidates]
+        for term in query_terms:
+            matches = self._bitmap(("tag", term)) & candidates
+            if not matches:
+                continue
+            at_least.append(0)
+            for k in range(len(at_least) - 1, 0, -1):
+                at_least[k] |= at_least[k - 1] & matches
+
+        # Walk score levels from the most shared terms down
+        chosen: List[int] = []
+        above = 0
+        for level in reversed(at_least):
+            exact = level ^ above  # levels are nested, so XOR strips the higher one
+            above = level
+            if exact:
+                chosen.extend(self._most_helpful(exact, limit - len(chosen)))
+                if len(chosen) >= limit:
+                    break
+
+        docs = self._docs
+        return [
+            DiscoveryHit(
+                alumni_id=docs[slot].id,
+                shared_terms=tuple(sorted(docs[slot].tags & query_terms)),
+                helpfulness=docs[slot].helpfulness,
+            )
+            for slot in chosen
+        ]
+
+
+class DiscoveryIndex:
+    """Per-university indexes with lazy loading and incremental refresh"""
+
+    def __init__(self):
+        self._universities: Dict[uuid.UUID, UniversityIndex] = {}
+        self._university_of: Dict[uuid.UUID, uuid.UUID] = {}
+        self._dirty: Set[uuid.UUID] = set()
+
+    def get(self, university_id: uuid.UUID) -> Optional[UniversityIndex]:
+        return self._universities.get(university_id)
+
+    def build(self, university_id: uuid.UUID, docs: List[AlumniDoc]) -> UniversityIndex:
+        """Replace a university's index with the given profiles"""
+        index = UniversityIndex.from_docs(docs)
+        for doc in docs:
+            self._university_of[doc.id] = university_id
+        self._universities[university_id] = index
+        return index
+
+    async def load_university(self, session: AsyncSession, university_id: uuid.UUID) -> UniversityIndex:
+        """Build a university's index from the database"""
+        result = await session.stream_scalars(
+            scope_to_university(select(Alumni), university_id, Alumni)
+            .execution_options(yield_per=2000)
+        )
+        docs = [AlumniDoc.from_alumni(alumni) async for alumni in result]
+        return self.build(university_id, docs)
+
+    def mark_dirty(self, alumni_ids: Iterable[uuid.UUID]) -> None:
+        """Record profiles whose index entries must be reloaded"""
+        self._dirty.update(alumni_ids)
+
+    async def refresh_dirty(self, session: AsyncSession) -> int:
+        """Reload changed profiles into the indexes that are already built"""
+        if not self._dirty:
+            return 0
+        ids, self._dirty = list(self._dirty), set()
+        result = await session.execute(
+            select(Alumni, User.university_id, User.status)
+            .join(User, User.id == Alumni.id)
+            .where(Alumni.id.in_(ids))
+        )
+        seen = set()
+        for alumni, university_id, user_status in result:
+            seen.add(alumni.id)
+            previous = self._university_of.get(alumni.id)
+            if previous is not None and previous != university_id:
+                self._universities[previous].remove(alumni.id)
+            index = self._universities.get(university_id)
+            if index is None:
+                continue  # built in full on first query
+            if user_status == UserStatus.ACTIVE:
+                index.upsert(AlumniDoc.from_alumni(alumni))
+                self._university_of[alumni.id] = university_id
+            else:
+                index.remove(alumni.id)
+        # Deleted profiles
+        for alumni_id in set(ids) - seen:
+            university_id = self._university_of.pop(alumni_id, None)
+            if university_id in self._universities:
+                self._universities[university_id].remove(alumni_id)
+        return len(ids)
+
+    async def search(self, session: AsyncSession, university_id: uuid.UUID, **query) -> List[DiscoveryHit]:
+        """Apply pending changes, load the university if needed, then search"""
+        await self.refresh_dirty(session)
+        index = self._universities.get(university_id)
+        if index is None:
+            index = await self.load_university(session, university_id)
+        return index.search(**query)
+
+
+# Create singleton instance
+discovery_index = DiscoveryIndex()
+
+alumni_changes.add_listener(discovery_index.mark_dirty)
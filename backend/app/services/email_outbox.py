@@ -0,0 +1,217 @@
+"""
+Email outbox: enqueue on the request path, deliver in the background
+
+Request handlers call `enqueue_email` inside their own transaction, so the
+email is recorded if and only if the business change commits. The
+EmailOutboxWorker drains due rows in batches:
+
+1. claim a batch (FOR UPDATE SKIP LOCKED) and push its next_attempt_at out
+   by a lease, so a crashed worker's rows become due again
+2. send each message through EmailService off the event loop
+3. mark rows sent, or schedule a retry with exponential backoff until
+   EMAIL_OUTBOX_MAX_ATTEMPTS is reached
+
+Run standalone with:
+    python -m app.services.email_outbox          # poll forever
+    python -m app.services.email_outbox --once   # drain due rows and exit
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.services.email_service import EmailService, get_email_service
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_email(db: AsyncSession, to_email: str, template: str, **payload) -> EmailOutbox:
+    """
+    Queue an email in the caller's transaction (does not commit)
+
+    `template` names an EmailService method in EmailOutboxWorker.templates;
+    `payload` holds its keyword arguments and must be JSON-serializable.
+    """
+    entry = EmailOutbox(
+        to_email=to_email,
+        template=template,
+        payload=payload,
+        status=EmailOutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=_utcnow(),
+    )
+    db.add(entry)
+    return entry
+
+
+class EmailOutboxWorker:
+    """Background task that delivers queued emails with retries"""
+
+    def __init__(
+        self,
+        service: Optional[EmailService] = None,
+        batch_size: int = 50,
+        poll_interval: float = 2.0,
+        max_attempts: int = 8,
+        lease_seconds: int = 300,
+        base_backoff: float = 30.0,
+        max_backoff: float = 3600.0,
+    ):
+        self._service = service
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.templates: Dict[str, Callable[..., bool]] = {
+            "verification": EmailService.send_verification_email,
+            "password_reset": EmailService.send_password_reset_email,
+        }
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    @property
+    def service(self) -> EmailService:
+        """The sender, resolved on first delivery rather than at import"""
+        if self._service is None:
+            self._service = get_email_service()
+        return self._service
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Exponential backoff with jitter for the given attempt count"""
+        delay = min(self.max_backoff, self.base_backoff * (2 ** max(0, attempts - 1)))
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    async def _claim(self) -> List[EmailOutbox]:
+        """Lease a batch of due rows so concurrent workers skip them"""
+        async with AsyncSessionLocal() as session:
+            now = _utcnow()
+            result = await session.execute(
+                select(EmailOutbox)
+                .where(
+                    EmailOutbox.status == EmailOutboxStatus.PENDING,
+                    EmailOutbox.next_attempt_at <= now,
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            batch = list(result.scalars())
+            for entry in batch:
+                entry.attempts += 1
+                entry.next_attempt_at = now + timedelta(seconds=self.lease_seconds)
+            await session.commit()
+            return batch
+
+    def _deliver(self, entry: EmailOutbox) -> Optional[str]:
+        """Send one message; returns an error string on failure"""
+        send = self.templates.get(entry.template)
+        if send is None:
+            return f"Unknown template: {entry.template}"
+        try:
+            return None if send(self.service, to_email=entry.to_email, **(entry.payload or {})) else "Send failed"
+        except Exception as e:
+            return str(e)
+
+    async def drain_once(self) -> int:
+        """Claim and process one batch; returns the number of rows processed"""
+        batch = await self._claim()
+        if not batch:
+            return 0
+
+        outcomes = []
+        for entry in batch:
+            # EmailService is blocking SMTP; keep it off the event loop
+            error = await asyncio.to_thread(self._deliver, entry)
+            outcomes.append((entry.id, entry.attempts, error))
+
+        async with AsyncSessionLocal() as session:
+            now = _utcnow()
+            for entry_id, attempts, error in outcomes:
+                entry = await session.get(EmailOutbox, entry_id)
+                if entry is None:
+                    continue
+                if error is None:
+                    entry.status = EmailOutboxStatus.SENT
+                    entry.sent_at = now
+                    entry.last_error = None
+                    self.sent += 1
+                elif attempts >= self.max_attempts:
+                    entry.status = EmailOutboxStatus.FAILED
+                    entry.last_error = error
+                    self.failed += 1
+                else:
+                    entry.next_attempt_at = now + self.backoff(attempts)
+                    entry.last_error = error
+                    self.retried += 1
+            await session.commit()
+        return len(batch)
+
+    async def drain(self) -> int:
+        """Process batches until nothing is due; returns rows processed"""
+        total = 0
+        while True:
+            processed = await self.drain_once()
+            total += processed
+            if processed < self.batch_size:
+                return total
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.drain()
+            except Exception as e:
+                print(f"[EMAIL] Outbox worker error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Start polling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"sent": self.sent, "retried": self.retried, "failed": self.failed}
+
+
+# Create singleton instance
+email_outbox_worker = EmailOutboxWorker(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deliver queued emails from the outbox")
+    parser.add_argument("--once", action="store_true", help="Drain due rows and exit")
+    args = parser.parse_args()
+
+    if args.once:
+        processed = asyncio.run(email_outbox_worker.drain())
+        print(f"[EMAIL] Processed {processed} outbox rows: {email_outbox_worker.stats()}")
+    else:
+        asyncio.run(email_outbox_worker.run_forever())
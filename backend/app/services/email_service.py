@@ -2,13 +2,118 @@
 Email service for sending verification and password reset emails
 """
 
-from typing import Optional
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, Optional
 from app.core.config import settings
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 
+class _PooledConnection:
+    """An authenticated SMTP session plus its usage bookkeeping"""
+    
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of authenticated SMTP sessions
+    
+    Reusing a session skips the connect/STARTTLS/login handshake (three to
+    five round trips) on every message. Sessions idle for longer than
+    `noop_after_idle` seconds are checked with NOOP before reuse, and a
+    session is retired after `max_messages` messages since many providers
+    cap messages per connection.
+    """
+    
+    def __init__(
+        self,
+        connect: Callable[[], smtplib.SMTP],
+        max_size: int = 4,
+        max_messages: int = 100,
+        noop_after_idle: float = 30.0,
+    ):
+        self._connect = connect
+        self.max_messages = max_messages
+        self.noop_after_idle = noop_after_idle
+        self._idle: Deque[_PooledConnection] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self.connects = 0
+        self.reuses = 0
+        self.noop_failures = 0
+    
+    @staticmethod
+    def _close(conn: _PooledConnection) -> None:
+        try:
+            conn.server.quit()
+        except Exception:
+            try:
+                conn.server.close()
+            except Exception:
+                pass
+    
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self.connects += 1
+                return _PooledConnection(self._connect())
+            if time.monotonic() - conn.last_used < self.noop_after_idle:
+                self.reuses += 1
+                return conn
+            # Idle long enough that the server may have dropped us
+            try:
+                if conn.server.noop()[0] == 250:
+                    self.reuses += 1
+                    return conn
+            except Exception:
+                pass
+            self.noop_failures += 1
+            self._close(conn)
+    
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """
+        Borrow a session for one message
+        
+        The session returns to the pool on success and is discarded if the
+        block raises, so a broken connection is never reused.
+        """
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn.server
+            except Exception:
+                self._close(conn)
+                raise
+            conn.messages += 1
+            conn.last_used = time.monotonic()
+            if conn.messages >= self.max_messages:
+                self._close(conn)
+            else:
+                with self._lock:
+                    self._idle.append(conn)
+        finally:
+            self._slots.release()
+    
+    def close_all(self) -> None:
+        """Quit every idle session"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            self._close(conn)
+
+
 class EmailService:
     """Service for sending emails"""
     
@@ -17,7 +122,64 @@ class EmailService:
         self.smtp_port = settings.SMTP_PORT
         self.smtp_user = settings.SMTP_USER
         self.smtp_password = settings.SMTP_PASSWORD
+        self.smtp_use_tls = settings.SMTP_USE_TLS
         self.email_from = settings.EMAIL_FROM
+        self.pool = SMTPConnectionPool(
+            self._connect,
+            max_size=settings.SMTP_POOL_SIZE,
+            max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            noop_after_idle=settings.SMTP_NOOP_AFTER_IDLE_SECONDS,
+        )
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP session"""
+        # Use TLS for port 587, SSL for port 465
+        if self.smtp_port == 465:
+            # SSL connection
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        else:
+            # TLS connection (default)
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=settings.SMTP_TIMEOUT_SECONDS)
+            if self.smtp_use_tls:
+                server.starttls()
+        
+        # Authenticate
+        server.login(self.smtp_user, self.smtp_password)
+        return server
+    
+    def _deliver(self, send: Callable[[smtplib.SMTP], object]) -> None:
+        """
+        Run `send(server)` on a pooled session
+        
+        A pooled session can be closed by the server between messages; in
+        that case retry once on a fresh connection.
+        """
+        for attempt in range(2):
+            try:
+                with self.pool.connection() as server:
+                    send(server)
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                if attempt:
+                    raise
+    
+    def send_raw(self, to_email: str, raw_message: bytes) -> bool:
+        """
+        Send a pre-rendered RFC 5322 message (CRLF line endings)
+        
+        Used by bulk senders that build messages from a shared MIME skeleton.
+        Returns True if successful, False otherwise
+        """
+        if not self.smtp_host or not self.smtp_user:
+            print(f"[EMAIL] Would send raw message to {to_email} ({len(raw_message)} bytes)")
+            return True
+        
+        try:
+            self._deliver(lambda server: server.sendmail(self.email_from, [to_email], raw_message))
+            return True
+        except Exception as e:
+            print(f"[EMAIL] Error sending email to {to_email}: {e}")
+            return False
     
     def _send_email(self, to_email: str, subject: str, html_body: str, text_body: str = None) -> bool:
         """
@@ -50,22 +212,8 @@ class EmailService:
             html_part = MIMEText(html_body, 'html')
             msg.attach(html_part)
             
-            # Send email via SMTP
-            # Use TLS for port 587, SSL for port 465
-            if self.smtp_port == 465:
-                # SSL connection
-                server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port)
-            else:
-                # TLS connection (default)
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                server.starttls()
-            
-            # Authenticate
-            server.login(self.smtp_user, self.smtp_password)
-            
-            # Send email
-            server.send_message(msg)
-            server.quit()
+            # Send email over a pooled, already-authenticated session
+            self._deliver(lambda server: server.send_message(msg))
             
             print(f"[EMAIL] Successfully sent email to {to_email}")
             return True
@@ -79,9 +227,19 @@ class EmailService:
             print(f"[EMAIL] Error sending email: {e}")
             return False
     
-    def send_verification_email(self, to_email: str, verification_token: str, user_name: Optional[str] = None) -> bool:
-        """Send email verification email"""
+    def send_verification_email(
+        self,
+        to_email: str,
+        verification_token: str,
+        user_name: Optional[str] = None,
+        expires_in_hours: int = 24,
+    ) -> bool:
+        """Send email verification email (`expires_in_hours` must match the token's expiry)"""
         verification_url = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
+        if expires_in_hours >= 48 and expires_in_hours % 24 == 0:
+            expiry = f"{expires_in_hours // 24} days"
+        else:
+            expiry = f"{expires_in_hours} hours"
         
         subject = "Verify your Alumni Connect account"
         html_body = f"""
@@ -93,7 +251,7 @@ class EmailService:
             <p><a href="{verification_url}" style="background-color: #4CAF50; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Verify Email</a></p>
             <p>Or copy and paste this link into your browser:</p>
             <p>{verification_url}</p>
-            <p>This link will expire in 24 hours.</p>
+            <p>This link will expire in {expiry}.</p>
             <p>If you didn't create an account, you can safely ignore this email.</p>
           </body>
         </html>
@@ -105,7 +263,7 @@ class EmailService:
         Please verify your email address by visiting:
         {verification_url}
         
-        This link will expire in 24 hours.
+        This link will expire in {expiry}.
         """
         
         return self._send_email(to_email, subject, html_body, text_body)
@@ -142,6 +300,29 @@ class EmailService:
         return self._send_email(to_email, subject, html_body, text_body)
 
 
-# Create singleton instance
-email_service = EmailService()
+_email_service: Optional[EmailService] = None
+_email_service_lock = threading.Lock()
+
+
+def get_email_service() -> EmailService:
+    """
+    Get the process-wide EmailService
+
+    Created on first use; SMTP sessions are opened lazily by its pool, so
+    calling this never connects by itself.
+    """
+    global _email_service
+    if _email_service is None:
+        with _email_service_lock:
+            if _email_service is None:
+                _email_service = EmailService()
+    return _email_service
+
+
+def close_email_service() -> None:
+    """Close pooled SMTP sessions (used on application shutdown)"""
+    global _email_service
+    if _email_service is not None:
+        _email_service.pool.close_all()
+        _email_service = None
 
@@ -0,0 +1,445 @@
+"""
+Vectorized match scoring for alumni ranking
+
+Implements the rule-based matching of the Matching & Discovery Service
+(shared major, industry/role interest, location, company alignment,
+graduation year proximity, shared hobbies and interests) plus the internal
+quality signals, scoring one student against every alumni of a university
+in a single NumPy pass.
+
+Per university, AlumniFeatures holds:
+- one int32 code array per categorical field (industry, role, location,
+  company, major); code 0 means "not set". Multiplying a one-hot matrix by
+  the student's preference vector is the same as indexing that vector with
+  the codes, so the one-hot matrix is never materialized.
+- the multi-hot hobbies/interests matrix in compressed-column form (per
+  term, the rows that have it), so multiplying it by the student's sparse
+  term vector only touches the columns of the student's own terms
+- float arrays for helpfulness_score, response_rate and graduation_year
+- an eligibility mask (availability not closed, monthly capacity left),
+  folded together with the quality signals into a per-weights base score
+
+Top-k selection uses np.argpartition, so only k scores are ever sorted.
+
+Changed alumni are patched into the arrays in place rather than rebuilding
+the university: new profiles are appended, removed ones become ineligible
+slots, and rows whose tags changed are masked out of the compressed
+columns and listed per tag on the side. Once those rows pass a few percent
+of the university, its arrays are rebuilt.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.alumni import Alumni, AvailabilityStatus
+from app.models.canonical_entity import CanonicalEntityKind
+from app.models.student import Student
+from app.models.user import User, UserStatus
+from app.services.alumni_changes import alumni_changes
+from app.services.canonical_names import canonical_dictionary
+from app.services.capacity import capacity_service, requests_this_month
+from app.services.discovery_index import normalize_term
+from app.services.match_weights import MatchWeights
+from app.services.tenancy import scope_to_university
+
+CATEGORICAL_FIELDS = ("industry", "role", "location", "company", "major")
+
+
+def _term_list(values, kind: Optional[CanonicalEntityKind] = None) -> List[str]:
+    if not values:
+        return []
+    if isinstance(values, str):
+        values = [values]
+    if kind is not None:
+        # Companies and roles compare by canonical entity ("Google LLC" == "Google")
+        return [t for t in (canonical_dictionary.match_key(kind, v) for v in values if isinstance(v, str)) if t]
+    return [t for t in (normalize_term(v) for v in values) if t]
+
+
+@dataclass(frozen=True)
+class AlumniFeatureRow:
+    """Scoring inputs for one alumni profile"""
+    id: uuid.UUID
+    industry: Optional[str]
+    role: Optional[str]
+    location: Optional[str]
+    company: Optional[str]
+    major: Optional[str]
+    tags: tuple
+    graduation_year: Optional[int]
+    helpfulness: float
+    response_rate: float
+    eligible: bool
+
+    @classmethod
+    def from_alumni(cls, alumni: Alumni) -> "AlumniFeatureRow":
+        return cls(
+            id=alumni.id,
+            industry=normalize_term(alumni.industry),
+            role=canonical_dictionary.match_key(CanonicalEntityKind.ROLE, alumni.current_role),
+            location=normalize_term(alumni.location),
+            company=canonical_dictionary.match_key(CanonicalEntityKind.COMPANY, alumni.current_company),
+            major=normalize_term(alumni.major),
+            tags=tuple(sorted(set(_term_list(alumni.hobbies) + _term_list(alumni.interests)))),
+            graduation_year=alumni.graduation_year,
+            helpfulness=float(alumni.helpfulness_score or 0),
+            response_rate=float(alumni.response_rate or 0),
+            eligible=(
+                alumni.availability_status != AvailabilityStatus.CLOSED
+                and requests_this_month(alumni.current_month_requests, alumni.capacity_month)
+                < (alumni.max_requests_per_month or 0)
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class StudentQuery:
+    """What a student is looking for, as normalized terms"""
+    industries: tuple = ()
+    roles: tuple = ()
+    locations: tuple = ()
+    companies: tuple = ()
+    majors: tuple = ()
+    tags: tuple = ()
+    graduation_year: Optional[int] = None
+
+    @classmethod
+    def from_student(cls, student: Student) -> "StudentQuery":
+        return cls(
+            industries=tuple(_term_list(student.target_industries)),
+            roles=tuple(
+                _term_list(student.target_roles, CanonicalEntityKind.ROLE)
+                + _term_list(student.career_interests, CanonicalEntityKind.ROLE)
+            ),
+            locations=tuple(_term_list(student.preferred_locations) + _term_list(student.current_location)),
+            companies=tuple(_term_list(student.target_companies, CanonicalEntityKind.COMPANY)),
+            majors=tuple(_term_list([student.major, student.secondary_major])),
+            tags=tuple(set(_term_list(student.hobbies) + _term_list(student.interests))),
+            graduation_year=student.graduation_year,
+        )
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    alumni_id: uuid.UUID
+    score: float
+
+
+@dataclass
+class AlumniFeatures:
+    """Column-oriented feature arrays for one university's alumni"""
+    ids: List[uuid.UUID]
+    vocab: Dict[str, Dict[str, int]]  # field -> term -> code (codes start at 1)
+    codes: Dict[str, np.ndarray]  # field -> int32 code per alumni
+    tag_vocab: Dict[str, int]
+    tag_indptr: np.ndarray  # rows having tag t are tag_rows[tag_indptr[t]:tag_indptr[t + 1]]
+    tag_rows: np.ndarray
+    tags: List[tuple]  # per row, to tell whether an update changed them
+    graduation_year: np.ndarray
+    helpfulness: np.ndarray
+    response_rate: np.ndarray
+    eligible: np.ndarray
+    outdated: int = 0  # rows masked out of the compressed tag columns
+    _base: Dict[MatchWeights, np.ndarray] = field(default_factory=dict, repr=False)
+    _slots: Dict[uuid.UUID, int] = field(default_factory=dict, repr=False)
+    _stale_tags: Optional[np.ndarray] = field(default=None, repr=False)  # rows to skip in tag_rows
+    _extra_tags: Dict[int, Set[int]] = field(default_factory=dict, repr=False)  # tag -> patched rows having it
+
+    def __post_init__(self):
+        self._slots = {alumni_id: i for i, alumni_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @classmethod
+    def build(cls, rows: Sequence[AlumniFeatureRow]) -> "AlumniFeatures":
+        n = len(rows)
+        vocab: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_FIELDS}
+        codes = {}
+        for name in CATEGORICAL_FIELDS:
+            terms = vocab[name]
+            column = np.zeros(n, dtype=np.int32)
+            for i, row in enumerate(rows):
+                term = getattr(row, name)
+                if term is not None:
+                    column[i] = terms.setdefault(term, len(terms) + 1)
+            codes[name] = column
+
+        tag_vocab: Dict[str, int] = {}
+        lengths = np.fromiter((len(row.tags) for row in rows), dtype=np.int64, count=n)
+        tags = np.fromiter(
+            (tag_vocab.setdefault(tag, len(tag_vocab)) for row in rows for tag in row.tags),
+            dtype=np.int32,
+            count=int(lengths.sum()),
+        )
+        # Re-sort the (row, tag) entries by tag to compress by column
+        order = np.argsort(tags, kind="stable")
+        indptr = np.zeros(len(tag_vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tags, minlength=len(tag_vocab)), out=indptr[1:])
+
+        return cls(
+            ids=[row.id for row in rows],
+            vocab=vocab,
+            codes=codes,
+            tag_vocab=tag_vocab,
+            tag_indptr=indptr,
+            tag_rows=np.repeat(np.arange(n, dtype=np.int32), lengths)[order],
+            tags=[row.tags for row in rows],
+            graduation_year=np.array(
+                [row.graduation_year if row.graduation_year is not None else np.nan for row in rows],
+                dtype=np.float64,
+            ),
+            helpfulness=np.fromiter((row.helpfulness for row in rows), dtype=np.float64, count=n),
+            response_rate=np.fromiter((row.response_rate for row in rows), dtype=np.float64, count=n),
+            eligible=np.fromiter((row.eligible for row in rows), dtype=bool, count=n),
+        )
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """Whether enough rows were patched that a rebuild pays off"""
+        return self.outdated > max(256, len(self.ids) // 20)
+
+    def upsert(self, row: AlumniFeatureRow) -> None:
+        """Update a profile's entries in place, appending it if new"""
+        i = self._slots.get(row.id)
+        if i is None:
+            i = self._append(row.id)
+        for name in CATEGORICAL_FIELDS:
+            term = getattr(row, name)
+            terms = self.vocab[name]
+            self.codes[name][i] = 0 if term is None else terms.setdefault(term, len(terms) + 1)
+        if row.tags != self.tags[i]:
+            self._retag(i, row.tags)
+        self.graduation_year[i] = row.graduation_year if row.graduation_year is not None else np.nan
+        self.helpfulness[i] = row.helpfulness
+        self.response_rate[i] = row.response_rate
+        self.eligible[i] = row.eligible
+        self._rescore(i)
+
+    def remove(self, alumni_id: uuid.UUID) -> None:
+        """Leave the profile's slot behind as an ineligible row"""
+        i = self._slots.pop(alumni_id, None)
+        if i is None:
+            return
+        self._retag(i, ())
+        self.eligible[i] = False
+        self._rescore(i)
+
+    def _append(self, alumni_id: uuid.UUID) -> int:
+        i = len(self.ids)
+        self.ids.append(alumni_id)
+        self.tags.append(())
+        self._slots[alumni_id] = i
+        for name in CATEGORICAL_FIELDS:
+            self.codes[name] = np.append(self.codes[name], np.int32(0))
+        self.graduation_year = np.append(self.graduation_year, np.nan)
+        self.helpfulness = np.append(self.helpfulness, 0.0)
+        self.response_rate = np.append(self.response_rate, 0.0)
+        self.eligible = np.append(self.eligible, False)
+        if self._stale_tags is not None:
+            self._stale_tags = np.append(self._stale_tags, False)
+        for weights, base in self._base.items():
+            self._base[weights] = np.append(base, -np.inf)
+        return i
+
+    def _retag(self, i: int, tags: tuple) -> None:
+        """Move row i's tags out of the compressed columns"""
+        for tag in self.tags[i]:
+            extra = self._extra_tags.get(self.tag_vocab[tag])
+            if extra is not None:
+                extra.discard(i)
+        if self._stale_tags is None:
+            self._stale_tags = np.zeros(len(self.ids), dtype=bool)
+        if not self._stale_tags[i]:
+            self._stale_tags[i] = True
+            self.outdated += 1
+        for tag in tags:
+            self._extra_tags.setdefault(self.tag_vocab.setdefault(tag, len(self.tag_vocab)), set()).add(i)
+        self.tags[i] = tags
+
+    def _rescore(self, i: int) -> None:
+        """Refresh row i in the cached base scores"""
+        for weights, base in self._base.items():
+            if self.eligible[i]:
+                base[i] = weights.helpfulness / 5.0 * self.helpfulness[i] + weights.response_rate * self.response_rate[i]
+            else:
+                base[i] = -np.inf
+
+    def _preference(self, name: str, terms: Iterable[str], weight: float) -> np.ndarray:
+        """Per-code weights: `weight` for the student's terms, 0 elsewhere (incl. code 0)"""
+        vector = np.zeros(len(self.vocab[name]) + 1, dtype=np.float64)
+        for term in terms:
+            code = self.vocab[name].get(term)
+            if code is not None:
+                vector[code] = weight
+        return vector
+
+    def _base_score(self, weights: MatchWeights) -> np.ndarray:
+        """Quality signals, and -inf for ineligible alumni; independent of the student"""
+        base = self._base.get(weights)
+        if base is None:
+            base = weights.helpfulness / 5.0 * self.helpfulness + weights.response_rate * self.response_rate
+            base[~self.eligible] = -np.inf
+            self._base[weights] = base
+        return base
+
+    def score(self, query: StudentQuery, weights: MatchWeights) -> np.ndarray:
+        """Match score of every alumni for `query` (ineligible alumni get -inf)"""
+        scores = self._base_score(weights).copy()
+
+        for name, terms, weight in (
+            ("industry", query.industries, weights.industry),
+            ("role", query.roles, weights.role),
+            ("location", query.locations, weights.location),
+            ("company", query.companies, weights.company),
+            ("major", query.majors, weights.major),
+        ):
+            if terms:
+                scores += self._preference(name, terms, weight)[self.codes[name]]
+
+        # Each tag column lists distinct rows, so fancy-index += is safe
+        compressed = len(self.tag_indptr) - 1
+        for tag in set(query.tags):
+            column = self.tag_vocab.get(tag)
+            if column is None:
+                continue
+            if column < compressed:
+                rows = self.tag_rows[self.tag_indptr[column]:self.tag_indptr[column + 1]]
+                if self._stale_tags is not None:
+                    rows = rows[~self._stale_tags[rows]]
+                scores[rows] += weights.shared_term
+            extra = self._extra_tags.get(column)
+            if extra:
+                scores[np.fromiter(extra, dtype=np.int64, count=len(extra))] += weights.shared_term
+
+        if query.graduation_year is not None and weights.graduation_year:
+            proximity = np.clip(1.0 - np.abs(self.graduation_year - query.graduation_year) / 10.0, 0.0, 1.0)
+            scores += weights.graduation_year * np.nan_to_num(proximity, nan=0.0)
+
+        return scores
+
+    def top_k(self, query: StudentQuery, k: int, weights: MatchWeights, exclude: Iterable[uuid.UUID] = ()) -> List[MatchResult]:
+        scores = self.score(query, weights)
+        excluded = [self._slots[alumni_id] for alumni_id in set(exclude) if alumni_id in self._slots]
+        if excluded:
+            scores[excluded] = -np.inf
+        k = min(k, int(np.count_nonzero(np.isfinite(scores))))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [MatchResult(alumni_id=self.ids[i], score=float(scores[i])) for i in top]
+
+
+class MatchScorer:
+    """Per-university feature arrays, patched in place for changed alumni"""
+
+    def __init__(self, weights: MatchWeights = MatchWeights()):
+        self.weights = weights
+        self._rows: Dict[uuid.UUID, Dict[uuid.UUID, AlumniFeatureRow]] = {}
+        self._features: Dict[uuid.UUID, AlumniFeatures] = {}
+        self._university_of: Dict[uuid.UUID, uuid.UUID] = {}
+        self._dirty: Set[uuid.UUID] = set()
+
+    def load(self, university_id: uuid.UUID, rows: Iterable[AlumniFeatureRow]) -> AlumniFeatures:
+        """Replace a university's rows and build its arrays"""
+        by_id = {row.id: row for row in rows}
+        for alumni_id in by_id:
+            self._university_of[alumni_id] = university_id
+        self._rows[university_id] = by_id
+        features = self._features[university_id] = AlumniFeatures.build(list(by_id.values()))
+        return features
+
+    async def load_university(self, session: AsyncSession, university_id: uuid.UUID) -> AlumniFeatures:
+        result = await session.stream_scalars(
+            scope_to_university(select(Alumni), university_id, Alumni)
+            .execution_options(yield_per=2000)
+        )
+        return self.load(university_id, [AlumniFeatureRow.from_alumni(alumni) async for alumni in result])
+
+    def mark_dirty(self, alumni_ids: Iterable[uuid.UUID]) -> None:
+        self._dirty.update(alumni_ids)
+
+    def _discard(self, university_id: uuid.UUID, alumni_id: uuid.UUID) -> None:
+        rows = self._rows.get(university_id)
+        if rows is not None:
+            rows.pop(alumni_id, None)
+        features = self._features.get(university_id)
+        if features is not None:
+            features.remove(alumni_id)
+
+    async def refresh_dirty(self, session: AsyncSession) -> int:
+        """Reload changed alumni and patch them into the loaded arrays"""
+        if not self._dirty:
+            return 0
+        ids, self._dirty = list(self._dirty), set()
+        result = await session.execute(
+            select(Alumni, User.university_id, User.status)
+            .join(User, User.id == Alumni.id)
+            .where(Alumni.id.in_(ids))
+        )
+        touched: Set[uuid.UUID] = set()
+        seen = set()
+        for alumni, university_id, user_status in result:
+            seen.add(alumni.id)
+            previous = self._university_of.get(alumni.id)
+            if previous is not None and previous != university_id:
+                self._discard(previous, alumni.id)
+                touched.add(previous)
+            rows = self._rows.get(university_id)
+            if rows is None:
+                continue  # loaded in full on first use
+            if user_status == UserStatus.ACTIVE:
+                row = rows[alumni.id] = AlumniFeatureRow.from_alumni(alumni)
+                self._university_of[alumni.id] = university_id
+                features = self._features.get(university_id)
+                if features is not None:
+                    features.upsert(row)
+            else:
+                self._discard(university_id, alumni.id)
+            touched.add(university_id)
+        for alumni_id in set(ids) - seen:
+            university_id = self._university_of.pop(alumni_id, None)
+            if university_id is not None:
+                self._discard(university_id, alumni_id)
+                touched.add(university_id)
+        for university_id in touched:
+            features = self._features.get(university_id)
+            if features is not None and features.needs_rebuild:
+                del self._features[university_id]  # rebuilt from the rows on next use
+        return len(ids)
+
+    async def features(self, session: AsyncSession, university_id: uuid.UUID) -> AlumniFeatures:
+        await self.refresh_dirty(session)
+        features = self._features.get(university_id)
+        if features is None:
+            rows = self._rows.get(university_id)
+            if rows is None:
+                return await self.load_university(session, university_id)
+            features = self._features[university_id] = AlumniFeatures.build(list(rows.values()))
+        return features
+
+    async def top_matches(
+        self,
+        session: AsyncSession,
+        student: Student,
+        university_id: uuid.UUID,
+        k: int = 20,
+        exclude: Iterable[uuid.UUID] = (),
+    ) -> List[MatchResult]:
+        """Best-matching eligible alumni for a student"""
+        features = await self.features(session, university_id)
+        return features.top_k(StudentQuery.from_student(student), k, self.weights, exclude)
+
+
+# Create singleton instance
+match_scorer = MatchScorer()
+
+alumni_changes.add_listener(match_scorer.mark_dirty)
+# Eligibility depends on remaining capacity, which changes without an ORM flush
+capacity_service.add_listener(match_scorer.mark_dirty)
@@ -0,0 +1,22 @@
+"""
+Match scoring weights
+
+Kept apart from match_scoring so modules that only need the weights (the
+shared-context materializer) do not load NumPy at import.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class MatchWeights:
+    """Contribution of each rule to the match score"""
+    major: float = 2.0
+    industry: float = 3.0
+    role: float = 2.0
+    location: float = 1.0
+    company: float = 2.5
+    shared_term: float = 1.0  # per shared hobby/interest
+    graduation_year: float = 0.5  # full weight for the same year, zero at 10+ years apart
+    helpfulness: float = 1.0  # helpfulness_score / 5
+    response_rate: float = 0.5  # response_rate in [0, 1]
@@ -0,0 +1,344 @@
+"""
+Two-tier cache of authenticated principals for get_current_user
+
+Tier 1 is an in-process LRU with a short TTL; tier 2 is Redis shared by all
+workers with a longer TTL. A hit in either tier means the authenticated path
+makes no database round trip.
+
+Entries are invalidated when a User's status, email_verified or role is
+changed through the ORM (see the session hooks at the bottom of this module)
+or by a Core UPDATE registered with `mark_principal_changed`. On commit the
+Redis entry is deleted: in a background task for async sessions, inline
+for sync sessions (scripts, imports). Other workers drop their local copy
+when its TTL expires, so the local TTL bounds cross-worker staleness as
+long as the Redis delete succeeds; if Redis is unreachable the entry can
+live until PRINCIPAL_CACHE_REDIS_TTL_SECONDS.
+
+A miss loads the row and stores it with set(). So that a load racing an
+eviction cannot write the old snapshot back, eviction also bumps a
+per-user generation (`principal:<id>:gen`) in the same transaction, and
+set() only stores when the generation lookup() read before the load is
+still current (a compare-and-set script). The local tier does the same
+with a process-wide invalidation counter.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import RedisCircuit, get_redis, get_sync_redis
+from app.models.user import User, UserRole, UserStatus
+
+# Changes to these columns affect authorization and must evict the entry
+INVALIDATING_FIELDS = ("status", "email_verified", "role")
+
+_PENDING_KEY = "principal_cache_invalidations"
+
+# KEYS: principal, generation; ARGV: principal json, ttl seconds, generation read by lookup()
+_SET_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[3] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Snapshot of the User columns needed on the authenticated path"""
+    id: uuid.UUID
+    email: str
+    role: UserRole
+    status: UserStatus
+    email_verified: bool
+    university_id: uuid.UUID
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            status=user.status,
+            email_verified=user.email_verified,
+            university_id=user.university_id,
+            created_at=user.created_at,
+        )
+
+    def to_user(self) -> User:
+        """
+        Build a transient User from the snapshot
+
+        The result is not attached to any session; load the row with
+        `db.get(User, principal.id)` before modifying it.
+        """
+        return User(
+            id=self.id,
+            email=self.email,
+            role=self.role,
+            status=self.status,
+            email_verified=self.email_verified,
+            university_id=self.university_id,
+            created_at=self.created_at,
+        )
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "id": str(self.id),
+            "email": self.email,
+            "role": self.role.value,
+            "status": self.status.value,
+            "email_verified": self.email_verified,
+            "university_id": str(self.university_id),
+            "created_at": self.created_at.isoformat(),
+        })
+
+    @classmethod
+    def from_json(cls, raw) -> "Principal":
+        data = json.loads(raw)
+        return cls(
+            id=uuid.UUID(data["id"]),
+            email=data["email"],
+            role=UserRole(data["role"]),
+            status=UserStatus(data["status"]),
+            email_verified=data["email_verified"],
+            university_id=uuid.UUID(data["university_id"]),
+            created_at=datetime.fromisoformat(data["created_at"]),
+        )
+
+
+@dataclass(frozen=True)
+class PrincipalVersion:
+    """Generations read by lookup(); set() stores only while they are current"""
+    local: int
+    redis: Optional[str]  # None: Redis was not read, so don't store there
+
+
+class PrincipalCache:
+    """In-process LRU with TTL in front of a shared Redis tier"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        local_ttl: float = 30,
+        redis_ttl: int = 300,
+        use_redis: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.use_redis = use_redis
+        self._local: "OrderedDict[uuid.UUID, Tuple[float, Principal]]" = OrderedDict()
+        self._circuit = RedisCircuit()
+        self._tasks: Set[asyncio.Task] = set()  # In-flight background evictions
+        self._set_script = None
+        self._epoch = 0  # Bumped by every local invalidation
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _redis_key(user_id: uuid.UUID) -> str:
+        return f"principal:{user_id}"
+
+    @staticmethod
+    def _generation_key(user_id: uuid.UUID) -> str:
+        return f"principal:{user_id}:gen"
+
+    def _get_local(self, user_id: uuid.UUID) -> Optional[Principal]:
+        entry = self._local.get(user_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            del self._local[user_id]
+            return None
+        self._local.move_to_end(user_id)
+        return principal
+
+    def _set_local(self, principal: Principal) -> None:
+        self._local[principal.id] = (time.monotonic() + self.local_ttl, principal)
+        self._local.move_to_end(principal.id)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def _redis_enabled(self) -> bool:
+        return self.use_redis and self._circuit.available
+
+    async def lookup(self, user_id: uuid.UUID) -> Tuple[Optional[Principal], PrincipalVersion]:
+        """
+        Look up a principal, local tier first, then Redis
+
+        On a miss, pass the returned version to set() along with the
+        principal loaded from the database.
+        """
+        epoch = self._epoch
+        principal = self._get_local(user_id)
+        if principal is not None:
+            self.local_hits += 1
+            return principal, PrincipalVersion(epoch, None)
+
+        generation = None
+        if self._redis_enabled():
+            try:
+                raw, generation = await get_redis().mget(self._redis_key(user_id), self._generation_key(user_id))
+                generation = (generation or b"").decode()
+            except Exception:
+                self._circuit.record_failure()
+                raw, generation = None, None
+            if raw is not None:
+                principal = Principal.from_json(raw)
+                if self._epoch == epoch:
+                    self._set_local(principal)
+                self.redis_hits += 1
+                return principal, PrincipalVersion(epoch, generation)
+
+        self.misses += 1
+        return None, PrincipalVersion(epoch, generation)
+
+    async def set(self, principal: Principal, version: PrincipalVersion) -> None:
+        """Store a principal in both tiers unless it was invalidated since `version` was read"""
+        if self._epoch != version.local:
+            return
+        self._set_local(principal)
+        if version.redis is None or not self._redis_enabled():
+            return
+        try:
+            if self._set_script is None:
+                self._set_script = get_redis().register_script(_SET_SCRIPT)
+            await self._set_script(
+                keys=[self._redis_key(principal.id), self._generation_key(principal.id)],
+                args=[principal.to_json(), self.redis_ttl, version.redis],
+            )
+        except Exception:
+            self._circuit.record_failure()
+
+    def invalidate_local(self, user_id: uuid.UUID) -> None:
+        """Drop a principal from this worker's local tier"""
+        self._epoch += 1
+        if self._local.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def _queue_eviction(self, pipe, user_id: uuid.UUID) -> None:
+        # The generation outlives any entry stored before the bump
+        pipe.incr(self._generation_key(user_id))
+        pipe.expire(self._generation_key(user_id), self.redis_ttl)
+        pipe.delete(self._redis_key(user_id))
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        """Drop a principal from both tiers"""
+        self.invalidate_local(user_id)
+        if self._redis_enabled():
+            try:
+                async with get_redis().pipeline(transaction=True) as pipe:
+                    self._queue_eviction(pipe, user_id)
+                    await pipe.execute()
+            except Exception:
+                self._circuit.record_failure()
+
+    def invalidate_sync(self, user_ids) -> None:
+        """Drop principals from both tiers, blocking (no event loop running)"""
+        for user_id in user_ids:
+            self.invalidate_local(user_id)
+        if not self._redis_enabled():
+            return
+        try:
+            with get_sync_redis().pipeline(transaction=True) as pipe:
+                for user_id in user_ids:
+                    self._queue_eviction(pipe, user_id)
+                pipe.execute()
+        except Exception as e:
+            self._circuit.record_failure()
+            print(f"[PRINCIPAL] Redis eviction failed, entries live until their TTL: {e}")
+
+    def invalidate_soon(self, user_ids) -> None:
+        """Drop principals from both tiers; Redis in background tasks on the running loop"""
+        loop = asyncio.get_running_loop()
+        for user_id in user_ids:
+            self.invalidate_local(user_id)
+            task = loop.create_task(self.invalidate(user_id))
+            # The loop holds only weak references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def clear(self) -> None:
+        """Empty the local tier"""
+        self._local.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for metrics"""
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "redis_errors": self._circuit.errors,
+            "local_entries": len(self._local),
+        }
+
+
+# Create singleton instance
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+    redis_ttl=settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS,
+    use_redis=settings.PRINCIPAL_CACHE_REDIS_ENABLED,
+)
+
+
+# Session hooks: evict principals whose authorization-relevant columns changed.
+# These are registered on the sync Session class, which AsyncSession also uses.
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    """Remember users flushed with changes to an invalidating column"""
+    changed: Set[uuid.UUID] = session.info.setdefault(_PENDING_KEY, set())
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        if any(state.attrs[name].history.has_changes() for name in INVALIDATING_FIELDS):
+            changed.add(obj.id)
+
+
+def mark_principal_changed(session: Session, user_id: uuid.UUID) -> None:
+    """
+    Evict `user_id` when `session` commits
+
+    For changes the flush hook cannot see: Core UPDATEs of an invalidating
+    column. Pass `async_session.sync_session` for an AsyncSession.
+    """
+    session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    """Evict changed principals once the change is durable"""
+    changed = session.info.pop(_PENDING_KEY, None)
+    if not changed:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync session outside the event loop: evict Redis before returning
+        principal_cache.invalidate_sync(changed)
+        return
+    # Async sessions commit on the event loop thread; evict Redis in the background
+    principal_cache.invalidate_soon(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session):
+    session.info.pop(_PENDING_KEY, None)
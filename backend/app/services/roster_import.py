@@ -0,0 +1,322 @@
+"""
+Bulk alumni roster import
+
+Onboards a university's alumni from a CSV or NDJSON roster without going
+through POST /auth/register once per person:
+
+- the roster is streamed and processed in chunks
+- placeholder credentials are hashed on a process pool, one chunk ahead of
+  the database writes
+- users, alumni profiles, verification tokens and outbox emails for a chunk
+  are written with batched multi-row INSERTs in a single transaction
+- a checkpoint file records the last committed roster line, so a failed
+  run resumes where it stopped; `ON CONFLICT (email) DO NOTHING` makes a
+  replayed chunk harmless
+- verification emails are queued in the outbox, never sent inline; their
+  links stay valid for TOKEN_LIFETIME (7 days), which the email states
+- Core INSERTs skip the ORM hook that keeps canonical company / role ids
+  in step (app.services.canonical_names), so rows are given
+  current_company_id / current_role_id from the canonical dictionary
+  here, loaded once per run. Names it doesn't know stay unresolved until
+  `python -m app.services.canonical_names --backfill`, as for sign-ups
+
+Multi-row INSERT ... ON CONFLICT is used rather than COPY because COPY
+cannot skip already-imported emails without a staging table.
+
+Run with:
+    python -m app.services.roster_import roster.csv --university-id <uuid>
+
+Required columns: email, graduation_year. Optional: degree, major,
+current_role, current_company, industry, location, linkedin_url.
+"""
+
+import csv
+import json
+import os
+import secrets
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from app.core.database import get_engine
+from app.core.security import pwd_context
+from app.models.canonical_entity import CanonicalEntityKind
+from app.models.alumni import Alumni, AvailabilityStatus
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.models.email_verification import EmailVerificationToken
+from app.models.user import User, UserRole, UserStatus
+from app.services.canonical_names import canonical_dictionary
+
+PROFILE_FIELDS = ("degree", "major", "current_role", "current_company", "industry", "location", "linkedin_url")
+
+# Imported alumni did not ask for the email, so their links outlive a sign-up's
+TOKEN_LIFETIME = timedelta(days=7)
+
+# A roster row is (line number, column values)
+RosterRow = Tuple[int, Dict[str, str]]
+
+
+def read_roster(path: str) -> Iterator[RosterRow]:
+    """Stream rows from a .csv or .ndjson/.jsonl roster"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    yield line_no, json.loads(line)
+        else:
+            # Line 1 is the header
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield line_no, row
+
+
+def _chunks(rows: Iterator[RosterRow], size: int) -> Iterator[List[RosterRow]]:
+    chunk: List[RosterRow] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# The placeholder secret has 256 bits of entropy and is never disclosed, so
+# bcrypt's work factor adds nothing; minimum rounds keep imports fast.
+PLACEHOLDER_BCRYPT_ROUNDS = 4
+
+
+def _placeholder_hash(_: int) -> str:
+    """Hash a random, never-disclosed secret; users set a real password later"""
+    handler = pwd_context.handler("bcrypt").using(rounds=PLACEHOLDER_BCRYPT_ROUNDS)
+    return handler.hash(secrets.token_urlsafe(32))
+
+
+@dataclass
+class ImportReport:
+    """Progress counters for an import run"""
+    processed: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"processed={self.processed} inserted={self.inserted} skipped={self.skipped} "
+            f"invalid={self.invalid} elapsed={self.elapsed:.1f}s rate={self.rows_per_second:.0f} rows/s"
+        )
+
+
+class Checkpoint:
+    """Last committed roster line, persisted next to the roster"""
+
+    def __init__(self, path: str, roster: str):
+        self.path = path
+        self.roster = os.path.abspath(roster)
+        self.line = 0
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("roster") == self.roster:
+                self.line = data.get("line", 0)
+
+    def save(self, line: int) -> None:
+        self.line = line
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"roster": self.roster, "line": line}, f)
+        os.replace(tmp, self.path)  # atomic, so a crash never leaves a torn file
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class RosterImporter:
+    """Chunked, resumable roster loader"""
+
+    def __init__(
+        self,
+        university_id: uuid.UUID,
+        engine: Optional[Engine] = None,
+        chunk_size: int = 1000,
+        hash_workers: Optional[int] = None,
+    ):
+        self.university_id = university_id
+        self.engine = engine or get_engine()
+        self.chunk_size = chunk_size
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+
+    def _insert(self, table):
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            return pg_insert(table)
+        if dialect == "sqlite":
+            return sqlite_insert(table)
+        raise RuntimeError(f"Bulk import does not support the {dialect} dialect")
+
+    @staticmethod
+    def _validate(row: Dict[str, str]) -> Optional[Tuple[str, int]]:
+        email = (row.get("email") or "").strip().lower()
+        try:
+            graduation_year = int(row.get("graduation_year") or "")
+        except ValueError:
+            return None
+        if "@" not in email:
+            return None
+        return email, graduation_year
+
+    def _write_chunk(self, chunk: List[RosterRow], hashes: List[str], report: ImportReport) -> None:
+        """Insert one chunk in a single transaction"""
+        users, profiles = [], {}
+        for (line_no, row), password_hash in zip(chunk, hashes):
+            valid = self._validate(row)
+            if valid is None:
+                report.invalid += 1
+                continue
+            email, graduation_year = valid
+            user_id = uuid.uuid4()
+            users.append({
+                "id": user_id,
+                "email": email,
+                "password_hash": password_hash,
+                "role": UserRole.ALUMNI,
+                "university_id": self.university_id,
+                "status": UserStatus.ACTIVE,
+                "email_verified": False,
+            })
+            profiles[user_id] = {
+                "id": user_id,
+                "graduation_year": graduation_year,
+                "availability_status": AvailabilityStatus.OPEN,
+                "max_requests_per_month": 5,
+                "current_month_requests": 0,
+                "helpfulness_score": 0,
+                "total_introductions": 0,
+                "response_rate": 0,
+                **{field: (row.get(field) or None) for field in PROFILE_FIELDS},
+                "current_company_id": canonical_dictionary.lookup(CanonicalEntityKind.COMPANY, row.get("current_company")),
+                "current_role_id": canonical_dictionary.lookup(CanonicalEntityKind.ROLE, row.get("current_role")),
+            }
+
+        if not users:
+            return
+
+        with self.engine.begin() as conn:
+            # Existing emails are skipped, which also makes replayed chunks idempotent
+            result = conn.execute(
+                self._insert(User.__table__)
+                .on_conflict_do_nothing(index_elements=["email"])
+                .returning(User.__table__.c.id, User.__table__.c.email),
+                users,
+            )
+            created = result.all()
+            report.skipped += len(users) - len(created)
+            if not created:
+                return
+
+            now = datetime.now(timezone.utc)
+            tokens, emails = [], []
+            for user_id, email in created:
+                token = secrets.token_urlsafe(32)
+                tokens.append({
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "token": token,
+                    "token_type": "email_verification",
+                    "expires_at": now + TOKEN_LIFETIME,
+                    "used": False,
+                })
+                emails.append({
+                    "id": uuid.uuid4(),
+                    "to_email": email,
+                    "template": "verification",
+                    "payload": {
+                        "verification_token": token,
+                        "user_name": email.split("@")[0],
+                        "expires_in_hours": int(TOKEN_LIFETIME.total_seconds() // 3600),
+                    },
+                    "status": EmailOutboxStatus.PENDING,
+                    "attempts": 0,
+                    "next_attempt_at": now,
+                })
+
+            conn.execute(Alumni.__table__.insert(), [profiles[user_id] for user_id, _ in created])
+            conn.execute(EmailVerificationToken.__table__.insert(), tokens)
+            conn.execute(EmailOutbox.__table__.insert(), emails)
+            report.inserted += len(created)
+
+    def run(self, path: str, checkpoint: Optional[Checkpoint] = None, progress_every: int = 10) -> ImportReport:
+        """Import a roster file, resuming after `checkpoint.line` if given"""
+        report = ImportReport()
+        resume_after = checkpoint.line if checkpoint else 0
+        rows = (row for row in read_roster(path) if row[0] > resume_after)
+        started = time.perf_counter()
+        if not canonical_dictionary.loaded:
+            with self.engine.connect() as conn:
+                canonical_dictionary.load_sync(conn)
+
+        with ProcessPoolExecutor(max_workers=self.hash_workers) as pool:
+            def submit(chunk: List[RosterRow]) -> Iterator[str]:
+                # map() submits every task immediately; chunksize amortizes IPC overhead
+                chunksize = max(1, len(chunk) // (self.hash_workers * 4))
+                return pool.map(_placeholder_hash, range(len(chunk)), chunksize=chunksize)
+
+            chunks = _chunks(rows, self.chunk_size)
+            current = next(chunks, None)
+            pending = submit(current) if current else None
+            chunk_no = 0
+            while current is not None:
+                # Start hashing the next chunk while this one is written
+                following = next(chunks, None)
+                hashes = list(pending)
+                pending = submit(following) if following else None
+
+                self._write_chunk(current, hashes, report)
+                report.processed += len(current)
+                if checkpoint:
+                    checkpoint.save(current[-1][0])
+
+                chunk_no += 1
+                if chunk_no % progress_every == 0:
+                    report.elapsed = time.perf_counter() - started
+                    print(f"[IMPORT] {report}")
+                current = following
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk import an alumni roster (CSV or NDJSON)")
+    parser.add_argument("roster", help="Path to a .csv or .ndjson roster")
+    parser.add_argument("--university-id", required=True, type=uuid.UUID)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--hash-workers", type=int, default=None, help="Default: one per CPU core")
+    parser.add_argument("--checkpoint", default=None, help="Default: <roster>.checkpoint")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    checkpoint = Checkpoint(args.checkpoint or f"{args.roster}.checkpoint", args.roster)
+    if args.restart:
+        checkpoint.line = 0
+    if checkpoint.line:
+        print(f"[IMPORT] Resuming after roster line {checkpoint.line}")
+
+    importer = RosterImporter(args.university_id, chunk_size=args.chunk_size, hash_workers=args.hash_workers)
+    final = importer.run(args.roster, checkpoint)
+    print(f"[IMPORT] Done: {final}")
+    checkpoint.clear()
@@ -0,0 +1,686 @@
+"""
+Incremental helpfulness and reputation scores
+
+Alumni helpfulness_score / response_rate / avg_response_time_hours /
+total_introductions and student reputation_score / total_requests /
+successful_introductions are derived from request and outcome events.
+Instead of re-aggregating all requests and outcomes, handlers record each
+event in their own transaction (`record_score_event`, `record_response`,
+`record_outcome`) and the ScoreAggregator applies them as deltas:
+
+1. claim a batch of unapplied events in id order (FOR UPDATE SKIP LOCKED)
+2. add each event's contribution to the running sums of its alumni and
+   student (alumni_score_sums / student_score_sums, locked FOR UPDATE);
+   response times go into a per-alumni QuantileSketch
+3. recompute the touched profiles' scores from their sums, write the ones
+   that changed, and mark the events applied in the same transaction
+
+The cost of an update is proportional to the batch, not to the history.
+Every SCORE_RECONCILE_HOURS, `reconcile` recomputes all sums from the
+event log with one GROUP BY per side and reports (or, with repair, fixes)
+profiles whose running sums or score columns drifted.
+
+Run standalone with:
+    python -m app.services.score_aggregation               # poll forever
+    python -m app.services.score_aggregation --once        # apply pending events and exit
+    python -m app.services.score_aggregation --reconcile [--repair]
+"""
+
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, case, exists, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.quantile_sketch import QuantileSketch
+from app.models.alumni import Alumni
+from app.models.alumni_score_sums import AlumniScoreSums
+from app.models.score_event import ScoreEvent, ScoreEventKind
+from app.models.student import Student
+from app.models.student_score_sums import StudentScoreSums
+from app.services.alumni_changes import alumni_changes
+
+# Outcome types (DATA_MODEL.md) that make an introduction successful
+POSITIVE_OUTCOMES = frozenset({"conversation_occurred", "referral_made", "follow_up_scheduled"})
+
+RESPONSE_KINDS = (ScoreEventKind.REQUEST_APPROVED, ScoreEventKind.REQUEST_DECLINED)
+
+PRIOR_WEIGHT = 5.0  # Pseudo-observations pulling rates of new profiles toward 0.5
+SPEED_HALF_HOURS = 24.0  # A p90 response time of this many hours scores 0.5 on speed
+
+ALUMNI_SCORE_COLUMNS = ("helpfulness_score", "response_rate", "avg_response_time_hours", "total_introductions")
+STUDENT_SCORE_COLUMNS = ("reputation_score", "total_requests", "successful_introductions")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class SumRule:
+    """
+    How events feed one running-sum column
+
+    An event of one of `kinds` (recorded by `recorded_by`, if set) adds
+    its `value` attribute, or 1 when `value` is None. Events where the
+    `requires` / `value` attribute is NULL add nothing. The same rule
+    drives the incremental update and the SQL recompute.
+    """
+    column: str
+    kinds: Tuple[ScoreEventKind, ...]
+    recorded_by: Optional[str] = None
+    value: Optional[str] = None
+    requires: Optional[str] = None
+
+    def contribution(self, event: ScoreEvent) -> float:
+        if event.kind not in self.kinds:
+            return 0
+        if self.recorded_by is not None and event.recorded_by != self.recorded_by:
+            return 0
+        needed = self.value or self.requires
+        if needed is not None and getattr(event, needed) is None:
+            return 0
+        return getattr(event, self.value) if self.value else 1
+
+    def sql(self):
+        condition = ScoreEvent.kind.in_(self.kinds)
+        if self.recorded_by is not None:
+            condition &= ScoreEvent.recorded_by == self.recorded_by
+        needed = self.value or self.requires
+        if needed is not None:
+            condition &= getattr(ScoreEvent, needed).isnot(None)
+        amount = getattr(ScoreEvent, self.value) if self.value else 1
+        return func.coalesce(func.sum(case((condition, amount), else_=0)), 0).label(self.column)
+
+
+K = ScoreEventKind
+
+ALUMNI_RULES = (
+    SumRule("requests_received", (K.REQUEST_SENT,)),
+    SumRule("approvals", (K.REQUEST_APPROVED,)),
+    SumRule("declines", (K.REQUEST_DECLINED,)),
+    SumRule("expirations", (K.REQUEST_EXPIRED,)),
+    SumRule("response_hours_sum", RESPONSE_KINDS, value="response_hours"),
+    SumRule("introductions", (K.INTRODUCTION_MADE,)),
+    SumRule("successful_introductions", (K.INTRODUCTION_SUCCEEDED,)),
+    SumRule("satisfaction_sum", (K.OUTCOME_RECORDED,), recorded_by="student", value="satisfaction"),
+    SumRule("satisfaction_count", (K.OUTCOME_RECORDED,), recorded_by="student", requires="satisfaction"),
+)
+
+STUDENT_RULES = (
+    SumRule("requests_sent", (K.REQUEST_SENT,)),
+    SumRule("approvals", (K.REQUEST_APPROVED,)),
+    SumRule("declines", (K.REQUEST_DECLINED,)),
+    SumRule("expirations", (K.REQUEST_EXPIRED,)),
+    SumRule("introductions", (K.INTRODUCTION_MADE,)),
+    SumRule("successful_introductions", (K.INTRODUCTION_SUCCEEDED,)),
+    SumRule("outcomes_recorded", (K.OUTCOME_RECORDED,), recorded_by="student"),
+    SumRule("satisfaction_sum", (K.OUTCOME_RECORDED,), recorded_by="alumni", value="satisfaction"),
+    SumRule("satisfaction_count", (K.OUTCOME_RECORDED,), recorded_by="alumni", requires="satisfaction"),
+)
+
+# Response times held by the sketch, for comparing its count in reconcile
+_SKETCHED = SumRule("sketched_responses", RESPONSE_KINDS, requires="response_hours")
+
+
+def _smoothed(hits: float, total: float, prior: float = 0.5) -> float:
+    return (hits + prior * PRIOR_WEIGHT) / (total + PRIOR_WEIGHT)
+
+
+def _satisfaction(total: int, count: int) -> float:
+    """Mean 1-5 rating mapped to [0, 1], smoothed"""
+    return _smoothed((total - count) / 4.0, count)
+
+
+def alumni_scores(sums, sketch: Optional[QuantileSketch] = None) -> Dict[str, object]:
+    """
+    Alumni score columns from running sums (ARCHITECTURE.md, "Alumni
+    Helpfulness Score"): responsiveness, response time (p90 from the
+    sketch), introductions that led to a positive outcome, and student
+    satisfaction, combined on a 0-5 scale.
+    """
+    responses = sums.approvals + sums.declines
+    decided = responses + sums.expirations
+    if sketch is None:
+        sketch = QuantileSketch.from_dict(sums.response_time_sketch)
+    p90 = sketch.quantile(0.9)
+    speed = 0.5 if p90 is None else SPEED_HALF_HOURS / (SPEED_HALF_HOURS + p90)
+    helpfulness = (
+        0.35 * _smoothed(responses, decided)
+        + 0.15 * speed
+        + 0.30 * _smoothed(sums.successful_introductions, sums.introductions)
+        + 0.20 * _satisfaction(sums.satisfaction_sum, sums.satisfaction_count)
+    )
+    return {
+        "helpfulness_score": round(5 * helpfulness, 2),
+        "response_rate": round(sums.approvals / decided, 2) if decided else 0.0,
+        "avg_response_time_hours": round(sums.response_hours_sum / responses, 2) if responses else None,
+        "total_introductions": sums.introductions,
+    }
+
+
+def student_scores(sums) -> Dict[str, object]:
+    """
+    Student score columns from running sums (ARCHITECTURE.md, "Student
+    Reputation Score"): approval of their requests, follow-through to a
+    positive outcome, outcome recording and alumni satisfaction, on a 0-5
+    scale.
+    """
+    decided = sums.approvals + sums.declines + sums.expirations
+    reputation = (
+        0.40 * _smoothed(sums.approvals, decided)
+        + 0.25 * _smoothed(sums.successful_introductions, sums.introductions)
+        + 0.15 * _smoothed(sums.outcomes_recorded, sums.introductions)
+        + 0.20 * _satisfaction(sums.satisfaction_sum, sums.satisfaction_count)
+    )
+    return {
+        "reputation_score": round(5 * reputation, 2),
+        "total_requests": sums.requests_sent,
+        "successful_introductions": sums.successful_introductions,
+    }
+
+
+def response_time_quantiles(sums, quantiles: Iterable[float] = (0.5, 0.9)) -> Dict[float, Optional[float]]:
+    """Approximate response-time quantiles (hours) of one alumni"""
+    sketch = QuantileSketch.from_dict(sums.response_time_sketch)
+    return {q: sketch.quantile(q) for q in quantiles}
+
+
+# Recording (called by request / introduction / outcome handlers)
+
+async def record_score_event(
+    session: AsyncSession,
+    kind: ScoreEventKind,
+    student_id: uuid.UUID,
+    alumni_id: uuid.UUID,
+    source_id: Optional[uuid.UUID] = None,
+    **data,
+) -> None:
+    """
+    Log a scoring event in the caller's transaction (does not commit)
+
+    Recording the same (kind, source_id) twice is a no-op, so retries and
+    duplicate outcome reports cannot count twice.
+    """
+    values = {"kind": kind, "student_id": student_id, "alumni_id": alumni_id, "source_id": source_id, **data}
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql_insert(ScoreEvent).values(**values).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        statement = sqlite_insert(ScoreEvent).values(**values).on_conflict_do_nothing()
+    else:
+        statement = insert(ScoreEvent).values(**values)
+    await session.execute(statement)
+
+
+async def record_response(
+    session: AsyncSession,
+    request_id: uuid.UUID,
+    student_id: uuid.UUID,
+    alumni_id: uuid.UUID,
+    approved: bool,
+    requested_at: datetime,
+    responded_at: Optional[datetime] = None,
+) -> None:
+    """An alumni approved or declined a request"""
+    hours = ((responded_at or _utcnow()) - requested_at).total_seconds() / 3600.0
+    await record_score_event(
+        session,
+        ScoreEventKind.REQUEST_APPROVED if approved else ScoreEventKind.REQUEST_DECLINED,
+        student_id, alumni_id, request_id,
+        response_hours=max(0.0, hours),
+    )
+
+
+async def record_outcome(
+    session: AsyncSession,
+    outcome_id: uuid.UUID,
+    introduction_id: uuid.UUID,
+    student_id: uuid.UUID,
+    alumni_id: uuid.UUID,
+    outcome_type,
+    recorded_by,
+    satisfaction: Optional[int] = None,
+) -> None:
+    """An outcome was recorded; the first positive one makes the introduction successful"""
+    recorded_by = getattr(recorded_by, "value", recorded_by)
+    await record_score_event(
+        session, ScoreEventKind.OUTCOME_RECORDED, student_id, alumni_id, outcome_id,
+        recorded_by=recorded_by, satisfaction=satisfaction,
+    )
+    if getattr(outcome_type, "value", outcome_type) in POSITIVE_OUTCOMES:
+        await record_score_event(
+            session, ScoreEventKind.INTRODUCTION_SUCCEEDED, student_id, alumni_id, introduction_id,
+        )
+
+
+# Aggregation
+
+@dataclass
+class ReconcileReport:
+    alumni_checked: int = 0
+    students_checked: int = 0
+    sums_drift: int = 0  # Profiles whose running sums disagree with the event log
+    score_drift: int = 0  # Profiles whose score columns disagree with their sums
+    repaired: int = 0
+    examples: List[str] = field(default_factory=list)
+
+    @property
+    def drifted(self) -> int:
+        return self.sums_drift + self.score_drift
+
+    def note(self, kind: str, subject_id: uuid.UUID, what: str) -> None:
+        if len(self.examples) < 10:
+            self.examples.append(f"{kind} {subject_id}: {what}")
+
+
+def _close(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return abs(float(a) - float(b)) <= 1e-6 * max(1.0, abs(float(a)), abs(float(b)))
+
+
+def _differs(scores: Dict[str, object], row, prefix: str = "") -> Optional[str]:
+    """First score column whose stored value (row.<prefix><column>) differs from `scores`"""
+    for column, value in scores.items():
+        stored = getattr(row, prefix + column)
+        if not (_close(stored, value) if isinstance(value, float) or value is None else stored == value):
+            return column
+    return None
+
+
+def _mark_rankings_dirty(alumni_ids: List[uuid.UUID]) -> None:
+    """
+    Discovery and match ranking read helpfulness_score / response_rate
+
+    Score writes keep updated_at, so tell the in-memory indexes directly
+    (whichever have registered with the change feed).
+    """
+    alumni_changes.notify(alumni_ids)
+
+
+class _Side:
+    """Everything that differs between the alumni and the student side"""
+
+    def __init__(self, name, profile, sums_model, key, event_key, rules, scores, score_columns):
+        self.name = name
+        self.profile = profile
+        self.sums_model = sums_model
+        self.key = key
+        self.event_key = event_key
+        self.rules = rules
+        self.scores = scores
+        self.columns = [getattr(profile, column) for column in score_columns]
+        self.table = sums_model.__table__
+        # Columns the aggregator maintains
+        self.stored = [rule.column for rule in rules] + (["response_time_sketch"] if name == "alumni" else []) + ["last_event_id"]
+
+    def empty(self, subject_id: uuid.UUID) -> SimpleNamespace:
+        sums = SimpleNamespace(**{self.key.key: subject_id}, **{column: None for column in self.stored})
+        for rule in self.rules:
+            setattr(sums, rule.column, 0)
+        return sums
+
+    def recompute(self, ids: Optional[List[uuid.UUID]] = None):
+        """Set-based sums over applied events, one row per subject"""
+        rules = self.rules + ((_SKETCHED,) if self.name == "alumni" else ())
+        query = (
+            select(self.event_key.label("subject_id"), *(rule.sql() for rule in rules))
+            .where(ScoreEvent.applied_at.isnot(None))
+            .group_by(self.event_key)
+        )
+        if ids is not None:
+            query = query.where(self.event_key.in_(ids))
+        return query
+
+
+class ScoreAggregator:
+    """Applies score events to running sums and profile scores"""
+
+    def __init__(
+        self,
+        batch_size: int = 1000,
+        poll_interval: float = 10.0,
+        reconcile_interval: float = 6 * 3600.0,
+        repair_drift: bool = False,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.reconcile_interval = reconcile_interval
+        self.repair_drift = repair_drift
+        self.session_factory = session_factory
+        self.alumni = _Side(
+            "alumni", Alumni, AlumniScoreSums, AlumniScoreSums.alumni_id, ScoreEvent.alumni_id,
+            ALUMNI_RULES, alumni_scores, ALUMNI_SCORE_COLUMNS,
+        )
+        self.students = _Side(
+            "student", Student, StudentScoreSums, StudentScoreSums.student_id, ScoreEvent.student_id,
+            STUDENT_RULES, student_scores, STUDENT_SCORE_COLUMNS,
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._last_reconcile = time.monotonic()
+        self.events_applied = 0
+        self.scores_written = 0
+        self.reconciles = 0
+        self.drifted = 0
+        self.errors = 0
+
+    async def _lock_sums(
+        self, session: AsyncSession, side: _Side, ids: Set[uuid.UUID],
+    ) -> Tuple[Dict[uuid.UUID, SimpleNamespace], Set[uuid.UUID]]:
+        """Running sums of `ids`, locked in key order, and the ids that have a row; missing ones start at zero"""
+        key = side.table.c[side.key.key]
+        result = await session.execute(
+            select(key, *(side.table.c[column] for column in side.stored))
+            .where(key.in_(ids))
+            .order_by(key)
+            .with_for_update()
+        )
+        sums = {row[0]: SimpleNamespace(**row._mapping) for row in result}
+        existing = set(sums)
+        for subject_id in ids - existing:
+            sums[subject_id] = side.empty(subject_id)
+        return sums, existing
+
+    async def _save_sums(self, session: AsyncSession, side: _Side, sums: Dict[uuid.UUID, SimpleNamespace], existing: Set[uuid.UUID]) -> None:
+        """Write sums back with one executemany per statement (rows in `existing` are updated)"""
+        table, key = side.table, side.key.key
+        inserts = [
+            {key: subject_id, **{column: getattr(row, column) for column in side.stored}}
+            for subject_id, row in sums.items() if subject_id not in existing
+        ]
+        updates = [
+            {"subject_id": subject_id, **{f"new_{column}": getattr(row, column) for column in side.stored}}
+            for subject_id, row in sums.items() if subject_id in existing
+        ]
+        if inserts:
+            # Two workers creating the same row collide on the primary key; the
+            # batch rolls back and its events are claimed again on the next poll
+            await session.execute(insert(table), inserts)
+        if updates:
+            await session.execute(
+                update(table)
+                .where(table.c[key] == bindparam("subject_id"))
+                .values(**{column: bindparam(f"new_{column}") for column in side.stored}),
+                updates,
+            )
+
+    async def _write_scores(
+        self,
+        session: AsyncSession,
+        side: _Side,
+        sums: Dict[uuid.UUID, object],
+        sketches: Optional[Dict[uuid.UUID, QuantileSketch]] = None,
+    ) -> List[uuid.UUID]:
+        """Write changed score columns; returns the profiles that changed"""
+        if not sums:
+            return []
+        current = {
+            row.id: row
+            for row in await session.execute(select(side.profile.id, *side.columns).where(side.profile.id.in_(list(sums))))
+        }
+        rows = []
+        for subject_id, subject_sums in sums.items():
+            stored = current.get(subject_id)
+            if stored is None:
+                continue  # Profile deleted; its events cascade away
+            scores = side.scores(subject_sums, sketches[subject_id]) if sketches and subject_id in sketches \
+                else side.scores(subject_sums)
+            if _differs(scores, stored) is not None:
+                rows.append({"subject_id": subject_id, **{f"new_{k}": v for k, v in scores.items()}})
+        if rows:
+            table = side.profile.__table__
+            await session.execute(
+                update(table)
+                .where(table.c.id == bindparam("subject_id"))
+                # Scores are not profile edits: keep updated_at for the materializers
+                .values(updated_at=table.c.updated_at, **{c.key: bindparam(f"new_{c.key}") for c in side.columns}),
+                rows,
+            )
+            self.scores_written += len(rows)
+        return [row["subject_id"] for row in rows]
+
+    async def apply_once(self) -> int:
+        """Apply one batch of pending events; returns the number applied"""
+        async with self.session_factory() as session:
+            events = list((await session.execute(
+                select(ScoreEvent)
+                .where(ScoreEvent.applied_at.is_(None))
+                .order_by(ScoreEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).scalars())
+            if not events:
+                return 0
+
+            alumni_sums, alumni_existing = await self._lock_sums(session, self.alumni, {e.alumni_id for e in events})
+            student_sums, student_existing = await self._lock_sums(session, self.students, {e.student_id for e in events})
+            response_hours: Dict[uuid.UUID, List[float]] = defaultdict(list)
+            for event in events:
+                for side, sums, subject_id in (
+                    (self.alumni, alumni_sums, event.alumni_id),
+                    (self.students, student_sums, event.student_id),
+                ):
+                    row = sums[subject_id]
+                    for rule in side.rules:
+                        amount = rule.contribution(event)
+                        if amount:
+                            setattr(row, rule.column, getattr(row, rule.column) + amount)
+                    row.last_event_id = max(row.last_event_id or 0, event.id)
+                if event.kind in RESPONSE_KINDS and event.response_hours is not None:
+                    response_hours[event.alumni_id].append(event.response_hours)
+
+            sketches: Dict[uuid.UUID, QuantileSketch] = {}
+            for alumni_id, row in alumni_sums.items():
+                sketch = QuantileSketch.from_dict(row.response_time_sketch)
+                if alumni_id in response_hours:
+                    for hours in response_hours[alumni_id]:
+                        sketch.add(max(0.0, hours))
+                    row.response_time_sketch = sketch.to_dict()
+                sketches[alumni_id] = sketch
+            await self._save_sums(session, self.alumni, alumni_sums, alumni_existing)
+            await self._save_sums(session, self.students, student_sums, student_existing)
+
+            changed_alumni = await self._write_scores(session, self.alumni, alumni_sums, sketches)
+            await self._write_scores(session, self.students, student_sums)
+            await session.execute(
+                update(ScoreEvent)
+                .where(ScoreEvent.id.in_([event.id for event in events]))
+                .values(applied_at=_utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+        if changed_alumni:
+            _mark_rankings_dirty(changed_alumni)
+        self.events_applied += len(events)
+        return len(events)
+
+    async def apply_pending(self) -> int:
+        """Apply batches until nothing is pending; returns events applied"""
+        total = 0
+        while True:
+            applied = await self.apply_once()
+            total += applied
+            if applied < self.batch_size:
+                return total
+
+    async def _check(self, session: AsyncSession, side: _Side, report: ReconcileReport) -> Tuple[Set[uuid.UUID], Set[uuid.UUID]]:
+        """Compare sums with the event log and scores with the sums (one statement each)"""
+        recomputed = side.recompute().subquery()
+        drifted_sums: Set[uuid.UUID] = set()
+        drifted_scores: Set[uuid.UUID] = set()
+
+        # Sums, their profile's score columns and the recomputed sums in one snapshot
+        result = await session.stream(
+            select(side.sums_model, *(c.label(f"stored_{c.key}") for c in side.columns), *(recomputed.c[rule.column] for rule in side.rules),
+                   *((recomputed.c.sketched_responses,) if side.name == "alumni" else ()))
+            .join(side.profile, side.profile.id == side.key)
+            .outerjoin(recomputed, recomputed.c.subject_id == side.key)
+            .execution_options(yield_per=2000)
+        )
+        checked = 0
+        async for row in result:
+            checked += 1
+            sums = row[0]
+            subject_id = getattr(sums, side.key.key)
+            expected = row._mapping
+            for rule in side.rules:
+                if not _close(getattr(sums, rule.column), expected[recomputed.c[rule.column]] or 0):
+                    drifted_sums.add(subject_id)
+                    report.note(side.name, subject_id, f"{rule.column} {getattr(sums, rule.column)} != {expected[recomputed.c[rule.column]] or 0}")
+                    break
+            else:
+                if side.name == "alumni":
+                    sketched = QuantileSketch.from_dict(sums.response_time_sketch).count
+                    if sketched != (expected[recomputed.c.sketched_responses] or 0):
+                        drifted_sums.add(subject_id)
+                        report.note(side.name, subject_id, f"sketch holds {sketched} response times")
+                        continue
+                column = _differs(side.scores(sums), row, prefix="stored_")
+                if column is not None:
+                    drifted_scores.add(subject_id)
+                    report.note(side.name, subject_id, f"{column} {getattr(row, 'stored_' + column)} is stale")
+
+        # Subjects with applied events but no running sums
+        missing = await session.execute(
+            select(recomputed.c.subject_id).where(~exists().where(side.key == recomputed.c.subject_id))
+        )
+        for (subject_id,) in missing:
+            drifted_sums.add(subject_id)
+            report.note(side.name, subject_id, "running sums missing")
+
+        if side.name == "alumni":
+            report.alumni_checked = checked
+        else:
+            report.students_checked = checked
+        report.sums_drift += len(drifted_sums)
+        report.score_drift += len(drifted_scores)
+        return drifted_sums, drifted_scores
+
+    async def _repair(self, session: AsyncSession, side: _Side, drifted_sums: Set[uuid.UUID], drifted_scores: Set[uuid.UUID]) -> List[uuid.UUID]:
+        """Overwrite drifted sums from the event log and rewrite stale scores"""
+        sums, existing = await self._lock_sums(session, side, drifted_sums | drifted_scores)
+        if drifted_sums:
+            ids = list(drifted_sums)
+            expected = {row.subject_id: row for row in await session.execute(side.recompute(ids))}
+            for subject_id in ids:
+                row = expected.get(subject_id)
+                for rule in side.rules:
+                    setattr(sums[subject_id], rule.column, getattr(row, rule.column) if row else 0)
+            if side.name == "alumni":
+                sketches = {subject_id: QuantileSketch() for subject_id in ids}
+                result = await session.execute(
+                    select(ScoreEvent.alumni_id, ScoreEvent.response_hours).where(
+                        ScoreEvent.applied_at.isnot(None),
+                        ScoreEvent.kind.in_(RESPONSE_KINDS),
+                        ScoreEvent.response_hours.isnot(None),
+                        ScoreEvent.alumni_id.in_(ids),
+                    )
+                )
+                for alumni_id, hours in result:
+                    sketches[alumni_id].add(max(0.0, hours))
+                for subject_id, sketch in sketches.items():
+                    sums[subject_id].response_time_sketch = sketch.to_dict()
+            await self._save_sums(session, side, {subject_id: sums[subject_id] for subject_id in ids}, existing)
+        return await self._write_scores(session, side, sums)
+
+    async def reconcile(self, repair: bool = False) -> ReconcileReport:
+        """
+        Recompute all running sums from the event log and compare
+
+        Drift means an event was applied twice or not at all, or a sums
+        row or score column was edited by hand. With `repair`, drifted
+        sums are overwritten from the log and their scores rewritten.
+        """
+        report = ReconcileReport()
+        changed_alumni: List[uuid.UUID] = []
+        async with self.session_factory() as session:
+            for side in (self.alumni, self.students):
+                drifted_sums, drifted_scores = await self._check(session, side, report)
+                if repair and (drifted_sums or drifted_scores):
+                    changed = await self._repair(session, side, drifted_sums, drifted_scores)
+                    report.repaired += len(drifted_sums | drifted_scores)
+                    if side is self.alumni:
+                        changed_alumni = changed
+            await session.commit()
+        if changed_alumni:
+            _mark_rankings_dirty(changed_alumni)
+        self.reconciles += 1
+        self.drifted += report.drifted
+        return report
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.apply_pending()
+                if time.monotonic() - self._last_reconcile >= self.reconcile_interval:
+                    self._last_reconcile = time.monotonic()
+                    report = await self.reconcile(repair=self.repair_drift)
+                    if report.drifted:
+                        print(f"[SCORES] Reconcile found drift: {report}")
+            except Exception as e:
+                self.errors += 1
+                print(f"[SCORES] Aggregation failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Start polling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "events_applied": self.events_applied,
+            "scores_written": self.scores_written,
+            "reconciles": self.reconciles,
+            "drifted": self.drifted,
+            "errors": self.errors,
+        }
+
+
+# Create singleton instance
+score_aggregator = ScoreAggregator(
+    batch_size=settings.SCORE_BATCH_SIZE,
+    poll_interval=settings.SCORE_POLL_SECONDS,
+    reconcile_interval=settings.SCORE_RECONCILE_HOURS * 3600.0,
+    repair_drift=settings.SCORE_RECONCILE_REPAIR,
+)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply score events to helpfulness and reputation scores")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--once", action="store_true", help="Apply pending events and exit")
+    group.add_argument("--reconcile", action="store_true", help="Compare running sums with the event log and exit")
+    parser.add_argument("--repair", action="store_true", help="With --reconcile: fix drifted sums and scores")
+    args = parser.parse_args()
+
+    if args.reconcile:
+        print(f"[SCORES] {asyncio.run(score_aggregator.reconcile(repair=args.repair))}")
+    elif args.once:
+        print(f"[SCORES] Applied {asyncio.run(score_aggregator.apply_pending())} events")
+    else:
+        asyncio.run(score_aggregator.run_forever())
@@ -0,0 +1,525 @@
+"""
+Shared-context materializer
+
+Discover results carry a `shared_context` list (same_major,
+same_company_interest, shared_interest, ...). Rather than intersecting the
+student's JSONB profile with every candidate's on each request, this job
+keeps the `shared_contexts` table up to date and discover reads it with a
+single indexed query (`shared_context_for`).
+
+Incremental refresh follows `students.updated_at` and `alumni.updated_at`
+with one watermark per source table:
+
+1. page through profiles with updated_at past the watermark, oldest first
+2. for each page, load the changed profiles and, per university, only the
+   partners sharing one of their terms: every profile stores its
+   normalized "<field>:<term>" keys in `match_terms` (GIN indexed), so
+   partners are a `match_terms ?| keys` lookup instead of a load of the
+   whole university. Pairs involving a changed student or alumni are
+   rebuilt through term -> profile maps instead of comparing every pair
+3. replace those pairs' rows, write the changed profiles' match_terms and
+   advance the watermark in one transaction
+
+The watermark never moves closer than SHARED_CONTEXT_SAFETY_LAG_SECONDS to
+the current time, so a transaction that commits an older updated_at a
+little late is still picked up (recent rows are simply recomputed again).
+
+match_terms are written by this job only, keeping updated_at. Profiles
+without them (created before the column, or not processed yet) match
+every lookup until a lookup loads them and writes theirs.
+
+Run standalone with:
+    python -m app.services.shared_context --once      # catch up and exit
+    python -m app.services.shared_context --rebuild   # reprocess everything
+"""
+
+import asyncio
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.alumni import Alumni
+from app.models.canonical_entity import CanonicalEntityKind
+from app.models.materialization_watermark import MaterializationWatermark
+from app.models.shared_context import SharedContext, SharedContextType
+from app.models.student import Student
+from app.models.user import User
+from app.services.canonical_names import canonical_dictionary
+from app.services.discovery_index import normalize_term
+from app.services.match_weights import MatchWeights
+from app.services.tenancy import scope_to_university
+
+STUDENTS_WATERMARK = "shared_context:students"
+ALUMNI_WATERMARK = "shared_context:alumni"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Graduation years at most this far apart count as graduation_proximity
+GRADUATION_WINDOW = 2
+
+# (student field, alumni field, context type): a term present in both fields is shared
+RULES: Tuple[Tuple[str, str, SharedContextType], ...] = (
+    ("majors", "major", SharedContextType.SAME_MAJOR),
+    ("companies", "company", SharedContextType.SAME_COMPANY_INTEREST),
+    ("industries", "industry", SharedContextType.SAME_INDUSTRY),
+    ("roles", "role", SharedContextType.SAME_ROLE_INTEREST),
+    ("locations", "location", SharedContextType.SAME_LOCATION),
+    ("years", "year", SharedContextType.GRADUATION_PROXIMITY),
+    ("interests", "interests", SharedContextType.SHARED_INTEREST),
+    ("hobbies", "hobbies", SharedContextType.SHARED_HOBBY),
+    ("interests", "hobbies", SharedContextType.SHARED_PERSONAL_INTEREST),
+    ("hobbies", "interests", SharedContextType.SHARED_PERSONAL_INTEREST),
+)
+
+# Same relative weights as match scoring
+_weights = MatchWeights()
+STRENGTH: Dict[SharedContextType, float] = {
+    SharedContextType.SAME_MAJOR: _weights.major,
+    SharedContextType.SAME_COMPANY_INTEREST: _weights.company,
+    SharedContextType.SAME_INDUSTRY: _weights.industry,
+    SharedContextType.SAME_ROLE_INTEREST: _weights.role,
+    SharedContextType.SAME_LOCATION: _weights.location,
+    SharedContextType.GRADUATION_PROXIMITY: _weights.graduation_year,
+    SharedContextType.SHARED_INTEREST: _weights.shared_term,
+    SharedContextType.SHARED_HOBBY: _weights.shared_term,
+    SharedContextType.SHARED_PERSONAL_INTEREST: _weights.shared_term,
+}
+
+# Normalized term -> value as the alumni wrote it (shown to the student)
+Terms = Dict[str, str]
+
+
+def _terms(*values, kind: Optional[CanonicalEntityKind] = None) -> Terms:
+    terms: Terms = {}
+    for value in values:
+        if not value:
+            continue
+        for item in [value] if isinstance(value, str) else value:
+            if isinstance(item, str):
+                # Companies and roles compare by canonical entity
+                term = normalize_term(item) if kind is None else canonical_dictionary.match_key(kind, item)
+                if term:
+                    terms.setdefault(term, item.strip()[:255])
+    return terms
+
+
+@dataclass
+class Profile:
+    """Matchable fields of one student or alumni"""
+    id: uuid.UUID
+    fields: Dict[str, Terms]
+
+
+def student_profile(row) -> Profile:
+    year = row.graduation_year
+    years = {} if year is None else {str(y): str(y) for y in range(year - GRADUATION_WINDOW, year + GRADUATION_WINDOW + 1)}
+    return Profile(row.id, {
+        "majors": _terms(row.major, row.secondary_major),
+        "companies": _terms(row.target_companies, kind=CanonicalEntityKind.COMPANY),
+        "industries": _terms(row.target_industries),
+        "roles": _terms(row.target_roles, row.career_interests, kind=CanonicalEntityKind.ROLE),
+        "locations": _terms(row.current_location, row.preferred_locations),
+        "years": years,
+        "interests": _terms(row.interests),
+        "hobbies": _terms(row.hobbies),
+    })
+
+
+def alumni_profile(row) -> Profile:
+    return Profile(row.id, {
+        "major": _terms(row.major),
+        "company": _terms(row.current_company, kind=CanonicalEntityKind.COMPANY),
+        "industry": _terms(row.industry),
+        "role": _terms(row.current_role, kind=CanonicalEntityKind.ROLE),
+        "location": _terms(row.location),
+        "year": {} if row.graduation_year is None else {str(row.graduation_year): str(row.graduation_year)},
+        "interests": _terms(row.interests),
+        "hobbies": _terms(row.hobbies),
+    })
+
+
+def match_terms(profile: Profile) -> List[str]:
+    """Keys the profile is found by: "<field>:<term>" for each of its terms"""
+    return sorted(f"{name}:{term}" for name, terms in profile.fields.items() for term in terms)
+
+
+def alumni_keys_for(student: Profile) -> Set[str]:
+    """match_terms an alumni needs one of to share context with `student`"""
+    return {
+        f"{alumni_field}:{term}"
+        for student_field, alumni_field, _ in RULES
+        for term in student.fields[student_field]
+    }
+
+
+def student_keys_for(alumni: Profile) -> Set[str]:
+    """match_terms a student needs one of to share context with `alumni`"""
+    return {
+        f"{student_field}:{term}"
+        for student_field, alumni_field, _ in RULES
+        for term in alumni.fields[alumni_field]
+    }
+
+
+class _TermIndex:
+    """(field, term) -> profiles having it"""
+
+    def __init__(self, profiles: Iterable[Profile]):
+        self._postings: Dict[Tuple[str, str], List[Profile]] = defaultdict(list)
+        for profile in profiles:
+            for field_name, terms in profile.fields.items():
+                for term in terms:
+                    self._postings[(field_name, term)].append(profile)
+
+    def get(self, field_name: str, term: str) -> List[Profile]:
+        return self._postings.get((field_name, term), [])
+
+
+# A context item: (student_id, alumni_id, type, value)
+ContextRow = Tuple[uuid.UUID, uuid.UUID, SharedContextType, str]
+
+
+def contexts_for_student(student: Profile, alumni_index: _TermIndex) -> Set[ContextRow]:
+    rows = set()
+    for student_field, alumni_field, context_type in RULES:
+        for term in student.fields[student_field]:
+            for alumni in alumni_index.get(alumni_field, term):
+                rows.add((student.id, alumni.id, context_type, alumni.fields[alumni_field][term]))
+    return rows
+
+
+def contexts_for_alumni(alumni: Profile, student_index: _TermIndex) -> Set[ContextRow]:
+    rows = set()
+    for student_field, alumni_field, context_type in RULES:
+        for term, value in alumni.fields[alumni_field].items():
+            for student in student_index.get(student_field, term):
+                rows.add((student.id, alumni.id, context_type, value))
+    return rows
+
+
+_STUDENT_COLUMNS = (
+    Student.id, Student.major, Student.secondary_major, Student.target_companies, Student.target_industries,
+    Student.target_roles, Student.career_interests, Student.current_location, Student.preferred_locations,
+    Student.graduation_year, Student.interests, Student.hobbies,
+)
+_ALUMNI_COLUMNS = (
+    Alumni.id, Alumni.major, Alumni.current_company, Alumni.industry, Alumni.current_role, Alumni.location,
+    Alumni.graduation_year, Alumni.interests, Alumni.hobbies,
+)
+
+
+@dataclass
+class MaterializeReport:
+    students: int = 0
+    alumni: int = 0
+    rows_written: int = 0
+
+
+class SharedContextMaterializer:
+    """Keeps shared_contexts in step with profile updates"""
+
+    def __init__(self, batch_size: int = 500, poll_interval: float = 15.0, safety_lag_seconds: float = 30.0):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.safety_lag = timedelta(seconds=safety_lag_seconds)
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.profiles_processed = 0
+        self.rows_written = 0
+        self.errors = 0
+
+    async def _get_watermark(self, session: AsyncSession, name: str) -> datetime:
+        mark = await session.get(MaterializationWatermark, name)
+        if mark is None:
+            return _EPOCH
+        return mark.watermark if mark.watermark.tzinfo else mark.watermark.replace(tzinfo=timezone.utc)
+
+    async def _set_watermark(self, session: AsyncSession, name: str, value: datetime) -> None:
+        mark = await session.get(MaterializationWatermark, name)
+        if mark is None:
+            session.add(MaterializationWatermark(name=name, watermark=value))
+        elif value > (mark.watermark if mark.watermark.tzinfo else mark.watermark.replace(tzinfo=timezone.utc)):
+            mark.watermark = value
+
+    async def _changed(self, session: AsyncSession, model, after: datetime, cursor) -> list:
+        """Next page of (id, university_id, updated_at) changed after the watermark"""
+        query = (
+            select(model.id, User.university_id, model.updated_at)
+            .join(User, User.id == model.id)
+            .where(model.updated_at > after)
+            .order_by(model.updated_at, model.id)
+            .limit(self.batch_size)
+        )
+        if cursor is not None:
+            updated_at, last_id = cursor
+            query = query.where(or_(model.updated_at > updated_at, and_(model.updated_at == updated_at, model.id > last_id)))
+        return (await session.execute(query)).all()
+
+    @staticmethod
+    def _found_by(session: AsyncSession, model, keys: Set[str]):
+        """Profiles having one of `keys` in match_terms, or none written yet"""
+        unindexed = model.match_terms.is_(None)
+        if not keys:
+            return unindexed
+        keys = sorted(keys)
+        if session.get_bind().dialect.name == "postgresql":
+            return or_(model.match_terms.has_any(array(keys)), unindexed)
+        entries = func.json_each(model.match_terms).table_valued("value")
+        return or_(select(entries.c.value).where(entries.c.value.in_(keys)).exists(), unindexed)
+
+    async def _load(
+        self, session: AsyncSession, columns, model, university_id: uuid.UUID, build, where,
+    ) -> Tuple[Dict[uuid.UUID, Profile], List[Profile]]:
+        """A university's profiles matching `where`, and those of them without match_terms"""
+        result = await session.execute(
+            scope_to_university(
+                select(*columns, model.match_terms.is_(None).label("unindexed")), university_id, model, active_only=False,
+            ).where(where)
+        )
+        profiles, unindexed = {}, []
+        for row in result:
+            profile = profiles[row.id] = build(row)
+            if row.unindexed:
+                unindexed.append(profile)
+        return profiles, unindexed
+
+    async def _write_terms(self, session: AsyncSession, model, profiles: Iterable[Profile]) -> None:
+        params = [{"profile_id": profile.id, "terms": match_terms(profile)} for profile in profiles]
+        if not params:
+            return
+        table = model.__table__
+        await session.execute(
+            update(table)
+            .where(table.c.id == bindparam("profile_id"))
+            # Not a profile edit: keep updated_at for the watermarks
+            .values(match_terms=bindparam("terms"), updated_at=table.c.updated_at),
+            params,
+        )
+
+    async def _recompute(
+        self,
+        session: AsyncSession,
+        students: Dict[uuid.UUID, Set[uuid.UUID]],
+        alumni: Dict[uuid.UUID, Set[uuid.UUID]],
+    ) -> int:
+        """Rebuild every pair involving the given profiles, grouped by university"""
+        changed_students = set().union(*students.values()) if students else set()
+        changed_alumni = set().union(*alumni.values()) if alumni else set()
+        rows: Set[ContextRow] = set()
+        index_students: List[Profile] = []
+        index_alumni: List[Profile] = []
+        for university_id in set(students) | set(alumni):
+            new_students, new_alumni = {}, {}
+            if students.get(university_id):
+                new_students, _ = await self._load(
+                    session, _STUDENT_COLUMNS, Student, university_id, student_profile,
+                    Student.id.in_(students[university_id]),
+                )
+            if alumni.get(university_id):
+                new_alumni, _ = await self._load(
+                    session, _ALUMNI_COLUMNS, Alumni, university_id, alumni_profile,
+                    Alumni.id.in_(alumni[university_id]),
+                )
+            index_students.extend(new_students.values())
+            index_alumni.extend(new_alumni.values())
+
+            # Partners of the changed profiles, with the changed ones as they are now
+            if new_students:
+                keys = set().union(*(alumni_keys_for(profile) for profile in new_students.values()))
+                partners, unindexed = await self._load(
+                    session, _ALUMNI_COLUMNS, Alumni, university_id, alumni_profile,
+                    self._found_by(session, Alumni, keys),
+                )
+                index_alumni.extend(profile for profile in unindexed if profile.id not in new_alumni)
+                alumni_index = _TermIndex({**partners, **new_alumni}.values())
+                for profile in new_students.values():
+                    rows |= contexts_for_student(profile, alumni_index)
+            if new_alumni:
+                keys = set().union(*(student_keys_for(profile) for profile in new_alumni.values()))
+                partners, unindexed = await self._load(
+                    session, _STUDENT_COLUMNS, Student, university_id, student_profile,
+                    self._found_by(session, Student, keys),
+                )
+                index_students.extend(profile for profile in unindexed if profile.id not in new_students)
+                student_index = _TermIndex({**partners, **new_students}.values())
+                for profile in new_alumni.values():
+                    rows |= contexts_for_alumni(profile, student_index)
+
+        await self._write_terms(session, Student, index_students)
+        await self._write_terms(session, Alumni, index_alumni)
+
+        affected = or_(SharedContext.student_id.in_(changed_students), SharedContext.alumni_id.in_(changed_alumni))
+        # Keep discovered_at for items that survive the recompute
+        existing = await session.execute(
+            select(
+                SharedContext.student_id, SharedContext.alumni_id, SharedContext.context_type,
+                SharedContext.context_value, SharedContext.discovered_at,
+            ).where(affected)
+        )
+        discovered = {tuple(row[:4]): row[4] for row in existing}
+        await session.execute(delete(SharedContext).where(affected))
+
+        now = datetime.now(timezone.utc)
+        if rows:
+            await session.execute(insert(SharedContext), [
+                {
+                    "id": uuid.uuid4(),
+                    "student_id": student_id,
+                    "alumni_id": alumni_id,
+                    "context_type": context_type,
+                    "context_value": value,
+                    "strength": STRENGTH[context_type],
+                    "discovered_at": discovered.get((student_id, alumni_id, context_type, value), now),
+                    "last_verified_at": now,
+                }
+                for student_id, alumni_id, context_type, value in rows
+            ])
+        return len(rows)
+
+    async def run_once(self) -> MaterializeReport:
+        """Process every profile changed since the watermarks"""
+        report = MaterializeReport()
+        async with AsyncSessionLocal() as session:
+            if not canonical_dictionary.loaded:
+                await canonical_dictionary.load(session)
+            # Never trust the newest timestamps: late commits may still land behind them
+            horizon = datetime.now(timezone.utc) - self.safety_lag
+            marks = {
+                STUDENTS_WATERMARK: await self._get_watermark(session, STUDENTS_WATERMARK),
+                ALUMNI_WATERMARK: await self._get_watermark(session, ALUMNI_WATERMARK),
+            }
+            cursors = {STUDENTS_WATERMARK: None, ALUMNI_WATERMARK: None}
+            done = {STUDENTS_WATERMARK: False, ALUMNI_WATERMARK: False}
+
+            while not all(done.values()):
+                pages = {}
+                for name, model in ((STUDENTS_WATERMARK, Student), (ALUMNI_WATERMARK, Alumni)):
+                    pages[name] = [] if done[name] else await self._changed(session, model, marks[name], cursors[name])
+                    if len(pages[name]) < self.batch_size:
+                        done[name] = True
+                    if pages[name]:
+                        last = pages[name][-1]
+                        cursors[name] = (last.updated_at, last.id)
+
+                by_university = {name: defaultdict(set) for name in pages}
+                for name, page in pages.items():
+                    for profile_id, university_id, _ in page:
+                        by_university[name][university_id].add(profile_id)
+                if not (pages[STUDENTS_WATERMARK] or pages[ALUMNI_WATERMARK]):
+                    break
+
+                report.rows_written += await self._recompute(
+                    session, by_university[STUDENTS_WATERMARK], by_university[ALUMNI_WATERMARK]
+                )
+                report.students += len(pages[STUDENTS_WATERMARK])
+                report.alumni += len(pages[ALUMNI_WATERMARK])
+                for name, page in pages.items():
+                    if page:
+                        latest = page[-1].updated_at
+                        latest = latest if latest.tzinfo else latest.replace(tzinfo=timezone.utc)
+                        await self._set_watermark(session, name, min(latest, horizon))
+                await session.commit()
+
+        self.runs += 1
+        self.profiles_processed += report.students + report.alumni
+        self.rows_written += report.rows_written
+        return report
+
+    async def rebuild(self) -> MaterializeReport:
+        """Forget the watermarks and reprocess every profile"""
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(MaterializationWatermark).where(
+                    MaterializationWatermark.name.in_([STUDENTS_WATERMARK, ALUMNI_WATERMARK])
+                )
+            )
+            await session.commit()
+        return await self.run_once()
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.errors += 1
+                print(f"[SHARED CONTEXT] Refresh failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Start polling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "runs": self.runs,
+            "profiles_processed": self.profiles_processed,
+            "rows_written": self.rows_written,
+            "errors": self.errors,
+        }
+
+
+async def shared_context_for(
+    session: AsyncSession,
+    student_id: uuid.UUID,
+    alumni_ids: Iterable[uuid.UUID],
+) -> Dict[uuid.UUID, List[Dict[str, str]]]:
+    """
+    `shared_context` lists for a page of discover results, in one query
+
+    Served by the (student_id, alumni_id, ...) unique index; strongest
+    items come first.
+    """
+    alumni_ids = list(alumni_ids)
+    contexts: Dict[uuid.UUID, List[Dict[str, str]]] = {alumni_id: [] for alumni_id in alumni_ids}
+    if not alumni_ids:
+        return contexts
+    result = await session.execute(
+        select(SharedContext.alumni_id, SharedContext.context_type, SharedContext.context_value)
+        .where(SharedContext.student_id == student_id, SharedContext.alumni_id.in_(alumni_ids))
+        .order_by(SharedContext.alumni_id, SharedContext.strength.desc(), SharedContext.context_value)
+    )
+    for alumni_id, context_type, value in result:
+        contexts[alumni_id].append({"type": context_type.value, "value": value})
+    return contexts
+
+
+# Create singleton instance
+shared_context_materializer = SharedContextMaterializer(
+    batch_size=settings.SHARED_CONTEXT_BATCH_SIZE,
+    poll_interval=settings.SHARED_CONTEXT_POLL_SECONDS,
+    safety_lag_seconds=settings.SHARED_CONTEXT_SAFETY_LAG_SECONDS,
+)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh the shared_contexts table")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--once", action="store_true", help="Catch up with profile changes and exit")
+    group.add_argument("--rebuild", action="store_true", help="Reprocess every profile and exit")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        print(f"[SHARED CONTEXT] {asyncio.run(shared_context_materializer.rebuild())}")
+    elif args.once:
+        print(f"[SHARED CONTEXT] {asyncio.run(shared_context_materializer.run_once())}")
+    else:
+        asyncio.run(shared_context_materializer.run_forever())
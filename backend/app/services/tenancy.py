@@ -0,0 +1,58 @@
+"""
+Tenant-scoped queries
+
+users.university_id is the tenant key. The users index
+idx_users_tenant (university_id, role, status) INCLUDE (id) leads with
+it, so a query pinning all three columns reads one university's active
+alumni (or students) as a single contiguous index range, ids included,
+and joins the profile rows by primary key. Nothing outside the tenant is
+visited, which is what partition pruning would give us.
+
+Why an index rather than declarative partitioning: a partitioned table's
+primary key and unique constraints must include the partition key. That
+would turn users.id into (id, university_id) and email uniqueness into
+per-university uniqueness. Every foreign key to users.id (alumni,
+students, tokens, score events, ...) would then have to carry
+university_id too.
+
+Build tenant queries with `scope_to_university`, so the tenant filter
+and the role pin are never forgotten:
+
+    select(Alumni.id, Alumni.helpfulness_score)
+    -> scope_to_university(stmt, university_id, Alumni)
+"""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import Select
+
+from app.models.alumni import Alumni
+from app.models.student import Student
+from app.models.user import User, UserRole, UserStatus
+
+# Profile table -> the role its users have (pins the second index column)
+PROFILE_ROLES = {Alumni: UserRole.ALUMNI, Student: UserRole.STUDENT}
+
+
+def scope_to_university(
+    stmt: Select,
+    university_id: uuid.UUID,
+    profile: Optional[type] = None,
+    active_only: bool = True,
+) -> Select:
+    """
+    Restrict `stmt` to one university
+
+    `profile` (Alumni or Student) is joined to users on its id and pins the
+    role; without it `stmt` must already select from users. Pass
+    active_only=False to include inactive and suspended accounts.
+    """
+    if university_id is None:
+        raise ValueError("Tenant-scoped query without a university_id")
+    if profile is not None:
+        stmt = stmt.join(User, User.id == profile.id).where(User.role == PROFILE_ROLES[profile])
+    stmt = stmt.where(User.university_id == university_id)
+    if active_only:
+        stmt = stmt.where(User.status == UserStatus.ACTIVE)
+    return stmt
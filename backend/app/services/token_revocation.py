@@ -0,0 +1,210 @@
+"""
+Token revocation backed by a Bloom filter denylist
+
+Every token carries a `jti` claim. Revoked jtis are stored durably in the
+`revoked_tokens` table and, with a TTL matching the token expiry, in Redis.
+Each worker keeps an in-memory Bloom filter of all unexpired revoked jtis:
+
+- not in the filter -> not revoked, no I/O at all (the common case)
+- in the filter     -> confirm against Redis, then Postgres
+
+The filter is refreshed incrementally from Postgres by a background task
+and rebuilt periodically so expired entries fall out.
+
+Revocation is immediate only on the worker that revoked the token. Other
+workers answer "not revoked" from their filter, without asking Redis,
+until their next sync picks the jti up, so a revoked token can still be
+accepted elsewhere for up to TOKEN_REVOCATION_SYNC_SECONDS (plus one sync
+query).
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import RedisCircuit, get_redis
+from app.models.revoked_token import RevokedToken
+
+
+# Incremental syncs re-read a small window to tolerate app/DB clock skew
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TokenRevocationList:
+    """Bloom-filter front for the revoked token denylist"""
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        sync_interval: float = 10,
+        rebuild_interval: float = 3600,
+        use_redis: bool = True,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.use_redis = use_redis
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._synced_until: Optional[datetime] = None
+        self._last_rebuild = 0.0
+        self._circuit = RedisCircuit()
+        self._task: Optional[asyncio.Task] = None
+        self.bloom_negatives = 0
+        self.confirmed_revoked = 0
+        self.false_positives = 0
+
+    @staticmethod
+    def _redis_key(jti: str) -> str:
+        return f"revoked:{jti}"
+
+    def might_be_revoked(self, jti: Optional[str]) -> bool:
+        """Cheap, I/O-free check; False means definitely not revoked"""
+        return bool(jti) and jti in self._bloom
+
+    async def is_revoked(self, jti: Optional[str], db: Optional[AsyncSession] = None) -> bool:
+        """
+        Check whether a token id has been revoked
+
+        Only Bloom filter positives touch Redis or the database.
+        """
+        if not self.might_be_revoked(jti):
+            self.bloom_negatives += 1
+            return False
+
+        if self.use_redis and self._circuit.available:
+            try:
+                if await get_redis().exists(self._redis_key(jti)):
+                    self.confirmed_revoked += 1
+                    return True
+            except Exception:
+                self._circuit.record_failure()
+
+        # Redis miss or unavailable: Postgres is the source of truth
+        if db is not None:
+            revoked = await db.get(RevokedToken, jti) is not None
+        else:
+            async with AsyncSessionLocal() as session:
+                revoked = await session.get(RevokedToken, jti) is not None
+
+        if revoked:
+            self.confirmed_revoked += 1
+        else:
+            self.false_positives += 1
+        return revoked
+
+    async def revoke(
+        self,
+        db: AsyncSession,
+        jti: str,
+        expires_at: datetime,
+        token_type: str,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        """
+        Add a token to the denylist (commits the session)
+
+        Revoking the same jti twice, e.g. from concurrent logouts, is a no-op.
+        """
+        values = {"jti": jti, "user_id": user_id, "token_type": token_type, "expires_at": expires_at}
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql_insert(RevokedToken).values(**values).on_conflict_do_nothing(index_elements=["jti"])
+        elif dialect == "sqlite":
+            statement = sqlite_insert(RevokedToken).values(**values).on_conflict_do_nothing(index_elements=["jti"])
+        else:
+            statement = insert(RevokedToken).values(**values)
+        await db.execute(statement)
+        await db.commit()
+
+        self._bloom.add(jti)
+        ttl = int((expires_at - _utcnow()).total_seconds())
+        if self.use_redis and ttl > 0 and self._circuit.available:
+            try:
+                await get_redis().set(self._redis_key(jti), 1, ex=ttl)
+            except Exception:
+                self._circuit.record_failure()
+
+    async def sync(self, db: AsyncSession) -> int:
+        """
+        Load revocations made since the last sync into the filter
+
+        Performs a full rebuild instead when `rebuild_interval` has passed, so
+        expired jtis stop occupying the filter. Returns the number of jtis added.
+        """
+        loop_time = asyncio.get_running_loop().time()
+        rebuild = loop_time - self._last_rebuild >= self.rebuild_interval
+        started_at = _utcnow()
+
+        query = select(RevokedToken.jti).where(RevokedToken.expires_at > started_at)
+        if not rebuild and self._synced_until is not None:
+            query = query.where(RevokedToken.revoked_at >= self._synced_until)
+
+        result = await db.stream_scalars(query.execution_options(yield_per=10000))
+        bloom = BloomFilter(self.capacity, self.error_rate) if rebuild else self._bloom
+        added = 0
+        async for jti in result:
+            bloom.add(jti)
+            added += 1
+
+        if rebuild:
+            self._bloom = bloom
+            self._last_rebuild = loop_time
+        self._synced_until = started_at - SYNC_OVERLAP
+        return added
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as session:
+                    await self.sync(session)
+            except Exception as e:
+                print(f"[REVOCATION] Sync failed: {e}")
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self) -> None:
+        """Start the background sync task on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "bloom_entries": self._bloom.count,
+            "bloom_bytes": self._bloom.size_bytes,
+            "bloom_negatives": self.bloom_negatives,
+            "confirmed_revoked": self.confirmed_revoked,
+            "false_positives": self.false_positives,
+            "redis_errors": self._circuit.errors,
+        }
+
+
+# Create singleton instance
+revocation_list = TokenRevocationList(
+    capacity=settings.TOKEN_REVOCATION_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_ERROR_RATE,
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    rebuild_interval=settings.TOKEN_REVOCATION_REBUILD_SECONDS,
+)
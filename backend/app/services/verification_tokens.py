@@ -0,0 +1,185 @@
+"""
+Email verification token lifecycle
+
+`consume_token` verifies in one statement on PostgreSQL: a data-modifying
+CTE marks the token used and its user verified and returns the user id.
+SQLite has no DML in CTEs, so there it runs the two UPDATEs back to back in
+the caller's transaction. Nothing is loaded into the ORM, and a token is
+consumed at most once: concurrent requests race on the token row and the
+loser's UPDATE matches nothing.
+
+Used and expired tokens are never read again. The VerificationTokenPurger
+deletes them in batches of TOKEN_PURGE_BATCH_SIZE, each batch its own short
+transaction that skips rows another transaction holds, with a pause between
+batches so no lock is held for long.
+
+Run standalone with:
+    python -m app.services.verification_tokens          # purge periodically
+    python -m app.services.verification_tokens --once   # purge and exit
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import delete, false, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.email_verification import EmailVerificationToken
+from app.models.user import User
+from app.services.principal_cache import mark_principal_changed
+
+
+async def consume_token(
+    session: AsyncSession,
+    token: str,
+    token_type: str = "email_verification",
+) -> Optional[uuid.UUID]:
+    """
+    Mark an outstanding token used and its user's email verified (does not
+    commit); returns the user id, or None if the token is unknown, used or
+    expired
+    """
+    # Naive UTC, as the tokens' expires_at is written
+    now = datetime.utcnow()
+    consume = (
+        update(EmailVerificationToken)
+        .where(
+            EmailVerificationToken.token == token,
+            EmailVerificationToken.token_type == token_type,
+            EmailVerificationToken.used == false(),
+            EmailVerificationToken.expires_at > now,
+        )
+        .values(used=True)
+        .returning(EmailVerificationToken.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    verified = {"email_verified": True, "email_verified_at": now}
+
+    if session.get_bind().dialect.name == "postgresql":
+        consumed = consume.cte("consumed")
+        user_id = (await session.execute(
+            update(User)
+            .where(User.id == consumed.c.user_id)
+            .values(**verified)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )).scalar_one_or_none()
+    else:
+        user_id = (await session.execute(consume)).scalar_one_or_none()
+        if user_id is not None:
+            await session.execute(
+                update(User).where(User.id == user_id).values(**verified).execution_options(synchronize_session=False)
+            )
+
+    if user_id is not None:
+        # email_verified is cached with the principal
+        mark_principal_changed(session.sync_session, user_id)
+    return user_id
+
+
+class VerificationTokenPurger:
+    """Background task deleting used and expired verification tokens"""
+
+    def __init__(
+        self,
+        batch_size: int = 1000,
+        pause_seconds: float = 0.05,
+        interval: float = 3600.0,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.batches = 0
+        self.deleted = 0
+        self.errors = 0
+
+    async def purge_batch(self, dead) -> int:
+        """Delete up to batch_size tokens matching `dead`; returns rows deleted"""
+        doomed = (
+            select(EmailVerificationToken.id)
+            .where(dead)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(EmailVerificationToken)
+                .where(EmailVerificationToken.id.in_(doomed.scalar_subquery()))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        self.batches += 1
+        self.deleted += result.rowcount
+        return result.rowcount
+
+    async def purge_once(self) -> int:
+        """Delete every used or expired token, batch by batch; returns rows deleted"""
+        total = 0
+        # One index-backed condition at a time: used (partial index), expired (expires_at)
+        for dead in (EmailVerificationToken.used == true(), EmailVerificationToken.expires_at <= datetime.utcnow()):
+            while True:
+                deleted = await self.purge_batch(dead)
+                total += deleted
+                if deleted < self.batch_size:
+                    break
+                await asyncio.sleep(self.pause_seconds)
+        self.runs += 1
+        return total
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                deleted = await self.purge_once()
+                if deleted:
+                    print(f"[TOKENS] Purged {deleted} used or expired verification tokens")
+            except Exception as e:
+                self.errors += 1
+                print(f"[TOKENS] Purge error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start purging on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"runs": self.runs, "batches": self.batches, "deleted": self.deleted, "errors": self.errors}
+
+
+# Create singleton instance
+verification_token_purger = VerificationTokenPurger(
+    batch_size=settings.TOKEN_PURGE_BATCH_SIZE,
+    pause_seconds=settings.TOKEN_PURGE_PAUSE_SECONDS,
+    interval=settings.TOKEN_PURGE_INTERVAL_SECONDS,
+)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Delete used and expired verification tokens")
+    parser.add_argument("--once", action="store_true", help="Purge and exit")
+    args = parser.parse_args()
+
+    if args.once:
+        deleted = asyncio.run(verification_token_purger.purge_once())
+        print(f"[TOKENS] Purged {deleted} tokens: {verification_token_purger.stats()}")
+    else:
+        asyncio.run(verification_token_purger.run_forever())
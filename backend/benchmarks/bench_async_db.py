@@ -0,0 +1,72 @@
+"""
+Concurrency benchmark: blocking Session vs AsyncSession inside async handlers
+
+Each request performs one database round trip of fixed latency
+(`SELECT pg_sleep(...)`). With the blocking Session the round trip runs on
+the event loop thread, so throughput stays flat as concurrency grows. With
+the AsyncSession the loop is free while waiting, so throughput scales with
+in-flight requests until the connection pool is exhausted.
+
+Requires PostgreSQL (DATABASE_URL / DATABASE_URL_ASYNC):
+    python -m benchmarks.bench_async_db --latency-ms 10 --levels 1,4,16,64
+"""
+
+import argparse
+import asyncio
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import get_async_db, get_db
+from benchmarks.harness import print_table, run_concurrent
+
+
+def build_app(latency_s: float) -> FastAPI:
+    """Two endpoints doing the same round trip through each session type"""
+    app = FastAPI()
+    query = text("SELECT pg_sleep(:d)")
+
+    @app.get("/blocking")
+    async def blocking(db: Session = Depends(get_db)):
+        # Same shape as the pre-async auth handlers: sync I/O in a coroutine
+        db.execute(query, {"d": latency_s})
+        return {"ok": True}
+
+    @app.get("/async")
+    async def non_blocking(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(query, {"d": latency_s})
+        return {"ok": True}
+
+    return app
+
+
+async def main(args) -> None:
+    app = build_app(args.latency_ms / 1000.0)
+    transport = httpx.ASGITransport(app=app)
+    rows = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/blocking", "/async"):
+            for level in args.levels:
+                async def call():
+                    response = await client.get(path)
+                    return response.status_code == 200
+
+                result = await run_concurrent(call, level, max(args.requests, level * 4))
+                rows.append({"path": path, **result.summary()})
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Simulated round-trip latency")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument(
+        "--levels",
+        type=lambda v: [int(x) for x in v.split(",")],
+        default=[1, 4, 16, 64],
+        help="Comma-separated in-flight request counts",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,173 @@
+"""
+Cold start: import-time breakdown and first-request latency
+
+Each run is a fresh interpreter that imports app.main, runs the startup
+handlers and sends two /health requests and two unknown-email logins (one
+indexed SELECT, no bcrypt) through the ASGI app. The first request of each
+pays for whatever was left to first use (engine, DB driver, pool). Runs
+are repeated per settings profile:
+- production: ENVIRONMENT=production (DEBUG and SQL_ECHO forced off)
+- development: the defaults
+- development+echo: SQL_ECHO=true, every statement logged
+
+Also prints the `python -X importtime` self time of `import app.main`
+grouped by top-level package. The in-process workers are disabled in the
+child so their polling does not overlap the timed requests.
+
+Runs on SQLite by default (a temp file holding only the users table);
+--url for another database whose users table already exists:
+    python -m benchmarks.bench_cold_start --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.harness import print_table
+
+PROFILES = {
+    "production": {"ENVIRONMENT": "production"},
+    "development": {"ENVIRONMENT": "development", "DEBUG": "true", "SQL_ECHO": "false"},
+    "development+echo": {"ENVIRONMENT": "development", "DEBUG": "true", "SQL_ECHO": "true"},
+}
+
+_RESULT = "COLD_START_RESULT "
+
+
+async def child() -> None:
+    """Timed boot inside a fresh interpreter (prints one result line)"""
+    started = time.perf_counter()
+    import httpx
+    from app.main import app
+    imported = time.perf_counter()
+    await app.router.startup()
+    booted = time.perf_counter()
+
+    timings = {
+        "import_ms": (imported - started) * 1000,
+        "startup_ms": (booted - imported) * 1000,
+    }
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, send in (
+            ("health", lambda: client.get("/health")),
+            ("login", lambda: client.post(
+                "/api/v1/auth/login", json={"email": "nobody@example.edu", "password": "not-a-password"},
+            )),
+        ):
+            for attempt in ("first", "warm"):
+                request_started = time.perf_counter()
+                response = await send()
+                timings[f"{name}_{attempt}_ms"] = (time.perf_counter() - request_started) * 1000
+                assert response.status_code in (200, 401), (name, response.status_code, response.text)
+    await app.router.shutdown()
+    print(_RESULT + json.dumps(timings), flush=True)
+
+
+def child_env(profile: str, database_url: str) -> dict:
+    env = dict(os.environ)
+    env.update(PROFILES[profile])
+    env.update({
+        "DATABASE_URL": database_url,
+        "DATABASE_URL_ASYNC": database_url.replace("sqlite://", "sqlite+aiosqlite://", 1),
+        "SECRET_KEY": env.get("SECRET_KEY", "bench-secret"),
+        "EMAIL_OUTBOX_WORKER_ENABLED": "false",
+        "SHARED_CONTEXT_WORKER_ENABLED": "false",
+        "SCORE_WORKER_ENABLED": "false",
+    })
+    return env
+
+
+def run_child(profile: str, database_url: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_cold_start", "--child"],
+        env=child_env(profile, database_url), capture_output=True, text=True, check=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(_RESULT):
+            return json.loads(line[len(_RESULT):])
+    raise RuntimeError(f"No result from child:\n{proc.stdout}\n{proc.stderr}")
+
+
+def import_breakdown(database_url: str, top: int) -> None:
+    """Self time of every module imported by app.main, summed per top-level package"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=child_env("production", database_url), capture_output=True, text=True, check=True,
+    )
+    by_package = defaultdict(float)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        by_package[module.strip().split(".")[0]] += int(self_us)
+    total = sum(by_package.values())
+    rows = [
+        {"package": package, "self_ms": round(us / 1000, 1), "share": f"{us / total:.0%}"}
+        for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+    ]
+    rows.append({"package": "(all)", "self_ms": round(total / 1000, 1), "share": "100%"})
+    print_table(rows)
+
+
+def prepare_sqlite(path: str) -> str:
+    """A SQLite file with the users table (generic types in place of PostgreSQL's)"""
+    from sqlalchemy import Boolean, Column, DateTime, Enum, MetaData, String, Table, Uuid, create_engine, func
+    from app.models.user import UserRole, UserStatus
+
+    users = Table(
+        "users",
+        MetaData(),
+        Column("id", Uuid, primary_key=True),
+        Column("university_id", Uuid, nullable=False, index=True),
+        Column("email", String(255), unique=True, nullable=False),
+        Column("password_hash", String(255), nullable=False),
+        Column("role", Enum(UserRole), nullable=False),
+        Column("status", Enum(UserStatus), nullable=False),
+        Column("email_verified", Boolean, nullable=False),
+        Column("email_verified_at", DateTime(timezone=True)),
+        Column("created_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+        Column("last_login_at", DateTime(timezone=True)),
+    )
+    if os.path.exists(path):
+        os.remove(path)
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    users.create(engine)
+    engine.dispose()
+    return url
+
+
+def main(args) -> None:
+    database_url = args.url or prepare_sqlite(os.path.join(tempfile.gettempdir(), "bench_cold_start.db"))
+    rows = []
+    for profile in args.profiles.split(","):
+        runs = [run_child(profile, database_url) for _ in range(args.runs)]
+        row = {"profile": profile}
+        for key in runs[0]:
+            row[key] = round(statistics.median(run[key] for run in runs), 1)
+        rows.append(row)
+    print_table(rows)
+    print()
+    import_breakdown(database_url, args.top)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--url", default=None, help="Sync database URL (default: a SQLite file in the temp dir)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per profile (median reported)")
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    parser.add_argument("--top", type=int, default=12, help="Packages shown in the import breakdown")
+    args = parser.parse_args()
+    if args.child:
+        asyncio.run(child())
+    else:
+        main(args)
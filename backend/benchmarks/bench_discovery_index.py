@@ -0,0 +1,126 @@
+"""
+Discovery index benchmark: filter + rank latency at 100k alumni
+
+Builds a UniversityIndex from N synthetic alumni profiles and times
+representative /students/discover queries against the index and against a
+straight Python scan over the same profiles (the best case for doing the
+filter and ranking per request without an index).
+
+No database needed:
+    python -m benchmarks.bench_discovery_index --alumni 100000
+"""
+
+import argparse
+import heapq
+import random
+import time
+import uuid
+
+from app.models.alumni import AvailabilityStatus
+from app.services.discovery_index import DISCOVERABLE, AlumniDoc, UniversityIndex, normalize_term
+from benchmarks.harness import percentile, print_table
+
+INDUSTRIES = [f"industry {i}" for i in range(40)]
+ROLES = [f"role {i}" for i in range(200)]
+LOCATIONS = [f"city {i}" for i in range(300)]
+TAGS = [f"tag {i}" for i in range(2000)]
+
+QUERIES = {
+    "interests only": {"interests": ["tag 1", "tag 2", "tag 3", "tag 4", "tag 5"]},
+    "industry + interests": {"industry": "industry 3", "interests": ["tag 10", "tag 11", "tag 12"]},
+    "industry + location": {"industry": "industry 7", "location": "city 12"},
+    "industry + role + interests": {"industry": "industry 1", "role": "role 5", "interests": ["tag 7", "tag 8"]},
+}
+
+
+def make_docs(n: int, rng: random.Random):
+    statuses = [AvailabilityStatus.OPEN] * 6 + [AvailabilityStatus.LIMITED] * 3 + [AvailabilityStatus.CLOSED]
+    # Skewed tag popularity, like real interests
+    weights = [1 / (i + 1) for i in range(len(TAGS))]
+    return [
+        AlumniDoc(
+            id=uuid.uuid4(),
+            industry=rng.choice(INDUSTRIES),
+            role=rng.choice(ROLES),
+            location=rng.choice(LOCATIONS),
+            availability=rng.choice(statuses),
+            tags=frozenset(rng.choices(TAGS, weights=weights, k=rng.randint(2, 8))),
+            helpfulness=round(rng.uniform(0, 5), 2),
+        )
+        for _ in range(n)
+    ]
+
+
+def scan(docs, industry=None, role=None, location=None, interests=(), limit=20):
+    """Per-request filter and rank without an index"""
+    industry, role, location = normalize_term(industry), normalize_term(role), normalize_term(location)
+    query_terms = frozenset(normalize_term(t) for t in interests)
+    scored = (
+        (len(doc.tags & query_terms), doc.helpfulness, doc)
+        for doc in docs
+        if doc.availability in DISCOVERABLE
+        and (industry is None or doc.industry == industry)
+        and (role is None or doc.role == role)
+        and (location is None or doc.location == location)
+    )
+    return [doc.id for _, _, doc in heapq.nlargest(limit, scored, key=lambda item: item[:2])]
+
+
+def timed(fn, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    docs = make_docs(args.alumni, rng)
+
+    started = time.perf_counter()
+    index = UniversityIndex.from_docs(docs)
+    build_s = time.perf_counter() - started
+
+    # Incremental update cost, amortizing the periodic compaction
+    updates = [
+        AlumniDoc(**{**vars(doc), "location": rng.choice(LOCATIONS), "helpfulness": round(rng.uniform(0, 5), 2)})
+        for doc in docs[: args.updates]
+    ]
+    started = time.perf_counter()
+    for doc in updates:
+        index.upsert(doc)
+    upsert_us = (time.perf_counter() - started) / len(updates) * 1e6
+    docs[: args.updates] = updates
+
+    rows = []
+    for name, query in QUERIES.items():
+        indexed = timed(lambda: index.search(**query), args.repeats)
+        scanned = timed(lambda: scan(docs, **query), max(1, args.repeats // 50))
+        # Both paths must agree on the best match
+        by_id = {doc.id: doc for doc in docs}
+        top_index, top_scan = index.search(**query)[:1], [by_id[i] for i in scan(docs, **query)[:1]]
+        terms = frozenset(normalize_term(t) for t in query.get("interests", ()))
+        assert [(len(hit.shared_terms), hit.helpfulness) for hit in top_index] == [
+            (len(doc.tags & terms), doc.helpfulness) for doc in top_scan
+        ]
+        rows.append({
+            "query": name,
+            "index_p50_us": round(percentile(indexed, 50) * 1e6, 1),
+            "index_p99_us": round(percentile(indexed, 99) * 1e6, 1),
+            "scan_p50_ms": round(percentile(scanned, 50) * 1e3, 2),
+            "speedup": round(percentile(scanned, 50) / percentile(indexed, 50)),
+        })
+
+    print(f"alumni={args.alumni} build={build_s:.2f}s upsert={upsert_us:.1f}us/profile")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--alumni", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=500, help="Timed index queries per shape")
+    parser.add_argument("--updates", type=int, default=20_000, help="Profile updates applied before querying")
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
@@ -0,0 +1,103 @@
+"""
+Latency benchmark: cheap endpoints while logins are hashing passwords
+
+Runs a steady stream of bcrypt verifications (the login hot path) and, at
+the same time, probes a trivial `/health` endpoint. With inline hashing the
+probe waits behind every bcrypt call on the event loop; with the hashing
+executor the probe latency stays flat.
+
+No database needed:
+    python -m benchmarks.bench_hashing --logins 8 --duration 5
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.security import averify_password, get_password_hash, verify_password
+from benchmarks.harness import percentile, print_table
+
+
+def build_app(password_hash: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/login-inline")
+    async def login_inline():
+        return {"ok": verify_password("password123", password_hash)}
+
+    @app.post("/login-executor")
+    async def login_executor():
+        return {"ok": await averify_password("password123", password_hash)}
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, login_path: str, logins: int, duration: float, interval: float) -> dict:
+    """
+    Probe /health on a fixed schedule while `logins` concurrent login loops run.
+
+    Latency is measured from each probe's *scheduled* send time, so time the
+    probe spent waiting for a blocked event loop is counted.
+    """
+    stop = asyncio.Event()
+    completed_logins = 0
+
+    async def login_loop():
+        nonlocal completed_logins
+        while not stop.is_set():
+            response = await client.post(login_path)
+            if response.status_code == 200:
+                completed_logins += 1
+            # In-process transport never suspends on its own; yield like a socket would
+            await asyncio.sleep(0)
+
+    loops = [asyncio.create_task(login_loop()) for _ in range(logins)]
+    await asyncio.sleep(0.05)  # let the login burst get going
+
+    latencies = []
+    started = time.perf_counter()
+    scheduled = started
+    while scheduled - started < duration:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await client.get("/health")
+        latencies.append(time.perf_counter() - scheduled)
+        scheduled += interval
+
+    stop.set()
+    await asyncio.gather(*loops)
+    return {
+        "mode": login_path.lstrip("/"),
+        "logins_in_flight": logins,
+        "logins_done": completed_logins,
+        "probes": len(latencies),
+        "health_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "health_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "health_max_ms": round(max(latencies) * 1000, 2),
+    }
+
+
+async def main(args) -> None:
+    app = build_app(get_password_hash("password123"))
+    transport = httpx.ASGITransport(app=app)
+    rows = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for path in ("/login-inline", "/login-executor"):
+            rows.append(await measure(client, path, args.logins, args.duration, args.interval_ms / 1000.0))
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=8, help="Concurrent login loops")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to probe per mode")
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="Probe schedule interval")
+    asyncio.run(main(parser.parse_args()))
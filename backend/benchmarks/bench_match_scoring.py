@@ -0,0 +1,188 @@
+"""
+Match scoring benchmark: NumPy feature arrays vs a per-alumni Python loop
+
+Scores one student against N synthetic alumni (default 100k) with the same
+rules and weights both ways, checks that both pick the same top-k scores,
+and reports build time and per-student latency. Then patches --updates
+changed, added and removed alumni into the arrays in place, reports the
+cost per update against a rebuild, and checks top-k again.
+
+No database needed:
+    python -m benchmarks.bench_match_scoring --alumni 100000 --k 20
+"""
+
+import argparse
+import dataclasses
+import heapq
+import random
+import time
+import uuid
+
+from app.services.match_scoring import AlumniFeatureRow, AlumniFeatures, MatchWeights, StudentQuery
+from benchmarks.harness import percentile, print_table
+
+INDUSTRIES = [f"industry {i}" for i in range(40)]
+ROLES = [f"role {i}" for i in range(200)]
+LOCATIONS = [f"city {i}" for i in range(300)]
+COMPANIES = [f"company {i}" for i in range(2000)]
+MAJORS = [f"major {i}" for i in range(80)]
+TAGS = [f"tag {i}" for i in range(2000)]
+
+
+def make_row(rng: random.Random, alumni_id: uuid.UUID) -> AlumniFeatureRow:
+    return AlumniFeatureRow(
+        id=alumni_id,
+        industry=rng.choice(INDUSTRIES),
+        role=rng.choice(ROLES),
+        location=rng.choice(LOCATIONS),
+        company=rng.choice(COMPANIES) if rng.random() > 0.1 else None,
+        major=rng.choice(MAJORS),
+        tags=tuple(sorted(set(rng.choices(TAGS[:300], k=rng.randint(0, 8))))),
+        graduation_year=rng.randint(1990, 2024),
+        helpfulness=round(rng.uniform(0, 5), 2),
+        response_rate=round(rng.random(), 2),
+        eligible=rng.random() > 0.15,
+    )
+
+
+def make_rows(n: int, rng: random.Random):
+    return [make_row(rng, uuid.uuid4()) for _ in range(n)]
+
+
+def apply_updates(features: AlumniFeatures, rows: dict, count: int, rng: random.Random) -> float:
+    """Mostly capacity / score changes, then profile edits, sign-ups and removals; seconds per update"""
+    elapsed = 0.0
+    ids = list(rows)
+    for _ in range(count):
+        dice = rng.random()
+        alumni_id = rng.choice(ids)
+        if dice < 0.7:
+            row = dataclasses.replace(
+                rows[alumni_id], eligible=not rows[alumni_id].eligible, helpfulness=round(rng.uniform(0, 5), 2),
+            )
+        elif dice < 0.9:
+            row = make_row(rng, alumni_id)
+        elif dice < 0.95:
+            row = make_row(rng, uuid.uuid4())
+            ids.append(row.id)
+        else:
+            row = None
+            ids.remove(alumni_id)
+        started = time.perf_counter()
+        if row is None:
+            features.remove(alumni_id)
+        else:
+            features.upsert(row)
+        elapsed += time.perf_counter() - started
+        if row is None:
+            del rows[alumni_id]
+        else:
+            rows[row.id] = row
+    return elapsed / max(1, count)
+
+
+def make_query(rng: random.Random) -> StudentQuery:
+    return StudentQuery(
+        industries=tuple(rng.sample(INDUSTRIES, 2)),
+        roles=tuple(rng.sample(ROLES, 3)),
+        locations=(rng.choice(LOCATIONS),),
+        companies=tuple(rng.sample(COMPANIES, 5)),
+        majors=(rng.choice(MAJORS),),
+        tags=tuple(rng.sample(TAGS[:300], 6)),
+        graduation_year=rng.randint(2024, 2027),
+    )
+
+
+def python_top_k(rows, query: StudentQuery, k: int, w: MatchWeights):
+    """The same rules, one alumni at a time"""
+    industries, roles, locations = set(query.industries), set(query.roles), set(query.locations)
+    companies, majors, tags = set(query.companies), set(query.majors), set(query.tags)
+    scored = []
+    for row in rows:
+        if not row.eligible:
+            continue
+        score = w.helpfulness * row.helpfulness / 5.0 + w.response_rate * row.response_rate
+        if row.industry in industries:
+            score += w.industry
+        if row.role in roles:
+            score += w.role
+        if row.location in locations:
+            score += w.location
+        if row.company in companies:
+            score += w.company
+        if row.major in majors:
+            score += w.major
+        score += w.shared_term * sum(1 for tag in row.tags if tag in tags)
+        if query.graduation_year is not None and row.graduation_year is not None:
+            score += w.graduation_year * min(1.0, max(0.0, 1.0 - abs(row.graduation_year - query.graduation_year) / 10.0))
+        scored.append((score, row.id))
+    return heapq.nlargest(k, scored)
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    rows = make_rows(args.alumni, rng)
+    weights = MatchWeights()
+
+    started = time.perf_counter()
+    features = AlumniFeatures.build(rows)
+    build_s = time.perf_counter() - started
+
+    queries = [make_query(rng) for _ in range(args.students)]
+    vectorized, looped = [], []
+    for i, query in enumerate(queries):
+        started = time.perf_counter()
+        top = features.top_k(query, args.k, weights)
+        vectorized.append(time.perf_counter() - started)
+
+        if i < args.baseline_students:
+            started = time.perf_counter()
+            expected = python_top_k(rows, query, args.k, weights)
+            looped.append(time.perf_counter() - started)
+            got = [round(result.score, 9) for result in top]
+            assert got == [round(score, 9) for score, _ in expected], "NumPy and Python top-k disagree"
+
+    print(f"alumni={args.alumni} k={args.k} build={build_s:.2f}s")
+    print_table([
+        {
+            "engine": "numpy",
+            "p50_ms": round(percentile(vectorized, 50) * 1e3, 2),
+            "p99_ms": round(percentile(vectorized, 99) * 1e3, 2),
+            "students": len(vectorized),
+        },
+        {
+            "engine": "python loop",
+            "p50_ms": round(percentile(looped, 50) * 1e3, 2),
+            "p99_ms": round(percentile(looped, 99) * 1e3, 2),
+            "students": len(looped),
+        },
+    ])
+    print(f"speedup (p50): {percentile(looped, 50) / percentile(vectorized, 50):.0f}x")
+
+    if args.updates:
+        by_id = {row.id: row for row in rows}
+        per_update = apply_updates(features, by_id, args.updates, rng)
+        for query in queries[:args.baseline_students]:
+            got = [round(result.score, 9) for result in features.top_k(query, args.k, weights)]
+            expected = python_top_k(by_id.values(), query, args.k, weights)
+            assert got == [round(score, 9) for score, _ in expected], "Patched arrays and Python top-k disagree"
+        after = []
+        for query in queries:
+            started = time.perf_counter()
+            features.top_k(query, args.k, weights)
+            after.append(time.perf_counter() - started)
+        print(
+            f"updates={args.updates} in place={per_update * 1e6:.1f}us/update (rebuild {build_s * 1e3:.0f}ms) "
+            f"outdated rows={features.outdated} numpy p50 after={percentile(after, 50) * 1e3:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--alumni", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--students", type=int, default=200, help="Students scored with NumPy")
+    parser.add_argument("--baseline-students", type=int, default=10, help="Of those, also scored in Python")
+    parser.add_argument("--updates", type=int, default=1000, help="Alumni changes patched in place afterwards")
+    parser.add_argument("--seed", type=int, default=5)
+    main(parser.parse_args())
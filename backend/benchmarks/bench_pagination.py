@@ -0,0 +1,141 @@
+"""
+Pagination benchmark: keyset cursors vs OFFSET on deep pages
+
+Loads N synthetic alumni rows into a table shaped like `alumni` (same
+career index as idx_alumni_career, plus one on helpfulness), then walks
+page by page and reports the latency of selected pages for:
+- "most helpful": ORDER BY helpfulness_score DESC, id DESC (row-value seek)
+- "by role": WHERE industry = ? ORDER BY current_role, id (expanded seek
+  over the nullable current_role, served by the career index)
+
+Keyset latency stays flat with page depth; OFFSET grows linearly because
+the database must produce and discard every skipped row.
+
+Runs on SQLite by default; pass --url postgresql://... to use PostgreSQL:
+    python -m benchmarks.bench_pagination --rows 200000 --pages 1,10,100,1000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import Column, Index, MetaData, Numeric, String, Table, Uuid, create_engine, select
+
+from app.core.pagination import KeysetPaginator, SortKey
+from benchmarks.harness import print_table
+
+metadata = MetaData()
+
+bench_alumni = Table(
+    "bench_alumni",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("industry", String(100), nullable=True),
+    Column("current_role", String(100), nullable=True),
+    Column("helpfulness_score", Numeric(5, 2), nullable=False),
+    Index("bench_alumni_career", "industry", "current_role"),
+    Index("bench_alumni_helpfulness", "helpfulness_score", "id"),
+)
+
+INDUSTRIES = ["Technology", "Finance", "Healthcare", "Education", "Consulting"]
+ROLES = [f"Role {i:03d}" for i in range(300)]
+
+
+def seed(engine, rows: int) -> None:
+    rng = random.Random(11)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        batch = []
+        for _ in range(rows):
+            batch.append({
+                "id": uuid.uuid4(),
+                "industry": rng.choice(INDUSTRIES),
+                "current_role": rng.choice(ROLES) if rng.random() > 0.05 else None,
+                "helpfulness_score": round(rng.uniform(0, 5), 2),
+            })
+            if len(batch) == 10_000:
+                conn.execute(bench_alumni.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(bench_alumni.insert(), batch)
+
+
+def walk_keyset(conn, paginator, query, limit, pages):
+    """Follow next_cursor page by page, timing the requested pages"""
+    timings, cursor = {}, None
+    for page_no in range(1, max(pages) + 1):
+        started = time.perf_counter()
+        page = paginator.paginate_sync(conn, query, cursor, limit)
+        if page_no in pages:
+            timings[page_no] = time.perf_counter() - started
+        if not page.has_more:
+            break
+        cursor = page.next_cursor
+    return timings
+
+
+def time_offset(conn, query, order_by, limit, pages, repeats):
+    timings = {}
+    for page_no in pages:
+        ordered = query.order_by(*order_by).offset((page_no - 1) * limit).limit(limit)
+        started = time.perf_counter()
+        for _ in range(repeats):
+            conn.execute(ordered).all()
+        timings[page_no] = (time.perf_counter() - started) / repeats
+    return timings
+
+
+def main(args) -> None:
+    url = args.url or f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_pagination.db')}"
+    engine = create_engine(url)
+    print(f"Seeding {args.rows} rows into {engine.url.render_as_string(hide_password=True)}")
+    seed(engine, args.rows)
+
+    t = bench_alumni.c
+    scenarios = {
+        "most helpful": (
+            select(t.id, t.current_role),
+            KeysetPaginator("bench_helpful", SortKey(t.helpfulness_score, descending=True), SortKey(t.id, descending=True)),
+            (t.helpfulness_score.desc(), t.id.desc()),
+        ),
+        "by role": (
+            select(t.id, t.current_role).where(t.industry == "Technology"),
+            KeysetPaginator("bench_role", SortKey(t.current_role), SortKey(t.id)),
+            (t.current_role.asc().nulls_last(), t.id.asc()),
+        ),
+    }
+
+    pages = sorted(int(p) for p in args.pages.split(","))
+    rows = []
+    with engine.connect() as conn:
+        for name, (query, paginator, order_by) in scenarios.items():
+            # Average several walks so single pages are not timer noise
+            keyset = {}
+            for _ in range(args.repeats):
+                for page_no, elapsed in walk_keyset(conn, paginator, query, args.limit, pages).items():
+                    keyset[page_no] = keyset.get(page_no, 0.0) + elapsed / args.repeats
+            offset = time_offset(conn, query, order_by, args.limit, pages, args.repeats)
+            for page_no in pages:
+                if page_no not in keyset:
+                    continue
+                rows.append({
+                    "ordering": name,
+                    "page": page_no,
+                    "keyset_ms": round(keyset[page_no] * 1e3, 3),
+                    "offset_ms": round(offset[page_no] * 1e3, 3),
+                })
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Database URL (default: a SQLite file in the temp dir)")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--pages", default="1,10,100,1000", help="Comma-separated page numbers to report")
+    parser.add_argument("--repeats", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,102 @@
+"""
+Rate limiter overhead: cost added to each request by RateLimitMiddleware
+
+Drives the ASGI middleware directly around a no-op app (no HTTP server,
+no framework), so the difference to the bare app is the limiter's own
+work: route classification, client key extraction (JWT verification for
+bearer requests), bucket update and
+header injection. Clients are spread so most requests are allowed, as in
+normal traffic.
+
+    python -m benchmarks.bench_rate_limit --requests 200000 --clients 5000
+    python -m benchmarks.bench_rate_limit --backend redis   # needs REDIS_URL
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.core.rate_limit import DEFAULT_LIMITS, RateLimiter, RateLimitMiddleware, default_classifier
+from app.core.security import create_access_token
+from benchmarks.harness import print_table
+
+PATHS = [
+    ("GET", "/api/v1/students/me"),
+    ("GET", "/api/v1/alumni/5f0c6f0e-8d8a-4c55-9b9e-6a1f1f3b2f44"),
+    ("POST", "/api/v1/requests"),
+    ("GET", "/api/v1/students/discover"),
+    ("POST", "/api/v1/auth/login"),
+]
+
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def make_scopes(n: int, clients: int, rng: random.Random):
+    # Real signed tokens: non-auth groups verify them to key by user
+    tokens = [create_access_token({"sub": f"user-{i}"}).encode() for i in range(clients)]
+    scopes = []
+    for _ in range(n):
+        method, path = rng.choice(PATHS)
+        headers = [(b"host", b"api"), (b"user-agent", b"bench")]
+        if path != "/api/v1/auth/login":
+            headers.append((b"authorization", b"Bearer " + rng.choice(tokens)))
+        scopes.append({
+            "type": "http",
+            "method": method,
+            "path": path,
+            "headers": headers,
+            "client": (f"10.0.{rng.randrange(256)}.{rng.randrange(256)}", 5000),
+        })
+    return scopes
+
+
+async def drive(app, scopes) -> dict:
+    statuses = {}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses[message["status"]] = statuses.get(message["status"], 0) + 1
+
+    started = time.perf_counter()
+    for scope in scopes:
+        await app(scope, receive, send)
+    return {"elapsed": time.perf_counter() - started, "statuses": statuses}
+
+
+async def main(args) -> None:
+    rng = random.Random(args.seed)
+    scopes = make_scopes(args.requests, args.clients, rng)
+    limiter = RateLimiter(default_classifier(DEFAULT_LIMITS), backend=args.backend)
+    wrapped = RateLimitMiddleware(noop_app, limiter=limiter)
+
+    await drive(noop_app, scopes[:1000])  # Warm up
+    bare = await drive(noop_app, scopes)
+    limited = await drive(wrapped, scopes)
+
+    per_request_us = (limited["elapsed"] - bare["elapsed"]) / len(scopes) * 1e6
+    print_table([{
+        "backend": args.backend,
+        "requests": len(scopes),
+        "clients": args.clients,
+        "bare_us": round(bare["elapsed"] / len(scopes) * 1e6, 2),
+        "limited_us": round(limited["elapsed"] / len(scopes) * 1e6, 2),
+        "overhead_us": round(per_request_us, 2),
+        "429s": limited["statuses"].get(429, 0),
+    }])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=("local", "redis"), default="local")
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=9)
+    asyncio.run(main(parser.parse_args()))
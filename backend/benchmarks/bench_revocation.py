@@ -0,0 +1,57 @@
+"""
+Revocation check benchmark: Bloom filter false-positive rate and latency
+
+Fills the filter with N revoked jtis (default 1M), then measures:
+- false-positive rate over N never-revoked jtis
+- per-check latency for negatives (the hot path) and positives
+
+No database or Redis needed:
+    python -m benchmarks.bench_revocation --revoked 1000000
+"""
+
+import argparse
+import time
+import uuid
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from benchmarks.harness import print_table
+
+
+def main(args) -> None:
+    bloom = BloomFilter(args.revoked, args.error_rate)
+    revoked = [uuid.uuid4().hex for _ in range(args.revoked)]
+
+    started = time.perf_counter()
+    bloom.update(revoked)
+    fill_s = time.perf_counter() - started
+
+    probes = [uuid.uuid4().hex for _ in range(args.probes)]
+    started = time.perf_counter()
+    false_positives = sum(1 for jti in probes if jti in bloom)
+    negative_s = time.perf_counter() - started
+
+    sample = revoked[: args.probes]
+    started = time.perf_counter()
+    hits = sum(1 for jti in sample if jti in bloom)
+    positive_s = time.perf_counter() - started
+    assert hits == len(sample), "Bloom filter returned a false negative"
+
+    print_table([{
+        "revoked": args.revoked,
+        "target_fp_rate": args.error_rate,
+        "observed_fp_rate": round(false_positives / len(probes), 5),
+        "filter_mb": round(bloom.size_bytes / 1e6, 2),
+        "hashes": bloom.num_hashes,
+        "fill_s": round(fill_s, 2),
+        "negative_check_us": round(negative_s / len(probes) * 1e6, 2),
+        "positive_check_us": round(positive_s / len(sample) * 1e6, 2),
+    }])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--revoked", type=int, default=1_000_000, help="Revoked jtis loaded into the filter")
+    parser.add_argument("--probes", type=int, default=1_000_000, help="Never-revoked jtis to test")
+    parser.add_argument("--error-rate", type=float, default=settings.TOKEN_REVOCATION_ERROR_RATE)
+    main(parser.parse_args())
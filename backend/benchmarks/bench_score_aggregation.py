@@ -0,0 +1,250 @@
+"""
+Score aggregation: incremental deltas vs a full recompute as history grows
+
+Grows a score_events history in steps and, at each step, times
+- applying one new batch of events through ScoreAggregator.apply_once
+  (running sums + sketch merge + score writes for the touched profiles)
+- the set-based recompute of every profile's sums from the whole log
+  (ScoreAggregator.reconcile, i.e. what re-aggregating costs)
+
+then checks the response-time sketch against exact quantiles.
+
+Runs on SQLite by default; --url postgresql+asyncpg://... for PostgreSQL
+(uses the alumni / students / score tables of that database's schema, so
+point it at a scratch database):
+    python -m benchmarks.bench_score_aggregation --history 10000,100000,500000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    JSON, BigInteger, Column, DateTime, Enum, Float, Index, Integer, MetaData, Numeric, String, Table, Uuid, func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.quantile_sketch import QuantileSketch
+from app.models.score_event import ScoreEventKind
+from app.services.score_aggregation import ScoreAggregator
+from benchmarks.harness import percentile, print_table
+
+metadata = MetaData()
+
+# The columns the aggregator touches, shaped like the app's tables
+alumni = Table(
+    "alumni",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("helpfulness_score", Numeric(5, 2), nullable=False, default=0),
+    Column("response_rate", Numeric(5, 2), nullable=False, default=0),
+    Column("avg_response_time_hours", Numeric(8, 2)),
+    Column("total_introductions", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+students = Table(
+    "students",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("reputation_score", Numeric(5, 2), nullable=False, default=0),
+    Column("total_requests", Integer, nullable=False, default=0),
+    Column("successful_introductions", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+score_events = Table(
+    "score_events",
+    metadata,
+    Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True),
+    Column("kind", Enum(ScoreEventKind), nullable=False),
+    Column("student_id", Uuid, nullable=False, index=True),
+    Column("alumni_id", Uuid, nullable=False, index=True),
+    Column("source_id", Uuid),
+    Column("response_hours", Float),
+    Column("recorded_by", String(20)),
+    Column("satisfaction", Integer),
+    Column("occurred_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("applied_at", DateTime(timezone=True)),
+)
+Index(
+    "bench_score_events_unapplied", score_events.c.id,
+    postgresql_where=score_events.c.applied_at.is_(None), sqlite_where=score_events.c.applied_at.is_(None),
+)
+
+_SUMS = [
+    Column("requests_received", Integer, nullable=False),
+    Column("approvals", Integer, nullable=False),
+    Column("declines", Integer, nullable=False),
+    Column("expirations", Integer, nullable=False),
+    Column("response_hours_sum", Float, nullable=False),
+    Column("response_time_sketch", JSON().with_variant(JSONB(), "postgresql")),
+    Column("introductions", Integer, nullable=False),
+    Column("successful_introductions", Integer, nullable=False),
+    Column("satisfaction_sum", Integer, nullable=False),
+    Column("satisfaction_count", Integer, nullable=False),
+]
+
+alumni_score_sums = Table(
+    "alumni_score_sums",
+    metadata,
+    Column("alumni_id", Uuid, primary_key=True),
+    *_SUMS,
+    Column("last_event_id", BigInteger),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+student_score_sums = Table(
+    "student_score_sums",
+    metadata,
+    Column("student_id", Uuid, primary_key=True),
+    Column("requests_sent", Integer, nullable=False),
+    Column("approvals", Integer, nullable=False),
+    Column("declines", Integer, nullable=False),
+    Column("expirations", Integer, nullable=False),
+    Column("introductions", Integer, nullable=False),
+    Column("successful_introductions", Integer, nullable=False),
+    Column("outcomes_recorded", Integer, nullable=False),
+    Column("satisfaction_sum", Integer, nullable=False),
+    Column("satisfaction_count", Integer, nullable=False),
+    Column("last_event_id", BigInteger),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+# Rough mix of a month of request / introduction / outcome traffic
+KINDS = [
+    (ScoreEventKind.REQUEST_SENT, 40),
+    (ScoreEventKind.REQUEST_APPROVED, 20),
+    (ScoreEventKind.REQUEST_DECLINED, 8),
+    (ScoreEventKind.REQUEST_EXPIRED, 5),
+    (ScoreEventKind.INTRODUCTION_MADE, 12),
+    (ScoreEventKind.INTRODUCTION_SUCCEEDED, 5),
+    (ScoreEventKind.OUTCOME_RECORDED, 10),
+]
+
+
+def response_hours(rng: random.Random) -> float:
+    """Long-tailed: most answers within a day, some after weeks"""
+    return rng.lognormvariate(2.0, 1.2)
+
+
+def make_events(rng: random.Random, count: int, alumni_ids, student_ids, applied_at):
+    kinds, weights = zip(*KINDS)
+    rows = []
+    for kind in rng.choices(kinds, weights, k=count):
+        row = {
+            "kind": kind,
+            "alumni_id": rng.choice(alumni_ids),
+            "student_id": rng.choice(student_ids),
+            "response_hours": None,
+            "recorded_by": None,
+            "satisfaction": None,
+            "applied_at": applied_at,
+        }
+        if kind in (ScoreEventKind.REQUEST_APPROVED, ScoreEventKind.REQUEST_DECLINED):
+            row["response_hours"] = response_hours(rng)
+        elif kind == ScoreEventKind.OUTCOME_RECORDED:
+            row["recorded_by"] = rng.choice(("student", "alumni"))
+            row["satisfaction"] = rng.randint(1, 5)
+        rows.append(row)
+    return rows
+
+
+async def seed(engine, args, rng: random.Random):
+    alumni_ids = [uuid.uuid4() for _ in range(args.alumni)]
+    student_ids = [uuid.uuid4() for _ in range(args.students)]
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(alumni.insert(), [{"id": i} for i in alumni_ids])
+        await conn.execute(students.insert(), [{"id": i} for i in student_ids])
+    return alumni_ids, student_ids
+
+
+async def add_history(engine, rows) -> None:
+    async with engine.begin() as conn:
+        for start in range(0, len(rows), 20_000):
+            await conn.execute(score_events.insert(), rows[start:start + 20_000])
+
+
+async def run(args) -> None:
+    url = args.url or f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'bench_score_aggregation.db')}"
+    engine = create_async_engine(url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    aggregator = ScoreAggregator(batch_size=args.batch, session_factory=sessions)
+    rng = random.Random(args.seed)
+    alumni_ids, student_ids = await seed(engine, args, rng)
+
+    results = []
+    history = 0
+    for target in (int(step) for step in args.history.split(",")):
+        # Older history arrives already applied; the repair brings the sums in line with it
+        await add_history(engine, make_events(rng, target - history, alumni_ids, student_ids, datetime.now(timezone.utc)))
+        history = target
+        await aggregator.reconcile(repair=True)
+
+        started = time.perf_counter()
+        report = await aggregator.reconcile()
+        recompute = time.perf_counter() - started
+        assert report.drifted == 0, report
+
+        timings = []
+        for _ in range(args.rounds):
+            await add_history(engine, make_events(rng, args.batch, alumni_ids, student_ids, None))
+            started = time.perf_counter()
+            applied = await aggregator.apply_once()
+            timings.append(time.perf_counter() - started)
+            assert applied == args.batch
+            history += applied
+        batch_ms = percentile(timings, 50) * 1000
+        results.append({
+            "history_events": history,
+            "apply_batch_ms": round(batch_ms, 1),
+            "per_event_us": round(batch_ms * 1000 / args.batch, 1),
+            "full_recompute_ms": round(recompute * 1000, 1),
+        })
+    await engine.dispose()
+    print_table(results)
+
+
+def sketch_accuracy(samples: int, seed: int) -> None:
+    rng = random.Random(seed)
+    values = [response_hours(rng) for _ in range(samples)]
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    ordered = sorted(values)
+    rows = []
+    for q in (0.5, 0.9, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        estimate = sketch.quantile(q)
+        rows.append({
+            "quantile": q,
+            "exact_hours": round(exact, 3),
+            "sketch_hours": round(estimate, 3),
+            "rel_error_pct": round(abs(estimate - exact) / exact * 100, 2),
+        })
+    print_table(rows)
+    print(f"{samples} values in {len(sketch.bins)} bins, {len(json.dumps(sketch.to_dict()))} bytes as JSON")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Async database URL (default: a SQLite file in the temp dir)")
+    parser.add_argument("--alumni", type=int, default=5000)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--history", default="10000,100000,500000", help="Comma-separated history sizes")
+    parser.add_argument("--batch", type=int, default=1000, help="Events per incremental batch")
+    parser.add_argument("--rounds", type=int, default=5, help="Incremental batches timed per history size")
+    parser.add_argument("--sketch-samples", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    sketch_accuracy(args.sketch_samples, args.seed)
@@ -0,0 +1,170 @@
+"""
+Full-text search benchmark: ranked alumni search on a 200k-profile corpus
+
+Seeds N synthetic alumni (role, company, industry, interests, hobbies, a
+short bio, location) through the same triggers the app installs, then
+times app.services.alumni_search queries against a LIKE scan over the
+same columns (what searching bio/current_role/interests costs without a
+text index).
+
+Runs on SQLite (FTS5 backend) by default. With --url postgresql://... the
+tsvector + GIN backend is used; tables are created in a scratch
+`bench_search` schema so an existing `alumni` table is never touched:
+    python -m benchmarks.bench_search --profiles 200000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import JSON, Column, Index, MetaData, Numeric, String, Table, Text, Uuid, create_engine, or_, select, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+
+from app.services.alumni_search import alumni_search
+from benchmarks.harness import percentile, print_table
+
+SCHEMA = "bench_search"
+
+metadata = MetaData()
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("university_id", Uuid, nullable=False, index=True),
+)
+
+alumni = Table(
+    "alumni",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("current_role", String(100)),
+    Column("current_company", String(100)),
+    Column("industry", String(100)),
+    Column("location", String(100)),
+    Column("interests", JSON().with_variant(JSONB(), "postgresql")),
+    Column("hobbies", JSON().with_variant(JSONB(), "postgresql")),
+    Column("bio", Text),
+    Column("helpfulness_score", Numeric(5, 2), nullable=False),
+    Column("search_vector", Text().with_variant(TSVECTOR(), "postgresql")),
+)
+Index("bench_alumni_search", alumni.c.search_vector, postgresql_using="gin").ddl_if(dialect="postgresql")
+
+ROLES = [
+    "Product Manager", "Software Engineer", "Data Scientist", "Investment Banker", "Nurse", "Teacher",
+    "Consultant", "Designer", "Marketing Manager", "Financial Analyst", "Research Scientist", "Attorney",
+]
+INDUSTRIES = ["Fintech", "Healthcare", "Education", "Consulting", "Technology", "Finance", "Legal", "Media"]
+TAGS = [
+    "climbing", "hiking", "chess", "running", "photography", "cooking", "piano", "soccer", "investing",
+    "writing", "travel", "yoga", "robotics", "gardening", "podcasts", "cycling", "painting", "tennis",
+]
+CITIES = ["Boston", "New York", "San Francisco", "Seattle", "Austin", "Chicago", "Denver", "Atlanta"]
+FILLER = [f"w{i}" for i in range(5000)]  # long tail vocabulary for bios
+
+QUERIES = {
+    "4 terms": "product manager fintech climbing",
+    "2 terms": "software engineer",
+    "role + city": "nurse boston",
+    "rare bio word": "w4321",
+}
+
+
+def seed(engine, profiles: int, universities: int) -> uuid.UUID:
+    rng = random.Random(5)
+    university_ids = [uuid.uuid4() for _ in range(universities)]
+    # Zipf-ish bio vocabulary
+    weights = [1 / (i + 1) for i in range(len(FILLER))]
+    metadata.drop_all(engine)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.execute(text("DROP TABLE IF EXISTS alumni_fts"))
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        alumni_search.install(conn)
+        user_batch, alumni_batch = [], []
+        for i in range(profiles):
+            alumni_id = uuid.uuid4()
+            role = rng.choice(ROLES)
+            user_batch.append({"id": alumni_id, "university_id": rng.choice(university_ids)})
+            alumni_batch.append({
+                "id": alumni_id,
+                "current_role": role,
+                "current_company": f"Company {rng.randrange(2000)}",
+                "industry": rng.choice(INDUSTRIES),
+                "location": rng.choice(CITIES),
+                "interests": rng.sample(TAGS, rng.randint(1, 4)),
+                "hobbies": rng.sample(TAGS, rng.randint(0, 3)),
+                "bio": f"{role} who enjoys " + " ".join(rng.choices(FILLER, weights=weights, k=rng.randint(10, 30))),
+                "helpfulness_score": round(rng.uniform(0, 5), 2),
+            })
+            if len(alumni_batch) == 10_000 or i == profiles - 1:
+                conn.execute(users.insert(), user_batch)
+                conn.execute(alumni.insert(), alumni_batch)
+                user_batch, alumni_batch = [], []
+    return university_ids[0]
+
+
+def like_scan(query: str, university_id, limit: int):
+    """Match any term anywhere in the searchable columns, best-helpfulness first"""
+    a = alumni.c
+    columns = (a.current_role, a.current_company, a.industry, a.location, a.bio)
+    terms = query.lower().split()
+    predicate = or_(*(column.ilike(f"%{term}%") for term in terms for column in columns))
+    statement = select(a.id).where(predicate).order_by(a.helpfulness_score.desc()).limit(limit)
+    if university_id is not None:
+        statement = statement.join(users, users.c.id == a.id).where(users.c.university_id == university_id)
+    return statement
+
+
+def timed(fn, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main(args) -> None:
+    if args.url and args.url.startswith("postgresql"):
+        engine = create_engine(args.url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
+    else:
+        engine = create_engine(args.url or f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_search.db')}")
+
+    print(f"Seeding {args.profiles} profiles into {engine.url.render_as_string(hide_password=True)}")
+    started = time.perf_counter()
+    university_id = seed(engine, args.profiles, args.universities)
+    print(f"seeded in {time.perf_counter() - started:.1f}s (index maintained by triggers)")
+
+    rows = []
+    with engine.connect() as conn:
+        for scope, scope_id in (("all", None), ("one university", university_id)):
+            for name, query in QUERIES.items():
+                searched = timed(lambda: alumni_search.search_sync(conn, query, scope_id, args.limit), args.repeats)
+                scan = like_scan(query, scope_id, args.limit)
+                scanned = timed(lambda: conn.execute(scan).all(), max(1, args.repeats // 10))
+                rows.append({
+                    "query": name,
+                    "scope": scope,
+                    "hits": len(alumni_search.search_sync(conn, query, scope_id, args.limit)),
+                    "search_p50_ms": round(percentile(searched, 50) * 1e3, 2),
+                    "search_p99_ms": round(percentile(searched, 99) * 1e3, 2),
+                    "like_scan_p50_ms": round(percentile(scanned, 50) * 1e3, 2),
+                })
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Database URL (default: a SQLite file in the temp dir)")
+    parser.add_argument("--profiles", type=int, default=200_000)
+    parser.add_argument("--universities", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,143 @@
+"""
+Response serialization micro-benchmarks
+
+Per response body, compares
+- fastapi: what FastAPI does for `return model` with a response_model
+  (dump, re-validate, serialize, json.dumps via JSONResponse)
+- fastapi+orjson: the same with FastJSONResponse as the default response
+  class (endpoints that return models without wrapping them)
+- one pass: `FastJSONResponse(model)`, pydantic-core straight to bytes
+
+for UserResponse, TokenResponse (typed `user`, and the old `user: dict`
+shape) and a 50-item discover page. All paths must produce the same JSON.
+
+    python -m benchmarks.bench_serialization --iterations 20000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.core.responses import FastJSONResponse
+from app.models.user import UserRole
+from app.schemas.auth import TokenResponse, TokenUser, UserResponse
+from app.schemas.discover import DiscoverAlumni, DiscoverPage, SharedContextItem
+from app.schemas.pagination import PaginationInfo
+from benchmarks.harness import print_table
+
+
+class UntypedTokenResponse(BaseModel):
+    """TokenResponse as it was, with `user: dict`"""
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+    user: dict
+
+
+def make_bodies(rng: random.Random) -> dict:
+    user_id = uuid.uuid4()
+    token = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9." + "x" * 180 + "." + "s" * 43
+    user = {"id": user_id, "email": "student@university.edu", "role": UserRole.STUDENT, "email_verified": True}
+    roles = ["Product Manager", "Software Engineer", "Data Scientist", "Consultant", "Designer"]
+    companies = ["Tech Corp", "Acme", "Globex", "Initech", "Umbrella"]
+    contexts = ["same_major", "same_company_interest", "shared_interest", "shared_hobby", "same_location"]
+    page = DiscoverPage(
+        data=[
+            DiscoverAlumni(
+                id=uuid.uuid4(),
+                name=f"Alumni {i}",
+                current_role=rng.choice(roles),
+                current_company=rng.choice(companies),
+                industry="Technology",
+                location="San Francisco, CA",
+                shared_context=[
+                    SharedContextItem(type=kind, value=f"value {j}")
+                    for j, kind in enumerate(rng.sample(contexts, rng.randint(1, 4)))
+                ],
+                helpfulness_score=round(rng.uniform(0, 5), 2),
+                response_rate=round(rng.random(), 2),
+            )
+            for i in range(50)
+        ],
+        pagination=PaginationInfo(next_cursor="eyJrIjpbNC41LCJhYmMiXX0", has_more=True),
+    )
+    return {
+        "UserResponse": UserResponse(
+            id=user_id, email=user["email"], role=UserRole.STUDENT, email_verified=True,
+            created_at=datetime.now(timezone.utc),
+        ),
+        "TokenResponse": TokenResponse(
+            access_token=token, refresh_token=token, expires_in=1800, user=TokenUser(**user),
+        ),
+        "TokenResponse (user: dict)": UntypedTokenResponse(
+            access_token=token, refresh_token=token, expires_in=1800,
+            user={**user, "id": str(user_id), "role": user["role"].value},
+        ),
+        "discover page (50)": page,
+    }
+
+
+async def fastapi_default(field, model, response_class) -> bytes:
+    content = await serialize_response(field=field, response_content=model)
+    return response_class(content).body
+
+
+async def time_path(call, iterations: int, repeats: int) -> float:
+    """Median microseconds per call"""
+    runs = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await call()
+        runs.append((time.perf_counter() - started) / iterations * 1e6)
+    return statistics.median(runs)
+
+
+async def main(args) -> None:
+    rows = []
+    for name, model in make_bodies(random.Random(args.seed)).items():
+        field = create_response_field(name="response", type_=type(model))
+
+        async def default_path():
+            return await fastapi_default(field, model, JSONResponse)
+
+        async def orjson_path():
+            return await fastapi_default(field, model, FastJSONResponse)
+
+        async def one_pass():
+            return FastJSONResponse(model).body
+
+        bodies = [await path() for path in (default_path, orjson_path, one_pass)]
+        assert all(json.loads(body) == json.loads(bodies[0]) for body in bodies), f"{name}: outputs differ"
+
+        default_us = await time_path(default_path, args.iterations, args.repeats)
+        orjson_us = await time_path(orjson_path, args.iterations, args.repeats)
+        one_pass_us = await time_path(one_pass, args.iterations, args.repeats)
+        rows.append({
+            "body": name,
+            "bytes": len(bodies[2]),
+            "fastapi_us": round(default_us, 2),
+            "fastapi+orjson_us": round(orjson_us, 2),
+            "one_pass_us": round(one_pass_us, 2),
+            "speedup": f"{default_us / one_pass_us:.1f}x",
+        })
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=2)
+    asyncio.run(main(parser.parse_args()))
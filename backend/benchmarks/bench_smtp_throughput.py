@@ -0,0 +1,82 @@
+"""
+SMTP throughput benchmark: per-message connections vs pooled sessions
+
+Sends N messages through EmailService to a local SMTP sink that adds a
+fixed delay to every reply, emulating a remote provider's round trips.
+"per-message" retires each session after one message (the previous
+behaviour: connect, login, send, quit); "pooled" reuses authenticated
+sessions across messages, with 1 and `--threads` senders.
+
+No external services needed:
+    python -m benchmarks.bench_smtp_throughput --messages 500 --latency-ms 2
+"""
+
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.email_service import EmailService, SMTPConnectionPool
+from benchmarks.harness import print_table
+from benchmarks.smtp_sink import SMTPSink
+
+
+def build_service(port: int, pool_size: int, max_messages: int) -> EmailService:
+    service = EmailService()
+    service.smtp_host = "127.0.0.1"
+    service.smtp_port = port
+    service.smtp_user = "bench"
+    service.smtp_password = "bench"
+    service.smtp_use_tls = False
+    service.email_from = "bench@alumni-connect.local"
+    service.pool = SMTPConnectionPool(service._connect, max_size=pool_size, max_messages=max_messages)
+    return service
+
+
+def run(service: EmailService, messages: int, threads: int) -> float:
+    def send(i: int) -> bool:
+        return service.send_verification_email(f"user{i}@example.edu", f"token-{i}", f"user{i}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(send, range(messages)))
+    elapsed = time.perf_counter() - started
+    service.pool.close_all()
+    assert all(results), "Some messages failed to send"
+    return elapsed
+
+
+def main(args) -> None:
+    sink = SMTPSink(port=0, latency_ms=args.latency_ms).start()
+    scenarios = [
+        ("per-message", 1, 1),
+        ("pooled", 1, 10**9),
+        ("per-message", args.threads, 1),
+        ("pooled", args.threads, 10**9),
+    ]
+    rows = []
+    try:
+        for name, threads, max_messages in scenarios:
+            service = build_service(sink.port, threads, max_messages)
+            # EmailService logs every send; keep the benchmark output readable
+            with redirect_stdout(io.StringIO()):
+                elapsed = run(service, args.messages, threads)
+            rows.append({
+                "mode": name,
+                "senders": threads,
+                "messages": args.messages,
+                "connections": service.pool.connects,
+                "msgs_per_s": round(args.messages / elapsed, 1),
+            })
+    finally:
+        sink.stop()
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent senders / pool size")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Sink delay per SMTP reply")
+    main(parser.parse_args())
@@ -0,0 +1,167 @@
+"""
+Tenant-scoped query benchmark: 500 universities sharing the users table
+
+Seeds users (students and alumni, mostly active) spread over N
+universities, then times the queries the app runs per tenant, built with
+app.services.tenancy.scope_to_university, under three users index
+layouts:
+- none: no index on the tenant columns (every query scans all tenants)
+- university_id: the previous standalone index
+- tenant: idx_users_tenant (university_id, role, status) INCLUDE (id)
+
+Runs on SQLite by default. With --url postgresql://... tables are
+created in a scratch `bench_tenant` schema so the real ones are never
+touched:
+    python -m benchmarks.bench_tenant_queries --tenants 500 --users 250000 --explain
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import Column, Enum, Index, MetaData, Numeric, Table, Uuid, create_engine, func, select, text
+
+from app.models.alumni import Alumni
+from app.models.student import Student
+from app.models.user import User, UserRole, UserStatus
+from app.services.tenancy import scope_to_university
+from benchmarks.harness import percentile, print_table
+
+SCHEMA = "bench_tenant"
+
+metadata = MetaData()
+
+# Only the columns the tenant queries touch
+users = Table(
+    "users",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("university_id", Uuid, nullable=False),
+    Column("role", Enum(UserRole), nullable=False),
+    Column("status", Enum(UserStatus), nullable=False),
+)
+
+alumni = Table(
+    "alumni",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("helpfulness_score", Numeric(5, 2), nullable=False),
+)
+
+students = Table(
+    "students",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+)
+
+LAYOUTS = {
+    "none": [],
+    "university_id": [Index("ix_users_university_id", users.c.university_id)],
+    "tenant": [Index(
+        "idx_users_tenant", users.c.university_id, users.c.role, users.c.status, postgresql_include=["id"],
+    )],
+}
+
+QUERIES = {
+    "top alumni": lambda tenant, limit: scope_to_university(
+        select(Alumni.id), tenant, Alumni,
+    ).order_by(Alumni.helpfulness_score.desc()).limit(limit),
+    "all active alumni": lambda tenant, limit: scope_to_university(select(Alumni.id), tenant, Alumni),
+    "count students": lambda tenant, limit: scope_to_university(
+        select(func.count()).select_from(Student), tenant, Student,
+    ),
+    "tenant user ids": lambda tenant, limit: scope_to_university(select(User.id), tenant),
+}
+
+
+def seed(engine, user_count: int, tenant_count: int) -> list:
+    rng = random.Random(23)
+    tenants = [uuid.uuid4() for _ in range(tenant_count)]
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        user_batch, alumni_batch, student_batch = [], [], []
+        for i in range(user_count):
+            user_id = uuid.uuid4()
+            role = UserRole.ALUMNI if rng.random() < 0.4 else UserRole.STUDENT
+            status = UserStatus.ACTIVE if rng.random() < 0.9 else rng.choice([UserStatus.INACTIVE, UserStatus.SUSPENDED])
+            user_batch.append({"id": user_id, "university_id": rng.choice(tenants), "role": role, "status": status})
+            if role == UserRole.ALUMNI:
+                alumni_batch.append({"id": user_id, "helpfulness_score": round(rng.uniform(0, 5), 2)})
+            else:
+                student_batch.append({"id": user_id})
+            if len(user_batch) == 10_000 or i == user_count - 1:
+                conn.execute(users.insert(), user_batch)
+                if alumni_batch:
+                    conn.execute(alumni.insert(), alumni_batch)
+                if student_batch:
+                    conn.execute(students.insert(), student_batch)
+                user_batch, alumni_batch, student_batch = [], [], []
+    return tenants
+
+
+def apply_layout(engine, layout: str) -> None:
+    with engine.begin() as conn:
+        for indexes in LAYOUTS.values():
+            for index in indexes:
+                index.drop(conn, checkfirst=True)
+        for index in LAYOUTS[layout]:
+            index.create(conn)
+        conn.execute(text("ANALYZE"))
+
+
+def explain(conn, statement) -> str:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    sql = str(statement.compile(conn, compile_kwargs={"literal_binds": True}))
+    return "\n".join(f"    {row[-1]}" for row in conn.exec_driver_sql(prefix + sql))
+
+
+def main(args) -> None:
+    if args.url and args.url.startswith("postgresql"):
+        engine = create_engine(args.url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}"))
+    else:
+        engine = create_engine(args.url or f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_tenant_queries.db')}")
+
+    print(f"Seeding {args.users} users over {args.tenants} tenants into {engine.url.render_as_string(hide_password=True)}")
+    started = time.perf_counter()
+    tenants = seed(engine, args.users, args.tenants)
+    print(f"seeded in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(7)
+    rows = []
+    for layout in args.layouts.split(","):
+        apply_layout(engine, layout)
+        with engine.connect() as conn:
+            for name, build in QUERIES.items():
+                samples = []
+                for _ in range(args.repeats):
+                    statement = build(rng.choice(tenants), args.limit)
+                    query_started = time.perf_counter()
+                    conn.execute(statement).all()
+                    samples.append(time.perf_counter() - query_started)
+                rows.append({
+                    "layout": layout,
+                    "query": name,
+                    "p50_ms": round(percentile(samples, 50) * 1e3, 3),
+                    "p99_ms": round(percentile(samples, 99) * 1e3, 3),
+                })
+                if args.explain:
+                    print(f"[{layout}] {name}:\n{explain(conn, build(tenants[0], args.limit))}")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Database URL (default: a SQLite file in the temp dir)")
+    parser.add_argument("--tenants", type=int, default=500)
+    parser.add_argument("--users", type=int, default=250_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--layouts", default=",".join(LAYOUTS))
+    parser.add_argument("--explain", action="store_true", help="Print each query's plan per layout")
+    main(parser.parse_args())
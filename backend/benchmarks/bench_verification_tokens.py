@@ -0,0 +1,202 @@
+"""
+Verification tokens: verify latency as the table grows, and the batched purge
+
+Grows an email_verification_tokens table in steps, mostly dead rows (used
+or expired, as an unpurged table accumulates) plus outstanding ones. At
+each step it times verifying an outstanding token:
+- two-selects: the previous flow (select the token, select the user,
+  update both)
+- consume: app.services.verification_tokens.consume_token
+
+then purges the dead rows with VerificationTokenPurger. It reports the
+longest single batch (the longest any purge transaction holds its locks)
+and times consume again on the purged table.
+
+Runs on SQLite by default; --url postgresql+asyncpg://... for PostgreSQL
+(creates users / email_verification_tokens in that database's schema, so
+point it at a scratch database):
+    python -m benchmarks.bench_verification_tokens --sizes 10000,100000,1000000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, ForeignKey, Index, MetaData, String, Table, Uuid, false, func, select, true, update,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.verification_tokens import VerificationTokenPurger, consume_token
+from benchmarks.harness import percentile, print_table
+
+metadata = MetaData()
+
+# The columns verification touches, shaped like the app's tables
+users = Table(
+    "users",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("email_verified", Boolean, nullable=False, default=False),
+    Column("email_verified_at", DateTime(timezone=True)),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+tokens = Table(
+    "email_verification_tokens",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("user_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("token", String(255), unique=True, nullable=False),
+    Column("token_type", String(50), nullable=False),
+    Column("expires_at", DateTime(timezone=True), nullable=False, index=True),
+    Column("used", Boolean, nullable=False, default=False),
+)
+Index("bench_tokens_used", tokens.c.id,
+      postgresql_where=tokens.c.used == true(), sqlite_where=tokens.c.used == true())
+
+
+def make_rows(rng: random.Random, count: int, live_share: float):
+    """Users with one token each; live_share of them still outstanding"""
+    now = datetime.utcnow()
+    user_rows, token_rows, live = [], [], []
+    for _ in range(count):
+        user_id = uuid.uuid4()
+        token = uuid.uuid4().hex
+        outstanding = rng.random() < live_share
+        used = not outstanding and rng.random() < 0.7
+        user_rows.append({"id": user_id, "email_verified": used})
+        token_rows.append({
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "token": token,
+            "token_type": "email_verification",
+            # Unused dead tokens are the expired ones
+            "expires_at": now + timedelta(days=1) if outstanding or used else now - timedelta(days=rng.randint(1, 365)),
+            "used": used,
+        })
+        if outstanding:
+            live.append(token)
+    return user_rows, token_rows, live
+
+
+async def insert(engine, user_rows, token_rows) -> None:
+    async with engine.begin() as conn:
+        for start in range(0, len(user_rows), 20_000):
+            await conn.execute(users.insert(), user_rows[start:start + 20_000])
+            await conn.execute(tokens.insert(), token_rows[start:start + 20_000])
+
+
+async def verify_two_selects(sessions, token: str) -> bool:
+    async with sessions() as session:
+        now = datetime.utcnow()
+        row = (await session.execute(
+            select(tokens.c.id, tokens.c.user_id).where(
+                tokens.c.token == token,
+                tokens.c.token_type == "email_verification",
+                tokens.c.used == false(),
+                tokens.c.expires_at > now,
+            )
+        )).first()
+        if row is None:
+            return False
+        user = (await session.execute(select(users).where(users.c.id == row.user_id))).first()
+        await session.execute(update(users).where(users.c.id == user.id).values(email_verified=True, email_verified_at=now))
+        await session.execute(update(tokens).where(tokens.c.id == row.id).values(used=True))
+        await session.commit()
+        return True
+
+
+async def verify_consume(sessions, token: str) -> bool:
+    async with sessions() as session:
+        user_id = await consume_token(session, token)
+        await session.commit()
+        return user_id is not None
+
+
+async def timed(verify, sessions, live, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        token = live.pop()
+        started = time.perf_counter()
+        assert await verify(sessions, token)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def run(args) -> None:
+    url = args.url or f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'bench_verification_tokens.db')}"
+    engine = create_async_engine(url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+
+    rng = random.Random(args.seed)
+    purger = VerificationTokenPurger(batch_size=args.batch, pause_seconds=0, session_factory=sessions)
+    original_batch = purger.purge_batch
+    batch_times = []
+
+    async def timed_batch(dead):
+        started = time.perf_counter()
+        try:
+            return await original_batch(dead)
+        finally:
+            batch_times.append(time.perf_counter() - started)
+
+    purger.purge_batch = timed_batch
+
+    async def count() -> int:
+        async with engine.connect() as conn:
+            return (await conn.execute(select(func.count()).select_from(tokens))).scalar()
+
+    rows = []
+    live = []
+    for target in (int(step) for step in args.sizes.split(",")):
+        # Grow the (purged) table back to `target`, plus outstanding tokens for every timed verify
+        user_rows, token_rows, fresh = make_rows(rng, max(0, target - await count()), args.live_share)
+        spare_users, spare_tokens, spare = make_rows(rng, 3 * args.repeats, 1.0)
+        await insert(engine, user_rows + spare_users, token_rows + spare_tokens)
+        live = fresh + spare + live
+        rng.shuffle(live)
+
+        table_rows = await count()
+        two_selects = await timed(verify_two_selects, sessions, live, args.repeats)
+        consume = await timed(verify_consume, sessions, live, args.repeats)
+
+        batch_times.clear()
+        started = time.perf_counter()
+        deleted = await purger.purge_once()
+        purge_seconds = time.perf_counter() - started
+        purged_rows = await count()
+        purged_consume = await timed(verify_consume, sessions, live, args.repeats)
+
+        rows.append({
+            "table_rows": table_rows,
+            "two_selects_p50_ms": round(percentile(two_selects, 50) * 1e3, 3),
+            "consume_p50_ms": round(percentile(consume, 50) * 1e3, 3),
+            "consume_p99_ms": round(percentile(consume, 99) * 1e3, 3),
+            "purged": deleted,
+            "purge_s": round(purge_seconds, 2),
+            "max_batch_ms": round(max(batch_times) * 1e3, 1),
+            "rows_after": purged_rows,
+            "consume_after_p50_ms": round(percentile(purged_consume, 50) * 1e3, 3),
+        })
+    print_table(rows)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Async database URL (default: a SQLite file in the temp dir)")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Table rows before each purge")
+    parser.add_argument("--live-share", type=float, default=0.05, help="Share of issued tokens still outstanding")
+    parser.add_argument("--batch", type=int, default=1000, help="Purge batch size")
+    parser.add_argument("--repeats", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=24)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,92 @@
+"""
+Shared helpers for benchmark scripts
+
+Run benchmarks from the backend/ directory, e.g.:
+    python -m benchmarks.bench_async_db --help
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples (pct in 0-100)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class RunResult:
+    """Latency samples and throughput for one benchmark run"""
+    concurrency: int
+    elapsed: float
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.rps, 1),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 2),
+        }
+
+
+async def run_concurrent(
+    call: Callable[[], Awaitable[bool]],
+    concurrency: int,
+    total: int,
+) -> RunResult:
+    """
+    Issue `total` calls with at most `concurrency` in flight.
+
+    `call` returns True on success; failures are counted but not timed.
+    """
+    remaining = total
+    result = RunResult(concurrency=concurrency, elapsed=0.0)
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                ok = await call()
+            except Exception:
+                ok = False
+            if ok:
+                result.latencies.append(time.perf_counter() - started)
+            else:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def print_table(rows: List[dict]) -> None:
+    """Print a list of uniform dicts as an aligned text table"""
+    if not rows:
+        return
+    headers = list(rows[0].keys())
+    widths = {h: max(len(h), *(len(str(r[h])) for r in rows)) for h in headers}
+    print("  ".join(h.rjust(widths[h]) for h in headers))
+    for row in rows:
+        print("  ".join(str(row[h]).rjust(widths[h]) for h in headers))
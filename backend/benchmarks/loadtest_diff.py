@@ -0,0 +1,78 @@
+"""
+Compare two benchmarks.loadtest result files
+
+Matches rows by scenario and concurrency. For each row it prints the
+baseline and candidate throughput and latency percentiles, with the
+relative change. A row is flagged when throughput drops, or p50/p95/p99
+rises, by more than --threshold percent, or when the candidate has errors
+the baseline did not. The exit status is 1 if anything was flagged:
+    python -m benchmarks.loadtest_diff /tmp/loadtest/abc1234.json /tmp/loadtest/def5678.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.harness import print_table
+
+# Metric -> True when higher is better
+METRICS = {"rps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def change(before: float, after: float) -> Optional[float]:
+    """Relative change in percent (None when the baseline is zero)"""
+    return (after - before) / before * 100 if before else None
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> Tuple[List[dict], List[str]]:
+    before: Dict[tuple, dict] = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    rows, regressions = [], []
+    for result in candidate["results"]:
+        key = (result["scenario"], result["concurrency"])
+        base = before.get(key)
+        if base is None:
+            continue
+        row = {"scenario": key[0], "concurrency": key[1]}
+        for metric, higher_is_better in METRICS.items():
+            delta = change(base[metric], result[metric])
+            row[metric] = f"{base[metric]} -> {result[metric]}"
+            row[f"{metric}_change"] = "n/a" if delta is None else f"{delta:+.1f}%"
+            worse = delta is not None and (-delta if higher_is_better else delta) > threshold
+            if worse:
+                regressions.append(f"{key[0]} c={key[1]}: {metric} {row[f'{metric}_change']}")
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{key[0]} c={key[1]}: errors {base['errors']} -> {result['errors']}")
+        row["errors"] = f"{base['errors']} -> {result['errors']}"
+        rows.append(row)
+    return rows, regressions
+
+
+def main(args) -> int:
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    print(f"baseline:  {baseline['git']['commit']}{' (dirty)' if baseline['git']['dirty'] else ''}")
+    print(f"candidate: {candidate['git']['commit']}{' (dirty)' if candidate['git']['dirty'] else ''}")
+    if baseline["parameters"] != candidate["parameters"] or baseline["environment"] != candidate["environment"]:
+        print("warning: the runs used different parameters or environments")
+    print()
+    rows, regressions = compare(baseline, candidate, args.threshold)
+    print_table(rows)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:g}%:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline", help="Result file of the reference commit")
+    parser.add_argument("candidate", help="Result file to check")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change flagged as a regression")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,140 @@
+"""
+Local SMTP stand-in (aiosmtpd-style sink) for benchmarks and manual testing
+
+Accepts EHLO/HELO, AUTH PLAIN/LOGIN (any credentials), MAIL, RCPT, DATA,
+NOOP, RSET and QUIT, counts delivered messages and discards them. An
+optional per-command latency emulates a remote server's round trips.
+STARTTLS is not offered, so point the app at it with SMTP_USE_TLS=false.
+
+Standalone:
+    python -m benchmarks.smtp_sink --port 8025 --latency-ms 5
+    SMTP_HOST=localhost SMTP_PORT=8025 SMTP_USER=dev SMTP_USE_TLS=false \\
+        python -m app.services.email_outbox --once
+
+In-process (runs on its own thread so blocking smtplib clients can use it):
+    sink = SMTPSink(port=0).start()
+    ... connect to sink.port ...
+    sink.stop()
+"""
+
+import argparse
+import asyncio
+import threading
+from typing import Optional
+
+
+class SMTPSink:
+    """Minimal asyncio SMTP server that swallows messages"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8025, latency_ms: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency_ms / 1000.0
+        self.messages = 0
+        self.connections = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: str) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(line.encode() + b"\r\n")
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await self._reply(writer, "220 smtp-sink ready")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    writer.write(b"250-smtp-sink\r\n250-8BITMIME\r\n250-AUTH PLAIN LOGIN\r\n")
+                    await self._reply(writer, "250 SIZE 52428800")
+                elif verb == "HELO":
+                    await self._reply(writer, "250 smtp-sink")
+                elif verb == "AUTH":
+                    parts = command.split()
+                    if len(parts) >= 2 and parts[1].upper() == "LOGIN":
+                        # Username/password prompts; the values are ignored
+                        if len(parts) == 2:
+                            await self._reply(writer, "334 VXNlcm5hbWU6")
+                            await reader.readline()
+                        await self._reply(writer, "334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    await self._reply(writer, "235 2.7.0 Authentication successful")
+                elif verb == "DATA":
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    while True:
+                        data_line = await reader.readline()
+                        if not data_line or data_line in (b".\r\n", b".\n"):
+                            break
+                    self.messages += 1
+                    await self._reply(writer, "250 2.0.0 Ok: queued")
+                elif verb == "QUIT":
+                    await self._reply(writer, "221 2.0.0 Bye")
+                    break
+                elif verb in ("MAIL", "RCPT", "NOOP", "RSET"):
+                    await self._reply(writer, "250 2.0.0 Ok")
+                else:
+                    await self._reply(writer, "502 5.5.2 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self) -> "SMTPSink":
+        """Run the sink on a background thread; returns once it is listening"""
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.serve())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None and self._server is not None:
+            async def shutdown():
+                self._server.close()
+                for task in asyncio.all_tasks():
+                    if task is not asyncio.current_task():
+                        task.cancel()
+
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local SMTP sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before every reply")
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.host, args.port, args.latency_ms)
+    print(f"[SMTP SINK] Listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(sink.serve())
+    except KeyboardInterrupt:
+        print(f"[SMTP SINK] Received {sink.messages} messages")
@@ -0,0 +1,182 @@
+"""
+Capacity stress test: concurrent reservations never oversell
+
+Creates alumni with small monthly limits (half of them carrying a full
+counter from last month, which must read as empty), then fires many
+concurrent reservations at them and checks, per alumni:
+- granted reservations == min(attempts, max_requests_per_month)
+- the stored counter equals the granted count for the current month
+
+`--naive` runs the same load through a read-then-write implementation
+for comparison (it oversells, or fails with lock errors on SQLite).
+
+Runs on SQLite by default; --url postgresql+asyncpg://... for PostgreSQL.
+--backend redis exercises the Lua counters (REDIS_URL) plus write-back:
+    python -m benchmarks.stress_capacity --alumni 50 --attempts 40 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections import Counter
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, Uuid, func, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.capacity import (
+    CapacityExceededError,
+    CapacityService,
+    RedisCapacityBackend,
+    SqlCapacityBackend,
+    month_key,
+)
+from benchmarks.harness import print_table
+
+metadata = MetaData()
+
+# The columns the capacity service touches, shaped like `alumni`
+alumni = Table(
+    "alumni",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("max_requests_per_month", Integer, nullable=False),
+    Column("current_month_requests", Integer, nullable=False),
+    Column("capacity_month", Integer, nullable=True),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+def previous_month(month: int) -> int:
+    year, m = divmod(month, 100)
+    return (year - 1) * 100 + 12 if m == 1 else month - 1
+
+
+async def seed(engine, count: int, rng: random.Random, month: int) -> dict:
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+        await conn.run_sync(metadata.create_all)
+        limits = {}
+        rows = []
+        for i in range(count):
+            alumni_id, limit = uuid.uuid4(), rng.randint(1, 10)
+            limits[alumni_id] = limit
+            # Every other alumni is full from last month: that must not count now
+            stale = i % 2 == 0
+            rows.append({
+                "id": alumni_id,
+                "max_requests_per_month": limit,
+                "current_month_requests": limit if stale else 0,
+                "capacity_month": previous_month(month) if stale else None,
+            })
+        await conn.execute(alumni.insert(), rows)
+    return limits
+
+
+async def naive_reserve(session, alumni_id) -> bool:
+    """Read-modify-write, as an ORM `if a.used < a.max: a.used += 1` would do"""
+    used, limit = (await session.execute(
+        select(alumni.c.current_month_requests, alumni.c.max_requests_per_month).where(alumni.c.id == alumni_id)
+    )).one()
+    await asyncio.sleep(0)  # Other requests run between the read and the write
+    if used >= limit:
+        return False
+    await session.execute(update(alumni).where(alumni.c.id == alumni_id).values(current_month_requests=used + 1))
+    return True
+
+
+async def run(args, engine, backend_name: str, naive: bool) -> dict:
+    rng = random.Random(args.seed)
+    month = month_key()
+    limits = await seed(engine, args.alumni, rng, month)
+    if naive:
+        # Naive code has no month logic; start everyone from an empty counter
+        async with engine.begin() as conn:
+            await conn.execute(update(alumni).values(current_month_requests=0, capacity_month=month))
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    backend = RedisCapacityBackend(session_factory=sessions) if backend_name == "redis" else SqlCapacityBackend()
+    service = CapacityService(backend)
+
+    targets = [alumni_id for alumni_id in limits for _ in range(args.attempts)]
+    rng.shuffle(targets)
+    granted, errors = Counter(), Counter()
+    queue = asyncio.Queue()
+    for alumni_id in targets:
+        queue.put_nowait(alumni_id)
+
+    async def worker():
+        while not queue.empty():
+            alumni_id = queue.get_nowait()
+            try:
+                async with sessions() as session:
+                    if naive:
+                        ok = await naive_reserve(session, alumni_id)
+                    else:
+                        try:
+                            await service.reserve(session, alumni_id)
+                            ok = True
+                        except CapacityExceededError:
+                            ok = False
+                    await session.commit()
+                if ok:
+                    granted[alumni_id] += 1
+            except OperationalError:
+                errors[alumni_id] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    if backend_name == "redis" and not naive:
+        while await backend.write_back() > 0:
+            pass
+
+    async with engine.connect() as conn:
+        stored = {
+            row.id: (row.current_month_requests if row.capacity_month == month else 0)
+            for row in await conn.execute(select(alumni))
+        }
+    oversold = sum(max(0, granted[a] - limits[a]) for a in limits)
+    undersold = sum(max(0, min(args.attempts, limits[a]) - granted[a]) for a in limits if not errors[a])
+    mismatched = sum(1 for a in limits if stored[a] != granted[a])
+    return {
+        "mode": "naive" if naive else backend_name,
+        "attempts": len(targets),
+        "granted": sum(granted.values()),
+        "oversold": oversold,
+        "undersold": undersold,
+        "counter_mismatch": mismatched,
+        "lock_errors": sum(errors.values()),
+        "reservations_per_s": round(len(targets) / elapsed),
+    }
+
+
+async def main(args) -> None:
+    url = args.url or f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'stress_capacity.db')}"
+    engine = create_async_engine(url, pool_size=args.concurrency, max_overflow=0) if url.startswith("postgresql") \
+        else create_async_engine(url, connect_args={"timeout": 30})
+    rows = [await run(args, engine, args.backend, naive=False)]
+    if args.naive:
+        rows.append(await run(args, engine, args.backend, naive=True))
+    await engine.dispose()
+    print_table(rows)
+    checked = rows[0]
+    assert checked["oversold"] == 0, "capacity oversold"
+    assert checked["undersold"] == 0, "capacity left unused"
+    assert checked["counter_mismatch"] == 0, "stored counters disagree with grants"
+    print("OK: no oversell, stored counters match")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="Async database URL (default: a SQLite file in the temp dir)")
+    parser.add_argument("--backend", choices=("sql", "redis"), default="sql")
+    parser.add_argument("--alumni", type=int, default=50)
+    parser.add_argument("--attempts", type=int, default=40, help="Reservations fired at each alumni")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--naive", action="store_true", help="Also run a read-then-write implementation")
+    parser.add_argument("--seed", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
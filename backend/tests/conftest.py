@@ -0,0 +1,35 @@
+"""
+Shared test fixtures
+
+Tests run the app against a throwaway SQLite database, without Redis or
+the background workers, so they need no services. The environment is set
+before `app` is imported (settings are read at import time).
+"""
+
+import os
+import tempfile
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="alumni-connect-tests-"), "test.db")
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DEBUG", "false")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ["DATABASE_URL_ASYNC"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ["DATABASE_REPLICA_URLS"] = "[]"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["PRINCIPAL_CACHE_REDIS_ENABLED"] = "false"
+for worker in ("EMAIL_OUTBOX", "SHARED_CONTEXT", "ALUMNI_CHANGES", "SCORE", "TOKEN_PURGE"):
+    os.environ[f"{worker}_WORKER_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.core.database import init_db
+    from app.main import app
+
+    init_db()
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,68 @@
+"""
+SQL round-trip budgets of the auth endpoints
+
+Each test fails when its endpoint starts making more queries than it
+does today; lower the budget when a change saves a round trip.
+"""
+
+import uuid
+
+from app.core.query_stats import assert_max_queries
+from app.services.principal_cache import principal_cache
+
+PASSWORD = "password123"
+
+
+def register(client, email):
+    return client.post("/api/v1/auth/register", json={
+        "email": email,
+        "password": PASSWORD,
+        "role": "student",
+        "university_id": str(uuid.uuid4()),
+    })
+
+
+def login(client, email):
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def new_email():
+    return f"budget-{uuid.uuid4().hex[:12]}@example.edu"
+
+
+def test_register(client):
+    with assert_max_queries(6):
+        response = register(client, new_email())
+    assert response.status_code == 201, response.text
+
+
+def test_login(client):
+    email = new_email()
+    register(client, email)
+    with assert_max_queries(2):
+        login(client, email)
+
+
+def test_refresh(client):
+    email = new_email()
+    register(client, email)
+    tokens = login(client, email)
+    with assert_max_queries(1):
+        response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200, response.text
+
+
+def test_me(client):
+    email = new_email()
+    register(client, email)
+    headers = {"Authorization": f"Bearer {login(client, email)['access_token']}"}
+    principal_cache.clear()
+    with assert_max_queries(1):
+        response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 200, response.text
+    # Served from the principal cache
+    with assert_max_queries(0):
+        response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 200, response.text